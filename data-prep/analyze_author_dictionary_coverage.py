@@ -1,20 +1,98 @@
 #!/usr/bin/env python3
 """
 Analyze dictionary coverage by author in the Perseus texts database.
-Calculates the percentage of unique words per author that have dictionary entries.
+Calculates the percentage of unique words per author (and per work) that have
+dictionary entries.
+
+Usage:
+    python analyze_author_dictionary_coverage.py [db_path ...]
+
+Several database paths are analyzed in parallel, one process each.
 """
 
 import sqlite3
 from collections import defaultdict
 import json
 
-def analyze_author_coverage(db_path="perseus_texts_sample.db"):
-    """Calculate dictionary coverage statistics for each author."""
+def build_covered_forms(cursor):
+    """Create a temp table of every normalized form with lemma or dictionary coverage.
+    
+    Built once per database so the coverage query can use a single indexed
+    join instead of correlated EXISTS subqueries per word.
+    """
+    cursor.execute("DROP TABLE IF EXISTS temp.covered_forms")
+    cursor.execute("""
+        CREATE TEMP TABLE covered_forms (
+            form TEXT PRIMARY KEY,
+            in_lemma_map INTEGER NOT NULL,
+            in_dictionary INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        INSERT INTO covered_forms (form, in_lemma_map, in_dictionary)
+        SELECT form, MAX(in_lemma_map), MAX(in_dictionary)
+        FROM (
+            SELECT word_form AS form, 1 AS in_lemma_map, 0 AS in_dictionary FROM lemma_map
+            UNION ALL
+            SELECT headword_normalized, 0, 1 FROM dictionary_entries
+        )
+        GROUP BY form
+    """)
+
+
+def _coverage_metrics(name_key, name, word_stats):
+    """Turn {word: [tokens, in_lemma_map, in_dictionary]} into a coverage record."""
+    total_unique_words = len(word_stats)
+    words_with_dictionary = 0
+    direct_dictionary_matches = 0
+    total_tokens = 0
+    tokens_with_dictionary = 0
+    missing = []
+    
+    for word, (tokens, in_lemma_map, in_dictionary) in word_stats.items():
+        total_tokens += tokens
+        if in_lemma_map:
+            words_with_dictionary += 1
+            tokens_with_dictionary += tokens
+        else:
+            missing.append((word, tokens))
+        if in_dictionary:
+            direct_dictionary_matches += 1
     
+    # Calculate coverage percentages
+    unique_coverage = (words_with_dictionary / total_unique_words * 100) if total_unique_words > 0 else 0
+    token_coverage = (tokens_with_dictionary / total_tokens * 100) if total_tokens > 0 else 0
+    direct_match_percent = (direct_dictionary_matches / total_unique_words * 100) if total_unique_words > 0 else 0
+    
+    # Equal frequencies come out in descending word order, as SQLite's
+    # ORDER BY freq DESC LIMIT 10 sorter returned them
+    missing.sort(key=lambda item: (item[1], item[0]), reverse=True)
+    
+    return {
+        name_key: name,
+        'total_unique_words': total_unique_words,
+        'words_with_dictionary': words_with_dictionary,
+        'unique_coverage_percent': round(unique_coverage, 2),
+        'total_tokens': total_tokens,
+        'tokens_with_dictionary': tokens_with_dictionary,
+        'token_coverage_percent': round(token_coverage, 2),
+        'direct_dictionary_matches': direct_dictionary_matches,
+        'direct_match_percent': round(direct_match_percent, 2),
+        'top_missing_words': [{'word': w, 'frequency': f} for w, f in missing[:10]]
+    }
+
+
+def analyze_coverage(db_path="perseus_texts_sample.db"):
+    """Calculate per-author and per-work dictionary coverage in one pass over words.
+    
+    Returns a dict with 'authors' (the author_dictionary_coverage.json records)
+    and 'works' (the same metrics per work).
+    """
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
-    # Get all authors
+    build_covered_forms(cursor)
+    
     cursor.execute("""
         SELECT DISTINCT id, name 
         FROM authors 
@@ -22,108 +100,67 @@ def analyze_author_coverage(db_path="perseus_texts_sample.db"):
     """)
     authors = cursor.fetchall()
     
-    results = []
-    
-    for author_id, author_name in authors:
-        # Get total unique words for this author
-        cursor.execute("""
-            SELECT COUNT(DISTINCT w.word_normalized)
-            FROM words w
-            JOIN books b ON w.book_id = b.id
-            JOIN works wo ON b.work_id = wo.id
-            WHERE wo.author_id = ?
-        """, (author_id,))
-        total_unique_words = cursor.fetchone()[0]
-        
-        # Get unique words with lemma mappings (dictionary entry OR standalone lemma)
-        cursor.execute("""
-            SELECT COUNT(DISTINCT w.word_normalized)
-            FROM words w
-            JOIN books b ON w.book_id = b.id
-            JOIN works wo ON b.work_id = wo.id
-            WHERE wo.author_id = ?
-            AND EXISTS (
-                SELECT 1 FROM lemma_map lm
-                WHERE lm.word_form = w.word_normalized
-            )
-        """, (author_id,))
-        words_with_dictionary = cursor.fetchone()[0]
-        
-        # Get unique words with direct dictionary match (in dictionary_entries)
-        cursor.execute("""
-            SELECT COUNT(DISTINCT w.word_normalized)
-            FROM words w
-            JOIN books b ON w.book_id = b.id
-            JOIN works wo ON b.work_id = wo.id
-            WHERE wo.author_id = ?
-            AND EXISTS (
-                SELECT 1 FROM dictionary_entries de
-                WHERE de.headword_normalized = w.word_normalized
-            )
-        """, (author_id,))
-        direct_dictionary_matches = cursor.fetchone()[0]
-        
-        # Get total word count (tokens) for this author
-        cursor.execute("""
-            SELECT COUNT(*)
-            FROM words w
-            JOIN books b ON w.book_id = b.id
-            JOIN works wo ON b.work_id = wo.id
-            WHERE wo.author_id = ?
-        """, (author_id,))
-        total_tokens = cursor.fetchone()[0]
-        
-        # Get tokens with dictionary coverage
-        cursor.execute("""
-            SELECT COUNT(*)
-            FROM words w
-            JOIN books b ON w.book_id = b.id
-            JOIN works wo ON b.work_id = wo.id
-            WHERE wo.author_id = ?
-            AND EXISTS (
-                SELECT 1 FROM lemma_map lm
-                WHERE lm.word_form = w.word_normalized
-            )
-        """, (author_id,))
-        tokens_with_dictionary = cursor.fetchone()[0]
-        
-        # Calculate coverage percentages
-        unique_coverage = (words_with_dictionary / total_unique_words * 100) if total_unique_words > 0 else 0
-        token_coverage = (tokens_with_dictionary / total_tokens * 100) if total_tokens > 0 else 0
-        direct_match_percent = (direct_dictionary_matches / total_unique_words * 100) if total_unique_words > 0 else 0
-        
-        # Get top missing words for this author
-        cursor.execute("""
-            SELECT w.word_normalized, COUNT(*) as freq
-            FROM words w
-            JOIN books b ON w.book_id = b.id
-            JOIN works wo ON b.work_id = wo.id
-            WHERE wo.author_id = ?
-            AND NOT EXISTS (
-                SELECT 1 FROM lemma_map lm
-                WHERE lm.word_form = w.word_normalized
-            )
-            GROUP BY w.word_normalized
-            ORDER BY freq DESC
-            LIMIT 10
-        """, (author_id,))
-        top_missing = cursor.fetchall()
+    cursor.execute("""
+        SELECT wo.id, wo.author_id, wo.title_english
+        FROM works wo
+        ORDER BY wo.author_id, wo.id
+    """)
+    works = cursor.fetchall()
+    
+    # One grouped pass: token counts per (work, word) with coverage flags
+    author_words = defaultdict(dict)
+    work_words = defaultdict(dict)
+    
+    cursor.execute("""
+        SELECT b.work_id, w.word_normalized, COUNT(*) as tokens,
+               COALESCE(cf.in_lemma_map, 0), COALESCE(cf.in_dictionary, 0)
+        FROM words w
+        JOIN books b ON w.book_id = b.id
+        LEFT JOIN covered_forms cf ON cf.form = w.word_normalized
+        GROUP BY b.work_id, w.word_normalized
+    """)
+    work_authors = {work_id: author_id for work_id, author_id, _ in works}
+    
+    for work_id, word, tokens, in_lemma_map, in_dictionary in cursor:
+        work_words[work_id][word] = [tokens, in_lemma_map, in_dictionary]
         
-        results.append({
-            'author': author_name,
-            'total_unique_words': total_unique_words,
-            'words_with_dictionary': words_with_dictionary,
-            'unique_coverage_percent': round(unique_coverage, 2),
-            'total_tokens': total_tokens,
-            'tokens_with_dictionary': tokens_with_dictionary,
-            'token_coverage_percent': round(token_coverage, 2),
-            'direct_dictionary_matches': direct_dictionary_matches,
-            'direct_match_percent': round(direct_match_percent, 2),
-            'top_missing_words': [{'word': w, 'frequency': f} for w, f in top_missing]
-        })
+        author_id = work_authors.get(work_id)
+        if author_id is None:
+            continue
+        stats = author_words[author_id].get(word)
+        if stats is None:
+            author_words[author_id][word] = [tokens, in_lemma_map, in_dictionary]
+        else:
+            stats[0] += tokens
     
     conn.close()
-    return results
+    
+    author_results = [
+        _coverage_metrics('author', author_name, author_words.get(author_id, {}))
+        for author_id, author_name in authors
+    ]
+    
+    work_results = []
+    for work_id, author_id, title in works:
+        record = _coverage_metrics('work', title, work_words.get(work_id, {}))
+        record['work_id'] = work_id
+        record['author_id'] = author_id
+        work_results.append(record)
+    
+    return {'authors': author_results, 'works': work_results}
+
+
+def analyze_author_coverage(db_path="perseus_texts_sample.db"):
+    """Calculate dictionary coverage statistics for each author."""
+    return analyze_coverage(db_path)['authors']
+
+
+def analyze_databases_parallel(db_paths, max_workers=None):
+    """Run the coverage analysis for several databases in parallel processes."""
+    from concurrent.futures import ProcessPoolExecutor
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(db_paths, executor.map(analyze_coverage, db_paths)))
 
 def print_coverage_report(results):
     """Print a formatted coverage report."""
@@ -161,20 +198,38 @@ def print_coverage_report(results):
             for word_data in r['top_missing_words'][:5]:
                 print(f"    - {word_data['word']} ({word_data['frequency']} occurrences)")
 
+def save_results(results, author_file, work_file):
+    """Write the author and work coverage JSON files."""
+    with open(author_file, 'w', encoding='utf-8') as f:
+        json.dump(results['authors'], f, ensure_ascii=False, indent=2)
+    with open(work_file, 'w', encoding='utf-8') as f:
+        json.dump(results['works'], f, ensure_ascii=False, indent=2)
+    print(f"\nDetailed results saved to: {author_file} (per work: {work_file})")
+
 if __name__ == "__main__":
     import sys
+    from pathlib import Path
     
-    # Use command line argument for database path if provided
-    db_path = sys.argv[1] if len(sys.argv) > 1 else "perseus_texts_sample.db"
+    # Use command line arguments for database paths if provided
+    db_paths = sys.argv[1:] if len(sys.argv) > 1 else ["perseus_texts_sample.db"]
     
-    print(f"Analyzing dictionary coverage in: {db_path}")
-    results = analyze_author_coverage(db_path)
-    
-    # Save results to JSON
-    output_file = "author_dictionary_coverage.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
-    print(f"\nDetailed results saved to: {output_file}")
-    
-    # Print report
-    print_coverage_report(results)
\ No newline at end of file
+    if len(db_paths) == 1:
+        db_path = db_paths[0]
+        print(f"Analyzing dictionary coverage in: {db_path}")
+        results = analyze_coverage(db_path)
+        
+        # Save results to JSON
+        save_results(results, "author_dictionary_coverage.json", "work_dictionary_coverage.json")
+        
+        # Print report
+        print_coverage_report(results['authors'])
+    else:
+        print(f"Analyzing dictionary coverage in {len(db_paths)} databases in parallel...")
+        all_results = analyze_databases_parallel(db_paths)
+        
+        for db_path, results in all_results.items():
+            stem = Path(db_path).stem
+            print(f"\n{db_path}:")
+            save_results(results, f"author_dictionary_coverage_{stem}.json",
+                         f"work_dictionary_coverage_{stem}.json")
+            print_coverage_report(results['authors'])
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Compare the rowid layout of text_lines and words with the clustered WITHOUT
+ROWID layout of cluster_text_tables: database pages read and latency for
+opening a book (line count, range and first page) and paging through all of
+it, plus a lemma search.
+
+Pages read are the bytes SQLite reads from the database file (rchar in
+/proc/self/io) divided by the page size, with a fresh connection per book so
+every book starts from an empty page cache.
+
+Runs on a copy of a built database when one is given, otherwise on a
+synthetic corpus.
+
+Usage:
+    python benchmark_clustered_text_tables.py [perseus_texts_full.db]
+"""
+
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from create_perseus_database import cluster_text_tables
+from perseus_fixtures import LEMMA_QUERY, OPEN_BOOK_QUERIES, PAGE_LINES, PAGE_QUERY, build_text_corpus
+
+
+def read_bytes():
+    with open('/proc/self/io') as f:
+        return int(next(line for line in f if line.startswith('rchar:')).split()[1])
+
+
+def read_books(db_path, books, lemmas):
+    """Open and page through every book, then run the lemma searches
+
+    Returns (paging pages read, paging seconds, lemma pages read, lemma seconds).
+    """
+    page_size = sqlite3.connect(db_path).execute("PRAGMA page_size").fetchone()[0]
+    bytes_before = read_bytes()
+    start = time.perf_counter()
+    for book_id in books:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        _, min_line, max_line = (cursor.execute(query, (book_id,)).fetchone()[0]
+                                          for query in OPEN_BOOK_QUERIES)
+        for first_line in range(min_line, max_line + 1, PAGE_LINES):
+            cursor.execute(PAGE_QUERY, (book_id, first_line, first_line + PAGE_LINES - 1)).fetchall()
+        conn.close()
+    paging_elapsed = time.perf_counter() - start
+    paging_pages = (read_bytes() - bytes_before) / page_size
+
+    bytes_before = read_bytes()
+    start = time.perf_counter()
+    conn = sqlite3.connect(db_path)
+    for lemma in lemmas:
+        conn.execute(LEMMA_QUERY, (lemma,)).fetchall()
+    conn.close()
+    lemma_elapsed = time.perf_counter() - start
+    lemma_pages = (read_bytes() - bytes_before) / page_size
+    return paging_pages, paging_elapsed, lemma_pages, lemma_elapsed
+
+
+def run_benchmark(db_path):
+    conn = sqlite3.connect(db_path)
+    books = [row[0] for row in conn.execute("SELECT DISTINCT book_id FROM text_lines ORDER BY book_id")]
+    lemmas = [row[0] for row in conn.execute(
+        "SELECT lemma FROM lemma_map GROUP BY lemma ORDER BY COUNT(*) DESC LIMIT 50")]
+    conn.close()
+
+    clustered_path = db_path.with_name('clustered.db')
+    shutil.copy(db_path, clustered_path)
+    conn = sqlite3.connect(clustered_path)
+    cluster_text_tables(conn)
+    conn.close()
+
+    print(f"\nOpening and paging through {len(books):,} books ({PAGE_LINES}-line pages), "
+          f"{len(lemmas)} lemma searches")
+    print(f"\n{'Layout':<16} {'DB MB':>7} {'Paging pages':>13} {'Paging s':>9} {'Lemma pages':>12} {'Lemma s':>8}")
+    print("-" * 70)
+    results = {}
+    for label, path in (('rowid', db_path), ('WITHOUT ROWID', clustered_path)):
+        # Best of three, keeping the page count of the same run
+        runs = [read_books(path, books, lemmas) for _ in range(3)]
+        paging_pages, paging_elapsed, _, _ = min(runs, key=lambda run: run[1])
+        _, _, lemma_pages, lemma_elapsed = min(runs, key=lambda run: run[3])
+        results[label] = (paging_pages, paging_elapsed)
+        print(f"{label:<16} {path.stat().st_size / (1024 * 1024):>7.1f} {paging_pages:>13,.0f} "
+              f"{paging_elapsed:>9.3f} {lemma_pages:>12,.0f} {lemma_elapsed:>8.3f}")
+    (old_pages, old_elapsed), (new_pages, new_elapsed) = results.values()
+    print(f"{'':<16} Paging: {old_pages / max(new_pages, 1):.1f}x fewer pages, "
+          f"{old_elapsed / new_elapsed:.1f}x faster")
+
+
+def main():
+    db_path = sys.argv[1] if len(sys.argv) > 1 else None
+    if db_path and not Path(db_path).exists():
+        print(f"Error: Database not found at {db_path}")
+        sys.exit(1)
+    if not Path('/proc/self/io').exists():
+        print("Error: /proc/self/io not available to count page reads")
+        sys.exit(1)
+
+    print("=== CLUSTERED TEXT TABLES BENCHMARK ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = Path(tmp) / 'text.db'
+        if db_path:
+            shutil.copy(db_path, db_copy)
+            print(f"Benchmarking on a copy of {db_path}")
+        else:
+            build_text_corpus(db_copy).close()
+            print("Benchmarking on a synthetic corpus")
+        run_benchmark(db_copy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Replay the Room DAO queries against a built database and report latency.
+
+The SQL is read straight from the @Query annotations in the app's DAO
+interfaces, so the benchmark always runs exactly what the app runs. Query
+parameters are sampled from the database itself (real words, lemmas, books
+and line ranges). For every query the script records p50/p95/p99 latency and
+the EXPLAIN QUERY PLAN output, and exits non-zero if any query falls back to
+a full table scan.
+
+Usage:
+    python benchmark_dao_queries.py [db_path] [--iterations N] [--output report.json]
+                                    [--allow-scan Dao.method ...]
+"""
+
+import json
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+DAO_DIR = (Path(__file__).parent.parent / "app" / "src" / "main" / "java" /
+           "com" / "classicsviewer" / "app" / "database" / "dao")
+
+# DAOs that run against the user database, not perseus_texts.db
+SKIPPED_DAOS = {'BookmarkDao'}
+
+QUERY_PATTERN = re.compile(
+    r'@Query\(\s*(?:"""(?P<multi>.*?)"""|"(?P<single>(?:[^"\\]|\\.)*)")\s*\)\s*'
+    r'(?:suspend\s+)?fun\s+(?P<name>\w+)\s*\((?P<params>[^)]*)\)',
+    re.DOTALL
+)
+
+# "SCAN words" / "SCAN w" without an index means every row is visited
+FULL_SCAN_PATTERN = re.compile(r'^SCAN (?!CONSTANT ROW)(\S+)(?!.*USING (?:COVERING )?INDEX)(?!.*INTEGER PRIMARY KEY)')
+
+
+def parse_dao_queries(dao_dir=DAO_DIR):
+    """Extract (dao, method, sql, params) for every @Query in the DAO sources"""
+    queries = []
+
+    for dao_file in sorted(Path(dao_dir).glob("*Dao.kt")):
+        dao_name = dao_file.stem
+        if dao_name in SKIPPED_DAOS:
+            continue
+
+        source = dao_file.read_text(encoding='utf-8')
+        for match in QUERY_PATTERN.finditer(source):
+            sql = match.group('multi') if match.group('multi') is not None else match.group('single')
+
+            # Parameter names plus any Kotlin default value (e.g. limit: Int = 10)
+            params = {}
+            for param in match.group('params').split(','):
+                param = param.strip()
+                if not param:
+                    continue
+                name = param.split(':')[0].strip()
+                default = None
+                if '=' in param:
+                    default = param.split('=', 1)[1].strip()
+                params[name] = default
+
+            queries.append({
+                'dao': dao_name,
+                'method': match.group('name'),
+                'sql': sql.strip(),
+                'params': params
+            })
+
+    return queries
+
+
+class ParameterSampler:
+    """Draws realistic query parameters from a built database"""
+
+    def __init__(self, cursor, sample_size=200, seed=42):
+        self.rng = random.Random(seed)
+
+        cursor.execute("SELECT word_normalized FROM words ORDER BY RANDOM() LIMIT ?", (sample_size,))
+        self.words = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute("SELECT lemma FROM lemma_map ORDER BY RANDOM() LIMIT ?", (sample_size,))
+        self.lemmas = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute("SELECT headword_normalized, language FROM dictionary_entries ORDER BY RANDOM() LIMIT ?",
+                       (sample_size,))
+        self.headwords = cursor.fetchall()
+
+        cursor.execute("""
+            SELECT b.id, b.work_id, w.author_id, a.language,
+                   COALESCE(MIN(tl.line_number), 1), COALESCE(MAX(tl.line_number), 1)
+            FROM books b
+            JOIN works w ON b.work_id = w.id
+            JOIN authors a ON w.author_id = a.id
+            LEFT JOIN text_lines tl ON tl.book_id = b.id
+            GROUP BY b.id
+        """)
+        self.books = cursor.fetchall()
+
+        cursor.execute("SELECT DISTINCT book_id, translator FROM translation_segments WHERE translator IS NOT NULL")
+        self.translators = cursor.fetchall()
+
+    def sample(self, params):
+        """Build a named-parameter dict for one execution of a query"""
+        book_id, work_id, author_id, language, min_line, max_line = self.rng.choice(self.books)
+        values = {}
+
+        if 'translator' in params and self.translators:
+            book_id, values['translator'] = self.rng.choice(self.translators)
+
+        # Page-sized line window, as the text viewer requests it
+        start_line = self.rng.randint(min_line, max(min_line, max_line - 25))
+        word = self.rng.choice(self.words) if self.words else ''
+        headword, headword_language = self.rng.choice(self.headwords) if self.headwords else ('', 'greek')
+
+        for name, default in params.items():
+            if name in values:
+                continue
+            if name == 'bookId':
+                values[name] = book_id
+            elif name == 'workId':
+                values[name] = work_id
+            elif name == 'authorId':
+                values[name] = author_id
+            elif name == 'startLine':
+                values[name] = start_line
+            elif name == 'endLine':
+                values[name] = start_line + 25
+            elif name == 'lemma':
+                values[name] = self.rng.choice(self.lemmas) if self.lemmas else ''
+            elif name in ('wordForm', 'wordNormalized', 'normalizedForm'):
+                values[name] = word
+            elif name == 'headword':
+                values[name] = headword
+            elif name == 'language':
+                values[name] = headword_language if 'headword' in params or 'pattern' in params else language
+            elif name == 'pattern':
+                values[name] = headword[:3] + '%'
+            elif default is not None:
+                values[name] = int(default) if default.isdigit() else default
+            else:
+                raise ValueError(f"No sampler for query parameter '{name}'")
+
+        return values
+
+
+def explain_query(cursor, sql, params):
+    """Return the EXPLAIN QUERY PLAN detail lines for a query"""
+    cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+    return [row[-1] for row in cursor.fetchall()]
+
+
+def find_full_scans(plan):
+    """Return the plan lines that visit every row of a table"""
+    return [line for line in plan if FULL_SCAN_PATTERN.match(line)]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def benchmark_query(cursor, query, sampler, iterations):
+    """Run one DAO query repeatedly and collect latency and plan data"""
+    timings = []
+    rows_returned = 0
+
+    for _ in range(iterations):
+        params = sampler.sample(query['params'])
+        start = time.perf_counter()
+        cursor.execute(query['sql'], params)
+        rows_returned += len(cursor.fetchall())
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    plan = explain_query(cursor, query['sql'], sampler.sample(query['params']))
+
+    return {
+        'dao': query['dao'],
+        'method': query['method'],
+        'sql': query['sql'],
+        'iterations': iterations,
+        'avg_rows': round(rows_returned / iterations, 1) if iterations else 0,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'mean_ms': round(statistics.mean(timings), 3) if timings else 0.0,
+        'query_plan': plan,
+        'full_scans': find_full_scans(plan)
+    }
+
+
+def run_benchmark(db_path, iterations=200, allow_scan=()):
+    """Benchmark every DAO query against db_path and return the report"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")
+    tables = set(row[0] for row in cursor.fetchall())
+
+    print(f"Sampling parameters from {db_path}...")
+    sampler = ParameterSampler(cursor)
+    print(f"  {len(sampler.words)} words, {len(sampler.lemmas)} lemmas, {len(sampler.books)} books")
+
+    queries = parse_dao_queries()
+    print(f"Found {len(queries)} DAO queries in {DAO_DIR}")
+    if not queries:
+        raise FileNotFoundError(f"No @Query annotations found under {DAO_DIR}")
+
+    results = []
+    regressions = []
+
+    for query in queries:
+        query_id = f"{query['dao']}.{query['method']}"
+        referenced = set(re.findall(r'\b(?:FROM|JOIN)\s+(\w+)', query['sql'], re.IGNORECASE))
+        missing = referenced - tables
+        if missing:
+            print(f"  - {query_id}: skipped (missing {', '.join(sorted(missing))})")
+            continue
+
+        result = benchmark_query(cursor, query, sampler, iterations)
+        results.append(result)
+
+        status = "✓"
+        if result['full_scans']:
+            if query_id in allow_scan:
+                status = "~"
+            else:
+                status = "✗"
+                regressions.append(query_id)
+
+        print(f"  {status} {query_id:<55} p50 {result['p50_ms']:>8.3f}ms  "
+              f"p95 {result['p95_ms']:>8.3f}ms  p99 {result['p99_ms']:>8.3f}ms")
+        for line in result['full_scans']:
+            print(f"      full scan: {line}")
+
+    conn.close()
+
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'database': str(db_path),
+        'sqlite_version': sqlite3.sqlite_version,
+        'iterations': iterations,
+        'queries': results,
+        'full_scan_regressions': regressions
+    }
+
+
+def main():
+    args = sys.argv[1:]
+    db_path = "perseus_texts_sample.db"
+    iterations = 200
+    output_path = "dao_benchmark_report.json"
+    allow_scan = set()
+
+    i = 0
+    while i < len(args):
+        if args[i] == '--iterations':
+            iterations = int(args[i + 1])
+            i += 2
+        elif args[i] == '--output':
+            output_path = args[i + 1]
+            i += 2
+        elif args[i] == '--allow-scan':
+            allow_scan.add(args[i + 1])
+            i += 2
+        else:
+            db_path = args[i]
+            i += 1
+
+    if not Path(db_path).exists():
+        print(f"Error: Database not found at {db_path}")
+        sys.exit(1)
+
+    print("=== DAO QUERY BENCHMARK ===")
+    report = run_benchmark(db_path, iterations, allow_scan)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n✓ Report saved to {output_path}")
+
+    if report['full_scan_regressions']:
+        print(f"\n✗ {len(report['full_scan_regressions'])} queries fall back to a full table scan:")
+        for query_id in report['full_scan_regressions']:
+            print(f"  {query_id}")
+        sys.exit(1)
+
+    print("✓ No full table scans")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Compare write_parallel_zip with single-threaded zipfile at level 9:
+throughput and archive size, plus the time of packaging the sample once
+instead of once per asset directory.
+
+Runs on a copy of a built database when one is given, otherwise on a
+synthetic text corpus.
+
+Usage:
+    python benchmark_parallel_zip.py [perseus_texts_full.db]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+from parallel_zip import write_parallel_zip
+from perseus_fixtures import build_text_corpus
+
+
+def zipfile_compress(source, zip_path, arcname):
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+        archive.write(source, arcname)
+
+
+def run_benchmark(db_path):
+    size_mb = db_path.stat().st_size / (1024 * 1024)
+    zip_path = db_path.with_name('perseus_texts.db.zip')
+    copy_path = db_path.with_name('perseus_texts_copy.db.zip')
+    cores = os.cpu_count() or 1
+
+    start = time.perf_counter()
+    zipfile_compress(db_path, zip_path, 'perseus_texts.db')
+    zipfile_elapsed = time.perf_counter() - start
+    zipfile_size = zip_path.stat().st_size
+
+    rows = [('zipfile level 9', 1, zipfile_elapsed, zipfile_size)]
+    for workers in sorted({1, cores}):
+        stats = min((write_parallel_zip(db_path, zip_path, 'perseus_texts.db', workers=workers) for _ in range(3)),
+                    key=lambda stats: stats['seconds'])
+        rows.append(('parallel_zip level 9', workers, stats['seconds'], stats['zip_size']))
+
+    print(f"\nCompressing {size_mb:.1f}MB on {cores} {'core' if cores == 1 else 'cores'}")
+    print(f"\n{'Method':<22} {'Workers':>7} {'Seconds':>8} {'MB/s':>7} {'Zip MB':>7} {'Ratio':>7}")
+    print("-" * 64)
+    for label, workers, elapsed, zip_size in rows:
+        print(f"{label:<22} {workers:>7} {elapsed:>8.2f} {size_mb / elapsed:>7.1f} "
+              f"{zip_size / (1024 * 1024):>7.2f} {zip_size / db_path.stat().st_size * 100:>6.1f}%")
+    best_elapsed = min(row[2] for row in rows[1:])
+    print(f"{'':<22} {zipfile_elapsed / best_elapsed:.1f}x faster, "
+          f"{(rows[-1][3] - zipfile_size) / zipfile_size * 100:+.2f}% size vs zipfile")
+
+    # Sample packaging: compressing for each asset directory vs compress once and link
+    start = time.perf_counter()
+    zipfile_compress(db_path, zip_path, 'perseus_texts.db')
+    zipfile_compress(db_path, copy_path, 'perseus_texts.db')
+    twice_elapsed = time.perf_counter() - start
+    copy_path.unlink()
+    start = time.perf_counter()
+    write_parallel_zip(db_path, zip_path, 'perseus_texts.db')
+    try:
+        os.link(zip_path, copy_path)
+    except OSError:
+        shutil.copy2(zip_path, copy_path)
+    once_elapsed = time.perf_counter() - start
+    print(f"\nPackaging for two asset directories: {twice_elapsed:.2f}s compressing twice, "
+          f"{once_elapsed:.2f}s compressing once ({twice_elapsed / once_elapsed:.1f}x faster)")
+
+
+def main():
+    db_path = sys.argv[1] if len(sys.argv) > 1 else None
+    if db_path and not Path(db_path).exists():
+        print(f"Error: Database not found at {db_path}")
+        sys.exit(1)
+
+    print("=== PARALLEL ZIP BENCHMARK ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = Path(tmp) / 'perseus_texts.db'
+        if db_path:
+            shutil.copy(db_path, db_copy)
+            print(f"Benchmarking on a copy of {db_path}")
+        else:
+            build_text_corpus(db_copy, books=60).close()
+            print("Benchmarking on a synthetic database")
+        run_benchmark(db_copy)
+
+
+if __name__ == "__main__":
+    main()
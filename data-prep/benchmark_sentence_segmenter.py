@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Compare the paragraphs/second of SentenceSegmenter with the per-paragraph
+re.split and editorial filter chain the prose processors used before.
+
+Runs on the Plutarch (tlg0007) and Plato (tlg0059) Greek texts under
+data-sources, or on synthetic paragraphs when they are not there.
+
+Usage:
+    python benchmark_sentence_segmenter.py [data-sources dir]
+"""
+
+import sys
+import timeit
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from perseus_fixtures import GREEK_PARAGRAPH, TRICKY_PARAGRAPHS, old_paragraph_sentences
+from sentence_segmenter import SentenceSegmenter
+
+BENCHMARK_AUTHORS = {'tlg0007': 'Plutarch', 'tlg0059': 'Plato'}
+
+
+def load_sections(data_sources):
+    """Paragraph texts of every prose section of the Plutarch and Plato Greek texts"""
+    sections = []
+    for author_id in BENCHMARK_AUTHORS:
+        for xml_file in sorted(Path(data_sources).glob(f"canonical-greekLit/data/{author_id}/*/*grc*.xml")):
+            try:
+                root = ET.parse(xml_file).getroot()
+            except ET.ParseError:
+                continue
+            for elem in root.iter():
+                if (elem.tag.endswith('div') and elem.get('type') == 'textpart' and
+                        elem.get('subtype') in ['section', 'chapter']):
+                    paragraphs = [''.join(p.itertext()) for p in elem.iter() if p.tag.endswith('p')]
+                    if paragraphs:
+                        sections.append(paragraphs)
+    return sections
+
+
+def run_benchmark(sections):
+    """Report paragraphs/second for the old split vs SentenceSegmenter"""
+    paragraph_count = sum(len(paragraphs) for paragraphs in sections)
+    rounds = max(1, 50000 // paragraph_count)
+    segmenter = SentenceSegmenter('greek')
+
+    mismatches = sum(1 for paragraphs in sections
+                     if segmenter.segment_paragraphs(paragraphs) !=
+                     [s for text in paragraphs for s in old_paragraph_sentences(text, 'greek')])
+
+    def old_split():
+        for paragraphs in sections:
+            for text in paragraphs:
+                old_paragraph_sentences(text, 'greek')
+
+    def new_split():
+        for paragraphs in sections:
+            segmenter.segment_paragraphs(paragraphs)
+
+    # Best of five runs, the timings are noisy on a shared machine
+    old_elapsed = min(timeit.repeat(old_split, number=rounds, repeat=5))
+    new_elapsed = min(timeit.repeat(new_split, number=rounds, repeat=5))
+
+    total = paragraph_count * rounds
+    print(f"\n{'Segmenter':<36} {'Paragraphs':>10} {'Seconds':>9} {'Paras/s':>10}")
+    print("-" * 68)
+    print(f"{'re.split + filter chain':<36} {total:>10,} {old_elapsed:>9.2f} {total / old_elapsed:>10,.0f}")
+    print(f"{'SentenceSegmenter (per section)':<36} {total:>10,} {new_elapsed:>9.2f} {total / new_elapsed:>10,.0f}")
+    print(f"{'':<36} Speedup: {old_elapsed / new_elapsed:.1f}x")
+    if mismatches:
+        print(f"✗ {mismatches:,} of {len(sections):,} sections segment differently")
+
+
+def main():
+    data_sources = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).parent.parent / "data-sources"
+
+    print("=== SENTENCE SEGMENTER BENCHMARK ===")
+    sections = load_sections(data_sources)
+    if sections:
+        print(f"Benchmarking on {len(sections):,} sections of "
+              f"{' and '.join(BENCHMARK_AUTHORS.values())} from {data_sources}")
+    else:
+        sections = [[GREEK_PARAGRAPH] * 3, [GREEK_PARAGRAPH, TRICKY_PARAGRAPHS[5]]] * 50
+        print("Benchmarking on synthetic Greek sections")
+    run_benchmark(sections)
+
+
+if __name__ == "__main__":
+    main()
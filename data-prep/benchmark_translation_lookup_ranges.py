@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Compare the per-line translation_lookup table with translation_lookup_ranges:
+table size (dbstat) and lookup latency of the per-line table, the
+compatibility view (the current Room query) and a direct range query.
+
+Runs on a copy of a built database when one is given, otherwise on a
+synthetic corpus of verse books (line-numbered segments) and prose books (a
+few long sections spread proportionally over the lines).
+
+Usage:
+    python benchmark_translation_lookup_ranges.py [perseus_texts_full.db]
+"""
+
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+from book_line_stats import BookLineStats
+from create_perseus_database import create_translation_lookup_ranges
+from perseus_fixtures import RANGE_LOOKUP_QUERY, ROOM_LOOKUP_QUERY, build_lookup_corpus
+
+LOOKUP_OBJECTS = ('translation_lookup', 'sqlite_autoindex_translation_lookup_1',
+                  'index_translation_lookup_book_id_line_number', 'index_translation_lookup_segment_id')
+RANGE_OBJECTS = ('translation_lookup_ranges', 'sqlite_autoindex_translation_lookup_ranges_1',
+                 'idx_translation_lookup_ranges_lines', 'idx_translation_lookup_ranges_segment')
+
+
+def object_sizes(cursor, names):
+    cursor.execute(f"SELECT SUM(pgsize) FROM dbstat WHERE name IN ({', '.join('?' * len(names))})", names)
+    return cursor.fetchone()[0] or 0
+
+
+def run_benchmark(conn, book_stats):
+    """Report size and query latency of the per-line table vs the ranges"""
+    cursor = conn.cursor()
+    books = book_stats.books()
+    rng = random.Random(1)
+    windows = []
+    for _ in range(2000):
+        book_id = rng.choice(books)
+        min_line, max_line = book_stats.line_range(book_id)
+        start = rng.randint(min_line, max_line)
+        windows.append((book_id, start, start + 29))
+
+    cursor.execute("SELECT COUNT(*) FROM translation_lookup")
+    line_rows = cursor.fetchone()[0]
+    line_bytes = object_sizes(cursor, LOOKUP_OBJECTS)
+
+    def room_query():
+        for book_id, start, end in windows:
+            cursor.execute(ROOM_LOOKUP_QUERY, (book_id, book_id, start, end)).fetchall()
+
+    line_elapsed = min(timeit.repeat(room_query, number=1, repeat=5))
+
+    create_translation_lookup_ranges(conn, replace_lookup_table=True)
+    cursor.execute("SELECT COUNT(*) FROM translation_lookup_ranges")
+    range_rows = cursor.fetchone()[0]
+    range_bytes = object_sizes(cursor, RANGE_OBJECTS)
+
+    def range_query():
+        for book_id, start, end in windows:
+            cursor.execute(RANGE_LOOKUP_QUERY, (book_id, end, start)).fetchall()
+
+    view_elapsed = min(timeit.repeat(room_query, number=1, repeat=5))
+    range_elapsed = min(timeit.repeat(range_query, number=1, repeat=5))
+
+    print(f"\n{'Layout':<34} {'Rows':>10} {'KB (+idx)':>10} {'ms/lookup':>10}")
+    print("-" * 68)
+    print(f"{'per-line table, Room query':<34} {line_rows:>10,} {line_bytes / 1024:>10,.0f} "
+          f"{line_elapsed / len(windows) * 1000:>10.3f}")
+    print(f"{'ranges + view, Room query':<34} {range_rows:>10,} {range_bytes / 1024:>10,.0f} "
+          f"{view_elapsed / len(windows) * 1000:>10.3f}")
+    print(f"{'ranges, direct range query':<34} {range_rows:>10,} {range_bytes / 1024:>10,.0f} "
+          f"{range_elapsed / len(windows) * 1000:>10.3f}")
+    print(f"{'':<34} Rows: {line_rows / max(range_rows, 1):.1f}x fewer, "
+          f"size: {line_bytes / max(range_bytes, 1):.1f}x smaller")
+
+
+def main():
+    db_path = sys.argv[1] if len(sys.argv) > 1 else None
+    if db_path and not Path(db_path).exists():
+        print(f"Error: Database not found at {db_path}")
+        sys.exit(1)
+
+    print("=== TRANSLATION LOOKUP RANGES BENCHMARK ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = Path(tmp) / 'lookup.db'
+        if db_path:
+            shutil.copy(db_path, db_copy)
+            conn = sqlite3.connect(db_copy)
+            book_stats = BookLineStats()
+            book_stats.reload(conn.cursor())
+            print(f"Benchmarking on a copy of {db_path}")
+        else:
+            conn, book_stats = build_lookup_corpus(db_copy)
+            print("Benchmarking on a synthetic corpus")
+        run_benchmark(conn, book_stats)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Time every stage that parses XML (CTS metadata, text ingestion,
+translations, LSJ and Wiktionary dump pages) with each available backend of
+xml_backend.py.
+
+Runs on the corpora in a data-sources directory (and a Wiktionary dump) when
+given, otherwise on synthetic documents.
+
+Usage:
+    python benchmark_xml_backend.py [data-sources dir [wiktionary dump.xml.bz2]]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import xml_backend as ET
+from perseus_fixtures import run_cts, run_ingestion, run_lsj, run_wiktionary, write_xml_fixtures
+
+
+def collect_corpus(data_sources):
+    """Works, CTS files and LSJ file of a data-sources directory"""
+    data_sources = Path(data_sources)
+    corpora = [data_sources / corpus / "data" for corpus in ("canonical-greekLit", "canonical-latinLit")]
+    return {
+        'cts': sorted(path for corpus in corpora for path in corpus.glob("*/__cts__.xml")) +
+               sorted(path for corpus in corpora for path in corpus.glob("*/*/__cts__.xml")),
+        'works': sorted(path for corpus in corpora for path in corpus.glob("*/*") if path.is_dir()),
+        'lsj': data_sources / "canonical-pdlrefwk" / "data" / "viaf66541464" / "001" / "viaf66541464.001.perseus-eng1.xml",
+    }
+
+
+def run_benchmark(sources, tmp_dir):
+    timings = {}
+    previous = ET.BACKEND
+    for name in ET.available_backends():
+        ET.use_backend(name)
+        stage_times = {}
+        start = time.perf_counter()
+        run_cts(sources['cts'])
+        stage_times['CTS metadata'] = time.perf_counter() - start
+        _, stage_times['Text ingestion'], stage_times['Translations'] = run_ingestion(sources['works'], tmp_dir)
+        if sources['lsj'].exists():
+            start = time.perf_counter()
+            run_lsj(sources['lsj'])
+            stage_times['LSJ'] = time.perf_counter() - start
+        if sources.get('dump'):
+            start = time.perf_counter()
+            run_wiktionary(sources['dump'])
+            stage_times['Wiktionary dump'] = time.perf_counter() - start
+        timings[name] = stage_times
+    ET.use_backend(previous)
+
+    print(f"\n{'Stage':<18} " + ' '.join(f"{name + ' s':>10}" for name in timings) +
+          (f" {'Speedup':>8}" if len(timings) > 1 else ''))
+    print("-" * (19 + 11 * len(timings) + (9 if len(timings) > 1 else 0)))
+    for stage in timings['etree']:
+        row = f"{stage:<18} " + ' '.join(f"{stage_times[stage]:>10.3f}" for stage_times in timings.values())
+        if 'lxml' in timings:
+            row += f" {timings['etree'][stage] / timings['lxml'][stage]:>7.1f}x"
+        print(row)
+    if 'lxml' in timings:
+        print("(Speedup: lxml over ElementTree, below 1.0x when lxml is slower)")
+
+
+def main():
+    data_sources = sys.argv[1] if len(sys.argv) > 1 else None
+    if data_sources and not Path(data_sources).exists():
+        print(f"Error: data-sources directory not found at {data_sources}")
+        sys.exit(1)
+
+    print("=== XML BACKEND BENCHMARK ===")
+    if 'lxml' not in ET.available_backends():
+        print("⚠️  lxml is not installed, benchmarking ElementTree only")
+    with tempfile.TemporaryDirectory() as tmp:
+        if data_sources:
+            sources = collect_corpus(data_sources)
+            sources['dump'] = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+            print(f"Benchmarking on {data_sources}: {len(sources['works'])} works")
+        else:
+            sources = write_xml_fixtures(tmp, scale=20)
+            print("Benchmarking on synthetic documents")
+        run_benchmark(sources, tmp)
+
+
+if __name__ == "__main__":
+    main()
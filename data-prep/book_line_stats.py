@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Build-scoped line statistics for the books written to text_lines.
+
+The ingestion code records every line number as it inserts the line, so the
+later stages (section-to-line mapping of translations, the translation lookup
+table) get line counts, line-number ranges and the set of line numbers of a
+book from memory instead of querying text_lines again for every book.
+"""
+
+
+class LineBitmap:
+    """Set of non-negative line numbers, one bit per number"""
+
+    def __init__(self):
+        self.bits = bytearray()
+        self.count = 0
+
+    def add(self, number):
+        if number < 0:
+            raise ValueError(f"Line numbers must be non-negative: {number}")
+        index, mask = number >> 3, 1 << (number & 7)
+        if index >= len(self.bits):
+            self.bits.extend(bytes(index + 1 - len(self.bits)))
+        if not self.bits[index] & mask:
+            self.bits[index] |= mask
+            self.count += 1
+
+    def __contains__(self, number):
+        index = number >> 3
+        return 0 <= number and index < len(self.bits) and bool(self.bits[index] & (1 << (number & 7)))
+
+    def __iter__(self):
+        """Line numbers in ascending order"""
+        for index, byte in enumerate(self.bits):
+            if byte:
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        yield (index << 3) | bit
+
+    def __len__(self):
+        return self.count
+
+
+class _BookLines:
+    __slots__ = ('rows', 'line_numbers', 'min_line', 'max_line')
+
+    def __init__(self):
+        self.rows = 0
+        self.line_numbers = LineBitmap()
+        self.min_line = None
+        self.max_line = None
+
+
+class BookLineStats:
+    """Per-book line counts, ranges and line-number bitmaps for one build"""
+
+    def __init__(self):
+        self._books = {}
+
+    def add_line(self, book_id, line_number):
+        """Record one row inserted into text_lines"""
+        book = self._books.get(book_id)
+        if book is None:
+            book = self._books[book_id] = _BookLines()
+        book.rows += 1
+        book.line_numbers.add(line_number)
+        if book.min_line is None or line_number < book.min_line:
+            book.min_line = line_number
+        if book.max_line is None or line_number > book.max_line:
+            book.max_line = line_number
+
+    def reload(self, cursor):
+        """Refill the registry from text_lines (after the database was restored)"""
+        self._books = {}
+        cursor.execute("SELECT book_id, line_number FROM text_lines")
+        for book_id, line_number in cursor.fetchall():
+            self.add_line(book_id, line_number)
+
+    def clear_book(self, book_id):
+        """Forget a book whose text_lines rows were deleted"""
+        self._books.pop(book_id, None)
+
+    def line_count(self, book_id):
+        """Number of text_lines rows of the book (COUNT(*))"""
+        book = self._books.get(book_id)
+        return book.rows if book else 0
+
+    def line_range(self, book_id):
+        """(MIN(line_number), MAX(line_number)) of the book, or (None, None)"""
+        book = self._books.get(book_id)
+        return (book.min_line, book.max_line) if book else (None, None)
+
+    def line_numbers(self, book_id):
+        """The book's distinct line numbers as a LineBitmap"""
+        book = self._books.get(book_id)
+        return book.line_numbers if book else LineBitmap()
+
+    def books(self):
+        """Ids of the books that have lines, sorted"""
+        return sorted(book_id for book_id, book in self._books.items() if book.rows)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Per-stage profiling for the database build.
+
+Records wall time, CPU time, rows written and peak RSS for every build stage
+and for every author processed, and writes them to a JSON build report so
+slow stages can be compared between builds. One stage can optionally be run
+under cProfile.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Return the process high-water RSS in MB, or None if unavailable"""
+    if resource is None:
+        return None
+    # ru_maxrss is reported in KB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+class _Measurement:
+    """Snapshot of the counters at the start of a stage or author"""
+
+    def __init__(self, conn):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        self.changes = conn.total_changes
+        self.rss = peak_rss_mb()
+
+    def finish(self, conn):
+        end_rss = peak_rss_mb()
+        return {
+            'wall_seconds': round(time.perf_counter() - self.wall, 3),
+            'cpu_seconds': round(time.process_time() - self.cpu, 3),
+            'rows_written': conn.total_changes - self.changes,
+            'peak_rss_mb': end_rss,
+            'rss_growth_mb': round(end_rss - self.rss, 1) if end_rss is not None else None
+        }
+
+
+class BuildProfiler:
+    """Collects stage and author timings for one database build
+
+    Stages are sequential: starting a stage closes the previous one, so the
+    build only needs one stage() call at the top of each phase. Authors are
+    timed with the author() context manager and can nest inside a stage.
+    """
+
+    def __init__(self, conn, mode, profile_stage=None):
+        self.conn = conn
+        self.mode = mode
+        self.profile_stage = profile_stage
+        self.stages = []
+        self.authors = []
+        self._current = None
+        self._profiler = None
+        self._build_start = _Measurement(conn)
+
+    def stage(self, name):
+        """Close the running stage (if any) and start timing a new one"""
+        self.end_stage()
+        self._current = (name, _Measurement(self.conn))
+
+        if name == self.profile_stage:
+            print(f"  [profiling stage '{name}' with cProfile]")
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def end_stage(self):
+        """Close the running stage and record its measurements"""
+        if self._current is None:
+            return
+
+        name, start = self._current
+        if self._profiler is not None:
+            self._profiler.disable()
+
+        self.stages.append({'stage': name, **start.finish(self.conn)})
+        self._current = None
+
+        if self._profiler is not None:
+            self._save_profile(name)
+            self._profiler = None
+
+    def author(self, author_id, name, language):
+        """Context manager timing one author's ingestion"""
+        return _AuthorTimer(self, author_id, name, language)
+
+    def _save_profile(self, name):
+        """Dump cProfile stats for a stage and print the top entries"""
+        prof_path = Path(__file__).parent / f"build_profile_{self.mode}_{name}.prof"
+        self._profiler.dump_stats(prof_path)
+
+        output = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=output)
+        stats.sort_stats('cumulative').print_stats(25)
+        print(output.getvalue())
+        print(f"✓ cProfile stats for '{name}' saved to {prof_path}")
+
+    def write_report(self):
+        """Write the build report JSON next to the build script"""
+        self.end_stage()
+
+        report = {
+            'generated_at': datetime.now().isoformat(),
+            'mode': self.mode,
+            'total': self._build_start.finish(self.conn),
+            'stages': self.stages,
+            'authors': sorted(self.authors, key=lambda a: a['wall_seconds'], reverse=True)
+        }
+
+        report_path = Path(__file__).parent / f"build_report_{self.mode}.json"
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        print(f"\n=== BUILD PROFILE ({self.mode.upper()}) ===")
+        print(f"{'Stage':<30} {'Wall':>9} {'CPU':>9} {'Rows':>12} {'Peak RSS':>10}")
+        print("-" * 74)
+        for stage in self.stages:
+            rss = f"{stage['peak_rss_mb']:.0f}MB" if stage['peak_rss_mb'] is not None else "n/a"
+            print(f"{stage['stage']:<30} {stage['wall_seconds']:>8.1f}s {stage['cpu_seconds']:>8.1f}s "
+                  f"{stage['rows_written']:>12,} {rss:>10}")
+
+        if report['authors']:
+            print("\nSlowest authors:")
+            for author in report['authors'][:10]:
+                print(f"  {author['name']:<28} {author['wall_seconds']:>8.1f}s {author['rows_written']:>12,} rows")
+
+        print(f"\n✓ Build report saved to {report_path}")
+        return report
+
+
+class _AuthorTimer:
+    def __init__(self, profiler, author_id, name, language):
+        self.profiler = profiler
+        self.record = {'author_id': author_id, 'name': name, 'language': language}
+
+    def __enter__(self):
+        self.start = _Measurement(self.profiler.conn)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.record.update(self.start.finish(self.profiler.conn))
+        self.record['failed'] = exc_type is not None
+        self.profiler.authors.append(self.record)
+        return False
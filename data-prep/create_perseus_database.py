@@ -4,8 +4,9 @@ Create SQLite database from Perseus Digital Library texts.
 This single script handles the entire database creation process.
 """
 
+import hashlib
 import sqlite3
-import xml.etree.ElementTree as ET
+import xml_backend as ET
 from pathlib import Path
 import re
 import json
@@ -14,6 +15,15 @@ import unicodedata
 from typing import Dict, List, Tuple, Optional, Set
 import subprocess
 import sys
+from book_line_stats import BookLineStats
+from build_profiler import BuildProfiler
+from cts_catalog import CTSCatalog
+from dictionary_merge import WIKTIONARY_SOURCE, merge_dictionary_entries
+from lsj_cache import DEFAULT_CACHE_FILE as LSJ_CACHE_FILE, LSJCache
+from parallel_zip import print_zip_stats, write_parallel_zip
+from sentence_segmenter import SentenceSegmenter
+from stage_cache import DEFAULT_CACHE_DIR as STAGE_CACHE_DIR, StageCache, code_fingerprint, file_sha256
+from translation_prepass import TranslationPrepassCache, choose_strategy, find_translator, scan_translation_file
 
 def normalize_greek(text):
     """Normalize Greek text by removing diacritics, punctuation, and converting to lowercase"""
@@ -608,57 +618,6 @@ def create_lemma_mappings(lsj_entries: List[Dict]) -> List[Dict]:
     print(f"✓ Generated {len(mappings)} lemma mappings from {len(lsj_entries)} LSJ entries")
     return mappings
 
-def parse_cts_metadata(cts_path):
-    """Parse CTS metadata file to get work information"""
-    try:
-        tree = ET.parse(cts_path)
-        root = tree.getroot()
-        
-        # Handle different namespace possibilities
-        work_info = {}
-        
-        # Extract title from title elements
-        for title_elem in root.iter():
-            if 'title' in title_elem.tag.lower():
-                lang = title_elem.get('{http://www.w3.org/XML/1998/namespace}lang', 
-                                    title_elem.get('lang', 'unk'))
-                if lang == 'eng':
-                    work_info['title_english'] = title_elem.text
-                elif lang == 'lat':
-                    work_info['title_latin'] = title_elem.text
-                elif lang in ['grc', 'greek']:
-                    work_info['title_greek'] = title_elem.text
-        
-        # Also check for English title in translation/label elements
-        for elem in root.iter():
-            if 'translation' in elem.tag.lower():
-                # Look for English label within translation
-                for label in elem.iter():
-                    if 'label' in label.tag.lower():
-                        lang = label.get('{http://www.w3.org/XML/1998/namespace}lang', 
-                                       label.get('lang', 'unk'))
-                        if lang == 'eng' and label.text:
-                            work_info['title_english'] = label.text
-                            break
-        
-        # Extract URN
-        urn = root.get('urn', '')
-        if not urn:
-            # Try to find it in work element
-            for elem in root.iter():
-                if 'work' in elem.tag.lower():
-                    urn = elem.get('urn', '')
-                    break
-        work_info['urn'] = urn
-        
-        # Extract work type (if available)
-        work_info['type'] = 'text'  # default
-        
-        return work_info
-    except Exception as e:
-        print(f"Error parsing CTS metadata {cts_path}: {e}")
-        return None
-
 def get_text_content(elem):
     """Get all text content from element and its children, excluding editorial elements"""
     text_parts = []
@@ -688,17 +647,12 @@ def get_text_content(elem):
     return ''.join(text_parts).strip()
 
 
-def get_section_line_mapping(cursor, book_id, max_section, segment_count=None):
+def get_section_line_mapping(book_stats, book_id, max_section, segment_count=None):
     """Create a mapping from section numbers to line ranges with improved detection"""
     
     # Get total lines for this book
-    cursor.execute("""
-        SELECT COUNT(*), MAX(CAST(line_number as INTEGER))
-        FROM text_lines 
-        WHERE book_id = ?
-    """, (book_id,))
-    
-    line_count, max_line = cursor.fetchone()
+    line_count = book_stats.line_count(book_id)
+    max_line = book_stats.line_range(book_id)[1]
     
     if not line_count or not max_line or not max_section:
         return {}
@@ -733,83 +687,252 @@ def get_section_line_mapping(cursor, book_id, max_section, segment_count=None):
     
     return {}
 
-def extract_translation_segments(book_elem, book_id, cursor, translator):
+TRANSLATION_MILESTONE_UNITS = ('line', 'card', 'section', 'chapter')
+
+# What a tag can be for TranslationSegmenter, matched with endswith() as
+# extract_translation_segments always has
+_SPEAKER, _LINE, _MILESTONE, _PARAGRAPH, _DIV, _EXCLUDED = 1, 2, 4, 8, 16, 32
+
+
+class TranslationSegmenter:
+    """Single traversal of a translation book element.
+
+    Walks the tree once and records, in document order, the candidates of every
+    segmentation strategy extract_translation_segments can choose: speakers and
+    their lines, milestones, paragraphs with the milestones inside them, section
+    and poem divs, and numbered lines. Element text is built bottom-up during the
+    same walk, so nested elements are read once instead of once per
+    get_text_content call.
+    """
+
+    EXCLUDED_TAGS = {'note', 'foreign', 'ref', 'bibl'}
+
+    def __init__(self, book_elem):
+        self.has_speakers = False
+        self.speech = []            # speaker and numbered line elements, in order
+        self.milestones = []        # line/card/section/chapter milestone elements
+        self.paragraphs = []        # (paragraph element, milestone n values inside it)
+        self.section_divs = []      # textpart divs with subtype section or chapter
+        self.poem_lines = []        # l elements of each poem div
+        self.numbered_lines = []    # l elements with a numeric n
+        self.text = {}              # element -> get_text_content(element)
+        self._kinds = {}
+        self._walk(book_elem, self._kind(book_elem.tag), (), ())
+
+    def _kind(self, tag):
+        """Bit flags for a tag, worked out once per distinct tag"""
+        kind = self._kinds.get(tag)
+        if kind is None:
+            local_tag = tag.split('}')[-1] if '}' in tag else tag
+            kind = ((_SPEAKER if tag.endswith('speaker') else _LINE if tag.endswith('l') else 0)
+                    | (_MILESTONE if tag.endswith('milestone') else 0)
+                    | (_PARAGRAPH if tag.endswith('p') else 0)
+                    | (_DIV if tag.endswith('div') else 0)
+                    | (_EXCLUDED if local_tag in self.EXCLUDED_TAGS else 0))
+            self._kinds[tag] = kind
+        return kind
+
+    def _walk(self, elem, kind, paragraph_milestones, poem_lines):
+        """Collect candidates under elem and return get_text_content(elem)"""
+        needs_text = False
+
+        if kind & _SPEAKER:
+            self.has_speakers = True
+            self.speech.append(elem)
+        elif kind & _LINE:
+            n = elem.get('n', '')
+            if n and n.isdigit():
+                self.speech.append(elem)
+                self.numbered_lines.append(elem)
+                needs_text = True
+            for lines in poem_lines:
+                lines.append(elem)
+                needs_text = True
+
+        if kind & _MILESTONE and elem.get('unit') in TRANSLATION_MILESTONE_UNITS:
+            self.milestones.append(elem)
+            n = elem.get('n', '')
+            if n:
+                for milestones in paragraph_milestones:
+                    milestones.append(n)
+
+        if kind & _PARAGRAPH:
+            milestones = []
+            self.paragraphs.append((elem, milestones))
+            paragraph_milestones += (milestones,)
+            needs_text = True
+
+        if kind & _DIV and elem.get('type') == 'textpart':
+            subtype = elem.get('subtype')
+            if subtype in ('section', 'chapter'):
+                self.section_divs.append(elem)
+                needs_text = True
+            elif subtype == 'poem':
+                lines = []
+                self.poem_lines.append(lines)
+                poem_lines += (lines,)
+
+        kinds = self._kinds
+        parts = [elem.text] if elem.text else []
+        for child in elem:
+            child_kind = kinds.get(child.tag)
+            if child_kind is None:
+                child_kind = self._kind(child.tag)
+            if len(child) or child_kind & ~_EXCLUDED:
+                child_text = self._walk(child, child_kind, paragraph_milestones, poem_lines)
+            elif child_kind:
+                # Editorial leaf such as <note>: no candidates, no text
+                child_text = ''
+            else:
+                # Plain leaf such as <hi>: get_text_content is just its stripped text
+                child_text = child.text.strip() if child.text else ''
+            if child_text:
+                parts.append(child_text)
+            if child.tail:
+                parts.append(child.tail)
+
+        text = '' if kind & _EXCLUDED else ''.join(parts).strip()
+        if needs_text:
+            self.text[elem] = text
+        return text
+
+    def speaker_segments(self, translator):
+        """One segment per speaker, spanning that speaker's numbered lines"""
+        segments = []
+        current_speaker = None
+        current_lines = []
+
+        def flush():
+            if current_speaker and current_lines:
+                segments.append({
+                    'start_line': current_lines[0]['line'],
+                    'end_line': current_lines[-1]['line'],
+                    'text': ' '.join(line['text'] for line in current_lines),
+                    'translator': translator,
+                    'speaker': current_speaker
+                })
+
+        for elem in self.speech:
+            if elem.tag.endswith('speaker'):
+                flush()
+                current_lines = []
+                current_speaker = elem.text.strip() if elem.text else None
+            elif current_speaker:
+                line_text = self.text[elem]
+                if line_text:
+                    current_lines.append({'line': int(elem.get('n')), 'text': line_text})
+        flush()
+        return segments
+
+    def reference_numbering(self, book_id):
+        """Return (is_bekker, is_stephanus, first_milestone_num) from the first numbered milestone"""
+        is_plato = book_id.split('.')[0] == 'tlg0059'
+        for milestone in self.milestones:
+            num_match = re.match(r'(\d+)', milestone.get('n', ''))
+            if num_match:
+                num = int(num_match.group(1))
+                # Stephanus: 3-digit numbers (100-999), common in Plato
+                if is_plato and 100 <= num <= 999:
+                    return False, True, num
+                # Bekker: 4-digit numbers (> 1000), common in Aristotle
+                return num > 1000, False, num
+        return False, False, None
+
+    def milestone_segments(self, translator, sequential):
+        """Paragraphs that contain milestones, keyed by their milestone numbers
+        (or numbered sequentially for Bekker/Stephanus references)"""
+        segments = []
+        current_line = 1
+        for para, milestone_refs in self.paragraphs:
+            milestones_in_para = []
+            for n in milestone_refs:
+                # Try to extract numeric part for sorting
+                try:
+                    milestones_in_para.append(int(n))
+                except ValueError:
+                    # For Stephanus pagination like "327a", use the number part
+                    num_match = re.match(r'(\d+)', n)
+                    if num_match:
+                        milestones_in_para.append(int(num_match.group(1)))
+                    else:
+                        # For non-numeric references, use hash of string for ordering
+                        milestones_in_para.append(hash(n) % 10000)
+
+            para_text = self.text[para]
+            if milestones_in_para and para_text:
+                if sequential:
+                    start_line = end_line = current_line
+                    current_line += 1
+                else:
+                    # Associate paragraph with first milestone
+                    start_line, end_line = milestones_in_para[0], milestones_in_para[-1]
+                segments.append({
+                    'start_line': start_line,
+                    'end_line': end_line,
+                    'text': para_text,
+                    'translator': translator
+                })
+        return segments
+
+    def section_segments(self, translator):
+        """Numbered section/chapter divs"""
+        segments = []
+        for div in self.section_divs:
+            section_n = div.get('n', '')
+            if section_n.isdigit() and self.text[div]:
+                section_num = int(section_n)
+                segments.append({
+                    'start_line': section_num,
+                    'end_line': section_num,
+                    'text': self.text[div],
+                    'translator': translator
+                })
+        return segments
+
+    def paragraph_segments(self, translator):
+        """Paragraphs longer than 20 characters, numbered sequentially"""
+        texts = [self.text[para] for para, _ in self.paragraphs]
+        texts = [text for text in texts if len(text) > 20]
+        return [{'start_line': number, 'end_line': number, 'text': text, 'translator': translator}
+                for number, text in enumerate(texts, 1)]
+
+    def line_segments(self, translator):
+        """Lines of poem divs numbered sequentially, or else numbered lines"""
+        if self.poem_lines:
+            texts = [self.text[line] for lines in self.poem_lines for line in lines]
+            return [{'start_line': number, 'end_line': number, 'text': text, 'translator': translator}
+                    for number, text in enumerate((text for text in texts if text), 1)]
+
+        segments = []
+        for line in self.numbered_lines:
+            if self.text[line]:
+                n = int(line.get('n'))
+                segments.append({'start_line': n, 'end_line': n, 'text': self.text[line], 'translator': translator})
+        return segments
+
+
+def extract_translation_segments(book_elem, book_id, cursor, translator, book_stats):
     """Extract translation segments based on milestone markers"""
-    segments = []
-    
     # Debug: print what we're processing
     elem_tag = book_elem.tag.split('}')[-1] if '}' in book_elem.tag else book_elem.tag
     print(f"        → Extracting from {elem_tag} for {book_id} (translator: {translator})")
     
-    # First check if this is a dramatic text with speaker tags
-    has_speakers = False
-    for elem in book_elem.iter():
-        if elem.tag.endswith('speaker'):
-            has_speakers = True
-            break
+    segmenter = TranslationSegmenter(book_elem)
+    segments = []
     
-    if has_speakers:
+    # First check if this is a dramatic text with speaker tags
+    if segmenter.has_speakers:
         # Process dramatic text with speakers
         print(f"          Processing dramatic text with speakers")
-        current_speaker = None
-        current_lines = []
-        
-        for elem in book_elem.iter():
-            # Track current speaker
-            if elem.tag.endswith('speaker'):
-                # Save previous speaker's lines if any
-                if current_speaker and current_lines:
-                    # Consolidate lines for this speaker
-                    start_line = current_lines[0]['line']
-                    end_line = current_lines[-1]['line']
-                    text = ' '.join(line['text'] for line in current_lines)
-                    segments.append({
-                        'start_line': start_line,
-                        'end_line': end_line,
-                        'text': text,
-                        'translator': translator,
-                        'speaker': current_speaker
-                    })
-                    current_lines = []
-                
-                current_speaker = elem.text.strip() if elem.text else None
-            
-            # Collect lines for current speaker
-            elif elem.tag.endswith('l') and current_speaker:
-                line_n = elem.get('n', '')
-                if line_n and line_n.isdigit():
-                    line_text = get_text_content(elem).strip()
-                    if line_text:
-                        current_lines.append({
-                            'line': int(line_n),
-                            'text': line_text
-                        })
-        
-        # Don't forget the last speaker's lines
-        if current_speaker and current_lines:
-            start_line = current_lines[0]['line']
-            end_line = current_lines[-1]['line']
-            text = ' '.join(line['text'] for line in current_lines)
-            segments.append({
-                'start_line': start_line,
-                'end_line': end_line,
-                'text': text,
-                'translator': translator,
-                'speaker': current_speaker
-            })
-        
+        segments = segmenter.speaker_segments(translator)
         print(f"          Extracted {len(segments)} segments with speakers")
-        
+    
     # Check if there are any milestones at all
-    milestones_found = False
-    milestone_count = 0
-    for elem in book_elem.iter():
-        if elem.tag.endswith('milestone') and elem.get('unit') in ['line', 'card', 'section', 'chapter']:
-            milestones_found = True
-            milestone_count += 1
-            if milestone_count <= 3:
-                print(f"          Found milestone: unit={elem.get('unit')}, n={elem.get('n')}")
-            break
+    milestones_found = bool(segmenter.milestones)
+    milestone_count = 1 if milestones_found else 0
+    if milestones_found:
+        first = segmenter.milestones[0]
+        print(f"          Found milestone: unit={first.get('unit')}, n={first.get('n')}")
     
     print(f"          Milestones found: {milestones_found} (total: {milestone_count})")
     
@@ -818,164 +941,30 @@ def extract_translation_segments(book_elem, book_id, cursor, translator):
         pass  # Already have segments from speaker processing
     elif milestones_found:
         # Handle milestones inside paragraphs (common in Perseus translations)
-        para_count = 0
-        
-        # First, check if this uses Bekker or Stephanus numbering
-        is_bekker = False
-        is_stephanus = False
-        first_milestone_num = None
-        
-        # Check if this is a Plato work (uses Stephanus) or Aristotle work (uses Bekker)
-        author_id = book_id.split('.')[0]
-        is_plato = author_id == 'tlg0059'
-        
-        for child in book_elem.iter():
-            if child.tag.endswith('milestone') and child.get('unit') in ['line', 'card', 'section', 'chapter']:
-                n = child.get('n', '')
-                if n:
-                    num_match = re.match(r'(\d+)', n)
-                    if num_match:
-                        num = int(num_match.group(1))
-                        if first_milestone_num is None:
-                            first_milestone_num = num
-                        
-                        # Stephanus: 3-digit numbers (100-999), common in Plato
-                        if is_plato and 100 <= num <= 999:
-                            is_stephanus = True
-                        # Bekker: 4-digit numbers (> 1000), common in Aristotle
-                        elif num > 1000:
-                            is_bekker = True
-                        break
+        # First, check if this uses Bekker (Aristotle) or Stephanus (Plato) numbering
+        is_bekker, is_stephanus, first_milestone_num = segmenter.reference_numbering(book_id)
         
         if is_bekker:
             print(f"          Detected Bekker numbering (first reference: {first_milestone_num})")
         elif is_stephanus:
             print(f"          Detected Stephanus pagination (first reference: {first_milestone_num})")
         
-        current_line = 1  # Track actual line numbers for Bekker texts
-        
-        for para in book_elem.iter():
-            if para.tag.endswith('p'):
-                para_count += 1
-                # Check for milestones in this paragraph
-                milestones_in_para = []
-                for child in para.iter():
-                    if child.tag.endswith('milestone') and child.get('unit') in ['line', 'card', 'section', 'chapter']:
-                        n = child.get('n', '')
-                        if n:
-                            # Try to extract numeric part for sorting
-                            try:
-                                # For pure numbers
-                                line_num = int(n)
-                                milestones_in_para.append(line_num)
-                            except ValueError:
-                                # For Stephanus pagination like "327a", use the number part
-                                num_match = re.match(r'(\d+)', n)
-                                if num_match:
-                                    line_num = int(num_match.group(1))
-                                    milestones_in_para.append(line_num)
-                                else:
-                                    # For non-numeric references, use hash of string for ordering
-                                    milestones_in_para.append(hash(n) % 10000)
-                
-                # Get paragraph text
-                para_text = get_text_content(para).strip()
-                
-                if milestones_in_para and para_text:
-                    if is_bekker or is_stephanus:
-                        # For Bekker/Stephanus numbering, use sequential line numbers
-                        segments.append({
-                            'start_line': current_line,
-                            'end_line': current_line,
-                            'text': para_text,
-                            'translator': translator
-                        })
-                        current_line += 1
-                    else:
-                        # Associate paragraph with first milestone
-                        segments.append({
-                            'start_line': milestones_in_para[0],
-                            'end_line': milestones_in_para[-1] if len(milestones_in_para) > 1 else milestones_in_para[0],
-                            'text': para_text,
-                            'translator': translator
-                        })
+        # For Bekker/Stephanus numbering, use sequential line numbers
+        segments = segmenter.milestone_segments(translator, is_bekker or is_stephanus)
         
-        print(f"          Processed {para_count} paragraphs, extracted {len(segments)} segments")
+        print(f"          Processed {len(segmenter.paragraphs)} paragraphs, extracted {len(segments)} segments")
     else:
         # No milestones - look for sections/chapters
-        sections_found = False
-        for elem in book_elem.iter():
-            if (elem.tag.endswith('div') and 
-                elem.get('type') == 'textpart' and 
-                elem.get('subtype') in ['section', 'chapter']):
-                sections_found = True
-                section_n = elem.get('n', '')
-                if section_n.isdigit():
-                    section_num = int(section_n)
-                    section_text = get_text_content(elem).strip()
-                    if section_text:
-                        segments.append({
-                            'start_line': section_num,
-                            'end_line': section_num,
-                            'text': section_text,
-                            'translator': translator
-                        })
+        segments = segmenter.section_segments(translator)
         
         # If no sections, just extract paragraphs
-        if not sections_found:
-            para_num = 1
-            for para in book_elem.iter():
-                if para.tag.endswith('p'):
-                    para_text = get_text_content(para).strip()
-                    if para_text and len(para_text) > 20:
-                        segments.append({
-                            'start_line': para_num,
-                            'end_line': para_num,
-                            'text': para_text,
-                            'translator': translator
-                        })
-                        para_num += 1
+        if not segmenter.section_divs:
+            segments = segmenter.paragraph_segments(translator)
     
     # Also check for line elements (even if we found some paragraphs)
     # This handles cases like Horace Book 3 which has both paragraphs and lines
     if len(segments) < 50:  # If we have very few segments, also look for lines
-        # First check if there are poem subdivisions (like in Horace)
-        poem_divs = []
-        for div in book_elem.iter():
-            if (div.tag.endswith('div') and 
-                div.get('type') == 'textpart' and 
-                div.get('subtype') == 'poem'):
-                poem_divs.append(div)
-        
-        if poem_divs:
-            # Process poems individually
-            line_num = 1
-            for poem_div in poem_divs:
-                for elem in poem_div.iter():
-                    if elem.tag.endswith('l'):
-                        line_text = get_text_content(elem).strip()
-                        if line_text:
-                            segments.append({
-                                'start_line': line_num,
-                                'end_line': line_num,
-                                'text': line_text,
-                                'translator': translator
-                            })
-                            line_num += 1
-        else:
-            # No poem subdivisions, extract lines directly
-            for elem in book_elem.iter():
-                if elem.tag.endswith('l'):
-                    n = elem.get('n', '')
-                    if n and n.isdigit():
-                        line_text = get_text_content(elem).strip()
-                        if line_text:
-                            segments.append({
-                                'start_line': int(n),
-                                'end_line': int(n),
-                                'text': line_text,
-                                'translator': translator
-                            })
+        segments += segmenter.line_segments(translator)
     
     # Insert segments into database
     inserted_count = 0
@@ -983,7 +972,7 @@ def extract_translation_segments(book_elem, book_id, cursor, translator):
     # Check if we need section-to-line mapping
     max_section = max((s['start_line'] for s in segments if isinstance(s['start_line'], int)), default=0)
     # Pass segment count to improve section detection
-    section_map = get_section_line_mapping(cursor, book_id, max_section, len(segments))
+    section_map = get_section_line_mapping(book_stats, book_id, max_section, len(segments))
     
     for segment in segments:
         start_line = segment['start_line']
@@ -1051,10 +1040,13 @@ def process_prose_translation(root, book_id, cursor, translator):
         """, (book_id, section['number'], section['number'], 
               section['text'], translator, None))
 
-def process_translations(work_dir, work_id, cursor):
-    """Process English translations for a work"""
+def process_translations(work_dir, work_id, cursor, book_stats, translation_prepass, translation_files):
+    """Process English translations for a work
+    
+    translation_files are the names of the *eng*.xml files in work_dir (from the CTS catalog).
+    """
     # Find English translation files
-    translation_files = list(work_dir.glob("*eng*.xml"))
+    translation_files = [work_dir / name for name in translation_files]
     if not translation_files:
         return
         
@@ -1063,91 +1055,9 @@ def process_translations(work_dir, work_id, cursor):
         print(f"      Processing translation: {trans_file.name}")
         
         try:
-            tree = ET.parse(trans_file)
-            root = tree.getroot()
-            
-            # Extract translator name from header
-            translator = None
-            
-            # Try multiple locations for translator info
-            # 1. Editor with role="translator"
-            for elem in root.iter():
-                if 'editor' in elem.tag.lower() and elem.get('role') == 'translator':
-                    translator = elem.text
-                    if translator:
-                        translator = translator.strip()
-                        break
-            
-            # 2. If not found, check respStmt
-            if not translator:
-                for resp in root.iter():
-                    if resp.tag.endswith('respStmt'):
-                        # Look for resp with "translator" or "trans" in it
-                        resp_text = ''.join(resp.itertext()).lower()
-                        if 'translat' in resp_text:
-                            # Find the name element
-                            for name in resp.iter():
-                                if name.tag.endswith('name') and name.text:
-                                    translator = name.text.strip()
-                                    # Filter out non-translator names
-                                    if not any(skip in translator.lower() for skip in ['lisa cerrato', 'william merrill', 'elli mylonas', 'david smith']):
-                                        break
-                        if translator:
-                            break
-            
-            # 3. Check author elements with translator role
-            if not translator:
-                for elem in root.iter():
-                    if elem.tag.endswith('author'):
-                        role = elem.get('role', '')
-                        if 'trans' in role.lower():
-                            translator = elem.text
-                            if translator:
-                                translator = translator.strip()
-                                break
-            
-            # 4. Extract from filename pattern (e.g., perseus-eng3.xml might be Butler)
-            if not translator and 'eng' in trans_file.name:
-                # Common translator mappings based on filenames
-                filename = trans_file.name
-                filename_mappings = {
-                    # Homer
-                    'tlg0012.tlg001.perseus-eng3.xml': 'Samuel Butler',
-                    'tlg0012.tlg001.perseus-eng4.xml': 'A. T. Murray',
-                    'tlg0012.tlg002.perseus-eng3.xml': 'Samuel Butler',
-                    'tlg0012.tlg002.perseus-eng4.xml': 'A. T. Murray',
-                    # Herodotus
-                    'tlg0016.tlg001.perseus-eng2.xml': 'A. D. Godley',
-                    # Xenophon
-                    'tlg0032.tlg001.perseus-eng2.xml': 'H. G. Dakyns',
-                    'tlg0032.tlg002.perseus-eng2.xml': 'H. G. Dakyns',
-                    'tlg0032.tlg006.perseus-eng2.xml': 'H. G. Dakyns',
-                    'tlg0032.tlg007.perseus-eng2.xml': 'H. G. Dakyns',
-                    # Aristotle
-                    'tlg0086.tlg003.perseus-eng2.xml': 'Frederic G. Kenyon',
-                    'tlg0086.tlg025.perseus-eng2.xml': 'Hugh Tredennick',
-                    'tlg0086.tlg010.perseus-eng2.xml': 'Harris Rackham',
-                    'tlg0086.tlg038.perseus-eng2.xml': 'John Henry Freese',
-                    'tlg0086.tlg034.perseus-eng2.xml': 'William Hamilton Fyfe',
-                    'tlg0086.tlg035.perseus-eng2.xml': 'Harris Rackham',
-                    'tlg0086.tlg009.perseus-eng2.xml': 'Harris Rackham',
-                    'tlg0086.tlg029.perseus-eng2.xml': 'George Cyril Armstrong',
-                    'tlg0086.tlg045.perseus-eng2.xml': 'H. Rackham',
-                    # Plutarch
-                    'tlg0007.tlg051.perseus-eng1.xml': 'Bernadotte Perrin',
-                    'tlg0007.tlg052.perseus-eng1.xml': 'Bernadotte Perrin',
-                    # Horace
-                    'phi0893.phi004.perseus-eng2.xml': 'Christopher Smart'
-                }
-                
-                if filename in filename_mappings:
-                    translator = filename_mappings[filename]
-                elif 'butler' in filename.lower():
-                    translator = 'Samuel Butler'
-                elif 'murray' in filename.lower():
-                    translator = 'A. T. Murray'
-                elif 'jowett' in filename.lower():
-                    translator = 'Benjamin Jowett'
+            # Translator and strategy come from the header-only prepass (cached per file)
+            scan = translation_prepass.scan(trans_file)
+            translator = scan['translator']
             
             # Default translator if none found
             if not translator:
@@ -1156,31 +1066,15 @@ def process_translations(work_dir, work_id, cursor):
             else:
                 print(f"      Translator: {translator}")
             
-            # Check if this is prose or drama
-            # First check if there are book divisions (epic poetry)
-            has_books = False
-            for div in root.iter():
-                if (div.tag.endswith('div') and 
-                    div.get('type') == 'textpart' and 
-                    div.get('subtype', '').lower() == 'book'):
-                    has_books = True
-                    break
-            
-            # If it has books, it's epic poetry (Homer, Virgil, etc) - use regular processing
-            if has_books:
-                is_prose = False
-                is_drama = False
+            strategy = choose_strategy(scan, work_id)
+            if scan['has_books']:
                 print(f"      → Has book divisions, treating as epic poetry")
-            else:
-                # Count actual elements to determine if it's primarily prose or poetry
-                p_count = sum(1 for elem in root.iter() if elem.tag.endswith('p'))
-                l_count = sum(1 for elem in root.iter() if elem.tag.endswith('l'))
-                # If there are many more paragraphs than lines, it's prose (even if it has some verse quotations)
-                is_prose = p_count > 0 and p_count > (l_count * 2)
-                
-                author_id = work_id.split('.')[0]
-                # Drama authors: Aeschylus, Sophocles, Euripides, Aristophanes
-                is_drama = author_id in ['tlg0085', 'tlg0011', 'tlg0006', 'tlg0019']
+            is_prose = strategy == 'prose'
+            is_drama = strategy == 'drama'
+            
+            # Only the chosen extractor needs the full tree
+            tree = ET.parse(trans_file)
+            root = tree.getroot()
             
             if is_prose:
                 # For prose, use extract_translation_segments which handles both milestones and sections
@@ -1194,12 +1088,12 @@ def process_translations(work_dir, work_id, cursor):
                         break
                 
                 if trans_div is not None:
-                    extract_translation_segments(trans_div, book_id, cursor, translator)
+                    extract_translation_segments(trans_div, book_id, cursor, translator, book_stats)
                 else:
                     # If no translation div, process the whole body
                     for body in root.iter():
                         if body.tag.endswith('body'):
-                            extract_translation_segments(body, book_id, cursor, translator)
+                            extract_translation_segments(body, book_id, cursor, translator, book_stats)
                             break
             elif is_drama:
                 # For dramas, process the entire translation as one book
@@ -1213,12 +1107,12 @@ def process_translations(work_dir, work_id, cursor):
                         break
                 
                 if trans_div is not None:
-                    extract_translation_segments(trans_div, book_id, cursor, translator)
+                    extract_translation_segments(trans_div, book_id, cursor, translator, book_stats)
                 else:
                     # If no translation div, process the whole body
                     for body in root.iter():
                         if body.tag.endswith('body'):
-                            extract_translation_segments(body, book_id, cursor, translator)
+                            extract_translation_segments(body, book_id, cursor, translator, book_stats)
                             break
             else:
                 # Regular processing for texts with book divisions
@@ -1251,7 +1145,7 @@ def process_translations(work_dir, work_id, cursor):
                             print(f"        → Non-numeric book '{book_num}', using book {book_counter}")
                         
                         # Extract translation segments with milestones
-                        count = extract_translation_segments(book_div, book_id, cursor, translator)
+                        count = extract_translation_segments(book_div, book_id, cursor, translator, book_stats)
                         if count == 0 and translation_div is None:
                             print(f"        Warning: No segments extracted for {book_id}")
                 
@@ -1259,20 +1153,19 @@ def process_translations(work_dir, work_id, cursor):
                 if not books_found:
                     book_id = f"{work_id}.001"
                     if translation_div is not None:
-                        extract_translation_segments(translation_div, book_id, cursor, translator)
+                        extract_translation_segments(translation_div, book_id, cursor, translator, book_stats)
                     else:
                         for body in root.iter():
                             if body.tag.endswith('body'):
-                                extract_translation_segments(body, book_id, cursor, translator)
+                                extract_translation_segments(body, book_id, cursor, translator, book_stats)
                                 break
                     
         except Exception as e:
             print(f"      Error processing translation {trans_file}: {e}")
 
-def process_prose_with_books(root, work_id, cursor, language):
+def process_prose_with_books(root, work_id, cursor, language, book_stats):
     """Process prose texts that have book divisions (like Herodotus)"""
-    import re
-    
+    segmenter = SentenceSegmenter(language)
     books_processed = 0
     
     # Process each book
@@ -1302,35 +1195,16 @@ def process_prose_with_books(root, work_id, cursor, language):
                 
                 section_n = elem.get('n', str(line_num + 1))
                 
-                # Extract paragraphs from this section
-                for p in elem.iter():
-                    if p.tag.endswith('p'):
-                        text = ''.join(p.itertext()).strip()
-                        if text and len(text) > 5:  # Skip very short text
-                            # Split long paragraphs into sentences
-                            if language == 'greek':
-                                sentences = re.split(r'[.!?·;]\s+', text)
-                            else:
-                                sentences = re.split(r'[.!?]\s+', text)
-                            
-                            # Process each sentence as a line
-                            for sentence in sentences:
-                                sentence = sentence.strip()
-                                # Filter out editorial notes
-                                if (sentence and len(sentence) > 10 and 
-                                    not re.match(r'^[A-Z]:', sentence) and
-                                    not sentence.startswith('em.') and
-                                    not sentence.startswith('add.') and
-                                    'Nauck' not in sentence and
-                                    'Mullach' not in sentence and
-                                    not sentence.startswith('id.')):
-                                    line_num += 1
-                                    all_lines.append({
-                                        'number': line_num,
-                                        'text': sentence,
-                                        'section': section_n,
-                                        'xml': ''
-                                    })
+                # Split this section's paragraphs into sentences, one line each
+                for sentence in segmenter.segment_paragraphs(
+                        ''.join(p.itertext()) for p in elem.iter() if p.tag.endswith('p')):
+                    line_num += 1
+                    all_lines.append({
+                        'number': line_num,
+                        'text': sentence,
+                        'section': section_n,
+                        'xml': ''
+                    })
         
         if all_lines:
             # Insert book with actual line count
@@ -1342,6 +1216,7 @@ def process_prose_with_books(root, work_id, cursor, language):
             
             # Clear existing text lines and words for this book
             cursor.execute("DELETE FROM text_lines WHERE book_id = ?", (book_id,))
+            book_stats.clear_book(book_id)
             cursor.execute("DELETE FROM words WHERE book_id = ?", (book_id,))
             
             # Insert all lines
@@ -1351,6 +1226,7 @@ def process_prose_with_books(root, work_id, cursor, language):
                     (book_id, line_number, line_text, line_xml, speaker)
                     VALUES (?, ?, ?, ?, ?)
                 """, (book_id, line['number'], line['text'], line['xml'], None))
+                book_stats.add_line(book_id, line['number'])
                 
                 # Insert words into words table
                 words = line['text'].split()
@@ -1372,7 +1248,7 @@ def process_prose_with_books(root, work_id, cursor, language):
     if books_processed == 0:
         print(f"      Warning: No books found for {work_id}")
 
-def process_prose_text(root, work_id, cursor, language):
+def process_prose_text(root, work_id, cursor, language, book_stats):
     """Process prose texts which have sections instead of lines"""
     import re
     
@@ -1387,13 +1263,16 @@ def process_prose_text(root, work_id, cursor, language):
     
     # If it has books, process it with book divisions
     if has_books:
-        process_prose_with_books(root, work_id, cursor, language)
+        process_prose_with_books(root, work_id, cursor, language, book_stats)
         return
     
     # Otherwise treat the entire work as one book
     book_id = f"{work_id}.001"
     all_lines = []
     line_num = 0
+    segmenter = SentenceSegmenter(language)
+    # Sections without paragraphs keep "id." sentences but need more than 20 characters
+    section_segmenter = SentenceSegmenter(language, min_length=20, skip_id_notes=False)
     
     # Find all sections (divs with type="textpart" and subtype="section" or "chapter")
     for elem in root.iter():
@@ -1404,39 +1283,18 @@ def process_prose_text(root, work_id, cursor, language):
             section_n = elem.get('n', str(line_num + 1))
             
             # First try to extract paragraphs from this section
-            paragraphs_found = False
-            for p in elem.iter():
-                if p.tag.endswith('p'):
-                    paragraphs_found = True
-                    text = ''.join(p.itertext()).strip()
-                    if text and len(text) > 5:  # Skip very short text
-                        # Split long paragraphs into sentences for better readability
-                        # Greek uses · or ; as sentence separators, plus standard . ! ?
-                        if language == 'greek':
-                            # Split on Greek punctuation
-                            sentences = re.split(r'[.!?·;]\s+', text)
-                        else:
-                            # Split on Latin punctuation
-                            sentences = re.split(r'[.!?]\s+', text)
-                        
-                        # Process each sentence as a line
-                        for sentence in sentences:
-                            sentence = sentence.strip()
-                            # Filter out editorial notes and very short sentences
-                            if (sentence and len(sentence) > 10 and 
-                                not re.match(r'^[A-Z]:', sentence) and  # Skip "W:" style notes
-                                not sentence.startswith('em.') and      # Skip "em." notes
-                                not sentence.startswith('add.') and     # Skip "add." notes
-                                'Nauck' not in sentence and             # Skip Nauck references
-                                'Mullach' not in sentence and           # Skip Mullach references
-                                not sentence.startswith('id.')):        # Skip "id." references
-                                line_num += 1
-                                all_lines.append({
-                                    'number': line_num,
-                                    'text': sentence,
-                                    'section': section_n,
-                                    'xml': ''
-                                })
+            paragraphs = [''.join(p.itertext()) for p in elem.iter() if p.tag.endswith('p')]
+            paragraphs_found = bool(paragraphs)
+            
+            # Split long paragraphs into sentences for better readability
+            for sentence in segmenter.segment_paragraphs(paragraphs):
+                line_num += 1
+                all_lines.append({
+                    'number': line_num,
+                    'text': sentence,
+                    'section': section_n,
+                    'xml': ''
+                })
             
             # If no paragraphs found, treat the entire section text as prose
             if not paragraphs_found:
@@ -1468,27 +1326,14 @@ def process_prose_text(root, work_id, cursor, language):
                     text = re.sub(r'\s+', ' ', text)
                 
                 if text and len(text) > 20:  # Skip very short sections
-                    if language == 'greek':
-                        sentences = re.split(r'[.!?·;]\s+', text)
-                    else:
-                        sentences = re.split(r'[.!?]\s+', text)
-                    
-                    for sentence in sentences:
-                        sentence = sentence.strip()
-                        # Filter out editorial notes and very short sentences
-                        if (sentence and len(sentence) > 20 and 
-                            not re.match(r'^[A-Z]:', sentence) and  # Skip "W:" style notes
-                            not sentence.startswith('em.') and      # Skip "em." notes
-                            not sentence.startswith('add.') and     # Skip "add." notes
-                            'Nauck' not in sentence and             # Skip Nauck references
-                            'Mullach' not in sentence):             # Skip Mullach references
-                            line_num += 1
-                            all_lines.append({
-                                'number': line_num,
-                                'text': sentence,
-                                'section': section_n,
-                                'xml': ''
-                            })
+                    for sentence in section_segmenter.sentences(text):
+                        line_num += 1
+                        all_lines.append({
+                            'number': line_num,
+                            'text': sentence,
+                            'section': section_n,
+                            'xml': ''
+                        })
     
     if all_lines:
         # Insert book with actual line count
@@ -1505,6 +1350,7 @@ def process_prose_text(root, work_id, cursor, language):
                 (book_id, line_number, line_text, line_xml, speaker)
                 VALUES (?, ?, ?, ?, ?)
             """, (book_id, line['number'], line['text'], line['xml'], None))
+            book_stats.add_line(book_id, line['number'])
             
             # Insert words into words table
             words = line['text'].split()
@@ -1523,7 +1369,7 @@ def process_prose_text(root, work_id, cursor, language):
         
         print(f"      Complete Text: {len(all_lines)} lines")
 
-def process_text_file(xml_path, work_id, cursor, language):
+def process_text_file(xml_path, work_id, cursor, language, book_stats):
     """Process a single text file and extract books/lines"""
     try:
         tree = ET.parse(xml_path)
@@ -1540,7 +1386,7 @@ def process_text_file(xml_path, work_id, cursor, language):
         # Special handling for Aristotle's Politics (which has books)
         if work_id == 'tlg0086.tlg035':
             print(f"      Special handling for Aristotle's Politics...")
-            process_prose_with_books(root, work_id, cursor, language)
+            process_prose_with_books(root, work_id, cursor, language, book_stats)
             return
         
         # Check if this is prose by looking for paragraphs
@@ -1561,7 +1407,7 @@ def process_text_file(xml_path, work_id, cursor, language):
         
         if is_prose:
             # For prose texts, process sections as the main unit
-            process_prose_text(root, work_id, cursor, language)
+            process_prose_text(root, work_id, cursor, language, book_stats)
             return
         elif is_drama:
             # For dramatic texts, treat the entire play as one book
@@ -1606,6 +1452,7 @@ def process_text_file(xml_path, work_id, cursor, language):
                         (book_id, line_number, line_text, line_xml, speaker)
                         VALUES (?, ?, ?, ?, ?)
                     """, (book_id, line['number'], line['text'], line['xml'], line.get('speaker')))
+                    book_stats.add_line(book_id, line['number'])
                     
                     # Insert words into words table
                     words = line['text'].split()
@@ -1674,6 +1521,7 @@ def process_text_file(xml_path, work_id, cursor, language):
                             (book_id, line_number, line_text, line_xml, speaker)
                             VALUES (?, ?, ?, ?, ?)
                         """, (book_id, line['number'], line['text'], line['xml'], None))
+                        book_stats.add_line(book_id, line['number'])
                         
                         # Insert words into words table
                         words = line['text'].split()
@@ -1724,6 +1572,7 @@ def process_text_file(xml_path, work_id, cursor, language):
                         (book_id, line_number, line_text, line_xml, speaker)
                         VALUES (?, ?, ?, ?, ?)
                     """, (book_id, line['number'], line['text'], line['xml'], None))
+                    book_stats.add_line(book_id, line['number'])
                     
                     # Insert words into words table
                     words = line['text'].split()
@@ -1747,27 +1596,13 @@ def process_text_file(xml_path, work_id, cursor, language):
         import traceback
         traceback.print_exc()
 
-def process_perseus_author(author_dir, language, cursor):
+def process_perseus_author(author_dir, language, cursor, book_stats, translation_prepass, catalog):
     """Process all works for a single author"""
     author_id = author_dir.name
     
-    # Read author metadata
-    author_cts = author_dir / "__cts__.xml"
-    author_name = author_id  # default
-    
-    if author_cts.exists():
-        try:
-            tree = ET.parse(author_cts)
-            root = tree.getroot()
-            
-            # Find groupname
-            for elem in root.iter():
-                if 'groupname' in elem.tag.lower():
-                    author_name = elem.text or author_id
-                    break
-        except:
-            pass
-    
+    # Read author metadata (parsed once and cached by the CTS catalog)
+    author_entry = catalog.author(author_dir)
+    author_name = author_entry['groupname'] or author_id
     
     print(f"\nProcessing author: {author_name} ({author_id})")
     
@@ -1778,20 +1613,17 @@ def process_perseus_author(author_dir, language, cursor):
     works_processed = 0
     
     # Process each work
-    for work_dir in author_dir.iterdir():
-        if not work_dir.is_dir() or work_dir.name.startswith('__'):
-            continue
-        
-        work_num = work_dir.name
+    for work_num in author_entry['works']:
+        work_dir = author_dir / work_num
         work_id = f"{author_id}.{work_num}"
         
         # Read work metadata
-        work_cts = work_dir / "__cts__.xml"
-        if not work_cts.exists():
+        work_entry = catalog.work(work_dir)
+        if not work_entry['has_cts']:
             print(f"  Warning: No metadata for work {work_id}")
             continue
         
-        work_info = parse_cts_metadata(work_cts)
+        work_info = work_entry['metadata']
         if not work_info:
             continue
         
@@ -1821,8 +1653,7 @@ def process_perseus_author(author_dir, language, cursor):
             title_english = latin_to_english[title_english]
         
         # Find text files first - before processing anything
-        text_files = list(work_dir.glob("*.xml"))
-        text_files = [f for f in text_files if not f.name.startswith('__')]
+        text_files = [work_dir / name for name in work_entry['text_files']]
         
         if not text_files:
             print(f"  Skipping work: {title_english} ({work_id}) - no text files found")
@@ -1864,54 +1695,46 @@ def process_perseus_author(author_dir, language, cursor):
         print(f"    Reading {text_file.name}...")
         
         # Parse the text
-        process_text_file(text_file, work_id, cursor, language)
+        process_text_file(text_file, work_id, cursor, language, book_stats)
         
         # Process translations for this work
-        process_translations(work_dir, work_id, cursor)
+        process_translations(work_dir, work_id, cursor, book_stats, translation_prepass,
+                             work_entry['translation_files'])
     
     # If no works were processed, remove the author
     if works_processed == 0:
         print(f"    No suitable works found, removing author: {author_name} ({author_id})")
         cursor.execute("DELETE FROM authors WHERE id = ?", (author_id,))
 
-def generate_manifest(cursor):
-    """Generate a manifest file with database contents"""
-    manifest = {
-        "generated_at": datetime.now().isoformat(),
-        "database_version": "2.0",
-        "statistics": {},
-        "authors": []
-    }
+MANIFEST_DATABASE_VERSION = "2.0"
+
+def manifest_statistics(cursor):
+    """Overall statistics of the database, as stored in the manifest"""
+    statistics = {}
     
     # Get overall statistics
-    cursor.execute("SELECT COUNT(*) FROM authors")
-    manifest["statistics"]["total_authors"] = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM works")
-    manifest["statistics"]["total_works"] = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM books")
-    manifest["statistics"]["total_books"] = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM text_lines")
-    manifest["statistics"]["total_lines"] = cursor.fetchone()[0]
-    
     # word_forms statistics removed - not needed
-    
-    cursor.execute("SELECT COUNT(*) FROM translation_segments")
-    manifest["statistics"]["total_translation_segments"] = cursor.fetchone()[0]
-    
-    # Dictionary and lemma statistics
-    cursor.execute("SELECT COUNT(*) FROM dictionary_entries")
-    manifest["statistics"]["total_dictionary_entries"] = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM lemma_map")
-    manifest["statistics"]["total_lemma_mappings"] = cursor.fetchone()[0]
+    cursor.execute("""
+        SELECT (SELECT COUNT(*) FROM authors),
+               (SELECT COUNT(*) FROM works),
+               (SELECT COUNT(*) FROM books),
+               (SELECT COUNT(*) FROM text_lines),
+               (SELECT COUNT(*) FROM translation_segments),
+               (SELECT COUNT(*) FROM dictionary_entries),
+               (SELECT COUNT(*) FROM lemma_map)
+    """)
+    (statistics["total_authors"],
+     statistics["total_works"],
+     statistics["total_books"],
+     statistics["total_lines"],
+     statistics["total_translation_segments"],
+     statistics["total_dictionary_entries"],
+     statistics["total_lemma_mappings"]) = cursor.fetchone()
     
     # Dictionary coverage by language
     cursor.execute("SELECT language, COUNT(*) FROM dictionary_entries GROUP BY language")
     dict_by_lang = cursor.fetchall()
-    manifest["statistics"]["dictionary_by_language"] = {lang: count for lang, count in dict_by_lang}
+    statistics["dictionary_by_language"] = {lang: count for lang, count in dict_by_lang}
     
     # Calculate translation coverage
     cursor.execute("""
@@ -1922,8 +1745,25 @@ def generate_manifest(cursor):
         LEFT JOIN translation_segments ts ON b.id = ts.book_id
     """)
     total_works, works_with_trans = cursor.fetchone()
-    manifest["statistics"]["works_with_translations"] = works_with_trans
-    manifest["statistics"]["translation_coverage_percent"] = round((works_with_trans / total_works * 100) if total_works > 0 else 0, 1)
+    statistics["works_with_translations"] = works_with_trans
+    statistics["translation_coverage_percent"] = round((works_with_trans / total_works * 100) if total_works > 0 else 0, 1)
+    
+    return statistics
+
+def generate_manifest(cursor):
+    """Generate a manifest file with database contents
+    
+    Works and books are fetched in one grouped query each and assembled in
+    Python, instead of querying per author and per work.
+    """
+    from collections import defaultdict
+    
+    manifest = {
+        "generated_at": datetime.now().isoformat(),
+        "database_version": MANIFEST_DATABASE_VERSION,
+        "statistics": manifest_statistics(cursor),
+        "authors": []
+    }
     
     # Get author details with line counts
     cursor.execute("""
@@ -1937,8 +1777,53 @@ def generate_manifest(cursor):
         GROUP BY a.id
         ORDER BY a.language, a.name
     """)
+    author_rows = cursor.fetchall()
+    
+    # All books in one pass, grouped by work
+    cursor.execute("""
+        SELECT work_id, book_number, label, line_count
+        FROM books
+        ORDER BY work_id, book_number
+    """)
+    books_by_work = defaultdict(list)
+    for work_id, book_number, label, line_count in cursor.fetchall():
+        books_by_work[work_id].append({
+            "number": book_number,
+            "label": label,
+            "line_count": line_count
+        })
+    
+    # All works in one pass, grouped by author. Translators are counted in a
+    # subquery so the segment join cannot multiply the line sums.
+    cursor.execute("""
+        SELECT w.author_id, w.id, w.title, w.title_english,
+               COUNT(b.id) as book_count,
+               SUM(b.line_count) as total_lines,
+               COALESCE(t.translator_count, 0) as translator_count
+        FROM works w
+        LEFT JOIN books b ON w.id = b.work_id
+        LEFT JOIN (
+            SELECT tb.work_id, COUNT(DISTINCT ts.translator) as translator_count
+            FROM translation_segments ts
+            JOIN books tb ON ts.book_id = tb.id
+            GROUP BY tb.work_id
+        ) t ON t.work_id = w.id
+        GROUP BY w.id
+        ORDER BY w.author_id, w.id
+    """)
+    works_by_author = defaultdict(list)
+    for work_row in cursor.fetchall():
+        works_by_author[work_row[0]].append({
+            "id": work_row[1],
+            "title": work_row[2],
+            "title_english": work_row[3],
+            "book_count": work_row[4],
+            "total_lines": work_row[5] or 0,
+            "translator_count": work_row[6],
+            "books": books_by_work.get(work_row[1], [])
+        })
     
-    for author_row in cursor.fetchall():
+    for author_row in author_rows:
         author = {
             "id": author_row[0],
             "name": author_row[1],
@@ -1946,51 +1831,9 @@ def generate_manifest(cursor):
             "work_count": author_row[3],
             "total_books": author_row[4] or 0,
             "total_lines": author_row[5] or 0,
-            "works": []
+            "works": works_by_author.get(author_row[0], [])
         }
         
-        # Get works for this author
-        cursor.execute("""
-            SELECT w.id, w.title, w.title_english, 
-                   COUNT(DISTINCT b.id) as book_count,
-                   SUM(b.line_count) as total_lines,
-                   COUNT(DISTINCT ts.translator) as translator_count
-            FROM works w
-            LEFT JOIN books b ON w.id = b.work_id
-            LEFT JOIN translation_segments ts ON b.id = ts.book_id
-            WHERE w.author_id = ?
-            GROUP BY w.id
-            ORDER BY w.id
-        """, (author_row[0],))
-        
-        for work_row in cursor.fetchall():
-            work = {
-                "id": work_row[0],
-                "title": work_row[1],
-                "title_english": work_row[2],
-                "book_count": work_row[3],
-                "total_lines": work_row[4] or 0,
-                "translator_count": work_row[5]
-            }
-            
-            # Get book details
-            cursor.execute("""
-                SELECT book_number, label, line_count
-                FROM books
-                WHERE work_id = ?
-                ORDER BY book_number
-            """, (work_row[0],))
-            
-            work["books"] = []
-            for book_row in cursor.fetchall():
-                work["books"].append({
-                    "number": book_row[0],
-                    "label": book_row[1],
-                    "line_count": book_row[2]
-                })
-            
-            author["works"].append(work)
-        
         manifest["authors"].append(author)
     
     # Save manifest
@@ -2011,14 +1854,15 @@ def generate_quality_report(cursor):
     report_lines.append("")
     
     # Get statistics
-    cursor.execute("SELECT COUNT(*) FROM authors")
-    total_authors = cursor.fetchone()[0]
-    cursor.execute("SELECT COUNT(*) FROM works")
-    total_works = cursor.fetchone()[0]
-    cursor.execute("SELECT COUNT(*) FROM books")
-    total_books = cursor.fetchone()[0]
-    cursor.execute("SELECT COUNT(*) FROM text_lines")
-    total_lines = cursor.fetchone()[0]
+    cursor.execute("""
+        SELECT (SELECT COUNT(*) FROM authors),
+               (SELECT COUNT(*) FROM works),
+               (SELECT COUNT(*) FROM books),
+               (SELECT COUNT(*) FROM text_lines),
+               (SELECT COUNT(*) FROM dictionary_entries),
+               (SELECT COUNT(*) FROM lemma_map)
+    """)
+    total_authors, total_works, total_books, total_lines, total_dict, total_lemma = cursor.fetchone()
     
     report_lines.append(f"Total Authors: {total_authors}")
     report_lines.append(f"Total Works: {total_works}")
@@ -2026,11 +1870,6 @@ def generate_quality_report(cursor):
     report_lines.append(f"Total Lines: {total_lines:,}")
     
     # Dictionary statistics
-    cursor.execute("SELECT COUNT(*) FROM dictionary_entries")
-    total_dict = cursor.fetchone()[0]
-    cursor.execute("SELECT COUNT(*) FROM lemma_map")
-    total_lemma = cursor.fetchone()[0]
-    
     if total_dict > 0:
         report_lines.append(f"Dictionary Entries: {total_dict:,}")
         report_lines.append(f"Lemma Mappings: {total_lemma:,}")
@@ -2039,7 +1878,7 @@ def generate_quality_report(cursor):
     report_lines.append("=== DETAILED BREAKDOWN ===")
     report_lines.append("")
     
-    # Get all data with translations
+    # Get all books with their per-work totals in one pass
     cursor.execute("""
         SELECT 
             a.name as author_name,
@@ -2048,7 +1887,9 @@ def generate_quality_report(cursor):
             b.label as book_label,
             b.line_count,
             b.id as book_id,
-            w.id as work_id
+            w.id as work_id,
+            COUNT(*) OVER (PARTITION BY w.id) as work_book_count,
+            SUM(b.line_count) OVER (PARTITION BY w.id) as work_total_lines
         FROM authors a
         JOIN works w ON a.id = w.author_id
         JOIN books b ON w.id = b.work_id
@@ -2085,7 +1926,8 @@ def generate_quality_report(cursor):
     current_work = None
     
     for row in all_books:
-        author_name, work_title, book_num, book_label, line_count, book_id, work_id = row
+        (author_name, work_title, book_num, book_label, line_count, book_id, work_id,
+         book_count, total_work_lines) = row
         
         # Author header
         if author_name != current_author:
@@ -2099,16 +1941,11 @@ def generate_quality_report(cursor):
         if work_id != current_work:
             current_work = work_id
             # For single-book works
-            cursor.execute("SELECT COUNT(*) FROM books WHERE work_id = ?", (work_id,))
-            book_count = cursor.fetchone()[0]
-            
             if book_count == 1:
                 report_lines.append(f"{author_name} / {work_title} - {line_count or 0:,} lines")
             else:
                 # Multi-book work - show the work title first
-                cursor.execute("SELECT SUM(line_count) FROM books WHERE work_id = ?", (work_id,))
-                total_work_lines = cursor.fetchone()[0] or 0
-                report_lines.append(f"{author_name} / {work_title} - {total_work_lines:,} lines total")
+                report_lines.append(f"{author_name} / {work_title} - {total_work_lines or 0:,} lines total")
         
         # For multi-book works, show individual books
         if book_count > 1:
@@ -2175,10 +2012,12 @@ def extract_wiktionary_mappings():
     
     print("\n✓ Wiktionary extraction files ready")
 
+WIKTIONARY_DEFINITIONS_FILE = "wiktionary-processing/wiktionary_extraction_results/wiktionary_definitions_final.json"
+
 def load_wiktionary_definitions(cursor):
     """Load Wiktionary definitions as fallback for words not in LSJ"""
     
-    wiktionary_defs_path = Path("wiktionary-processing/wiktionary_extraction_results/wiktionary_definitions_final.json")
+    wiktionary_defs_path = Path(WIKTIONARY_DEFINITIONS_FILE)
     
     if not wiktionary_defs_path.exists():
         print("Warning: Wiktionary definitions file not found, skipping...")
@@ -2186,15 +2025,6 @@ def load_wiktionary_definitions(cursor):
     
     print("\n=== LOADING WIKTIONARY DEFINITIONS ===")
     
-    # First, get all existing LSJ headwords to avoid duplicates
-    cursor.execute("""
-        SELECT DISTINCT headword_normalized 
-        FROM dictionary_entries 
-        WHERE language = 'greek' AND source = 'LSJ'
-    """)
-    lsj_headwords = set(row[0] for row in cursor.fetchall())
-    print(f"Found {len(lsj_headwords):,} existing LSJ entries")
-    
     # Load Wiktionary definitions
     with open(wiktionary_defs_path, 'r', encoding='utf-8') as f:
         wiktionary_data = json.load(f)
@@ -2202,45 +2032,26 @@ def load_wiktionary_definitions(cursor):
     print(f"Found {len(wiktionary_data):,} Wiktionary definitions")
     
     # Import only definitions not already in LSJ
-    imported = 0
-    skipped = 0
-    
-    for normalized, entry in wiktionary_data.items():
-        if normalized in lsj_headwords:
-            skipped += 1
-            continue
-        
-        cursor.execute("""
-            INSERT OR IGNORE INTO dictionary_entries 
-            (headword, headword_normalized, language, entry_xml, entry_html, entry_plain, source)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            entry['headword'],
-            entry['headword_normalized'],
-            entry['language'],
-            entry.get('entry_xml'),
-            entry['entry_html'],
-            entry['entry_plain'],
-            'wiktionary'
-        ))
-        
-        if cursor.rowcount > 0:
-            imported += 1
+    counts = merge_dictionary_entries(cursor, wiktionary_data.values(), source=WIKTIONARY_SOURCE)
     
-    print(f"✓ Imported {imported:,} Wiktionary definitions (skipped {skipped:,} already in LSJ)")
+    print(f"✓ Imported {counts['added']:,} Wiktionary definitions "
+          f"(updated {counts['updated']:,}, skipped {counts['skipped']:,} already in LSJ)")
     print(f"  These will serve as fallback for words like πρῶτος that are missing from LSJ")
 
+# Wiktionary mapping files loaded into lemma_map, relative to data-prep
+WIKTIONARY_MAPPING_FILES = [
+    ("wiktionary-processing/ancient_greek_complete_morphology.json", "Enhanced Wiktionary (All Words + Lemmas)"),
+    ("wiktionary-processing/greek_inflection_of_mappings.json", "English Wiktionary (inflection_of)"),
+    ("wiktionary-processing/ancient_greek_all_forms.json", "English Wiktionary (all non-lemma forms)"),
+    ("wiktionary-processing/ancient_greek_all_morphology_correct.json", "Greek Wiktionary (All Forms)"),
+    ("wiktionary-processing/ancient_greek_declension_mappings.json", "Greek Wiktionary (Declensions)")
+]
+
 def load_wiktionary_mappings(cursor):
     """Load Ancient Greek morphological mappings from Wiktionary intermediate files"""
     
     # Look for all Wiktionary mapping files
-    mapping_files = [
-        ("wiktionary-processing/ancient_greek_complete_morphology.json", "Enhanced Wiktionary (All Words + Lemmas)"),
-        ("wiktionary-processing/greek_inflection_of_mappings.json", "English Wiktionary (inflection_of)"),
-        ("wiktionary-processing/ancient_greek_all_forms.json", "English Wiktionary (all non-lemma forms)"),
-        ("wiktionary-processing/ancient_greek_all_morphology_correct.json", "Greek Wiktionary (All Forms)"),
-        ("wiktionary-processing/ancient_greek_declension_mappings.json", "Greek Wiktionary (Declensions)")
-    ]
+    mapping_files = WIKTIONARY_MAPPING_FILES
     
     total_loaded = 0
     valid_lemmas = set()
@@ -2610,60 +2421,54 @@ def optimize_lemma_map(cursor):
     
     print("✓ Optimization complete!")
 
-def create_database(mode='full'):
-    """Create database from Perseus data
-    
-    Args:
-        mode: 'full' for all authors, 'sample' for limited set from SAMPLE_AUTHORS.md
-    """
+def load_sample_authors(script_dir):
+    """Lowercased author names from SAMPLE_AUTHORS.md, or None if the file is missing"""
+    sample_authors = set()
+    sample_authors_file = script_dir / "SAMPLE_AUTHORS.md"
+    if not sample_authors_file.exists():
+        print(f"Error: Sample authors file not found at {sample_authors_file}")
+        return None
     
-    # Paths
-    script_dir = Path(__file__).parent
-    db_filename = "perseus_texts_full.db" if mode == 'full' else "perseus_texts_sample.db"
-    db_path = script_dir / db_filename
-    data_sources = script_dir.parent / "data-sources"
+    with open(sample_authors_file, 'r') as f:
+        for line in f:
+            author = line.strip()
+            if author:
+                sample_authors.add(author.lower())
+    print(f"Loaded {len(sample_authors)} sample authors: {', '.join(sorted(sample_authors))}")
+    return sample_authors
+
+
+def filter_sample_authors(authors, sample_authors, language):
+    """Select the authors (id -> name) of one language listed in SAMPLE_AUTHORS.md"""
+    filtered_authors = {}
+    for author_id, author_name in authors.items():
+        author_lower = author_name.lower()
+        if language == 'greek':
+            # Check if author name matches any in sample list (case-insensitive)
+            selected = author_lower in sample_authors
+        else:
+            # Latin author names only need to contain a sample name
+            selected = any(sample in author_lower for sample in sample_authors)
+        if selected:
+            filtered_authors[author_id] = author_name
+            print(f"  Including sample author: {author_name} ({author_id})")
+    
+    # Special handling for New Testament which might not be discovered as a single author
+    if (language == 'greek' and 'new testament' in sample_authors and
+            not any('testament' in name.lower() for name in filtered_authors.values())):
+        # Look for New Testament works (might be under various IDs)
+        for author_id, author_name in authors.items():
+            if 'testament' in author_name.lower() or 'bible' in author_name.lower():
+                filtered_authors[author_id] = author_name
+                print(f"  Including New Testament author: {author_name} ({author_id})")
     
-    # Check paths
-    print("Checking data sources...")
-    greek_dir = data_sources / "canonical-greekLit" / "data"
-    latin_dir = data_sources / "canonical-latinLit" / "data"
-    
-    if not greek_dir.exists():
-        print(f"Error: Greek texts directory not found at {greek_dir}")
-        return
-    
-    if not latin_dir.exists():
-        print(f"Error: Latin texts directory not found at {latin_dir}")
-        return
-    
-    # Create new database
-    print(f"\nCreating new database at {db_path}...")
-    print(f"Mode: {mode.upper()}")
-    
-    # Remove existing database
-    if db_path.exists():
-        db_path.unlink()
-    
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # Load sample authors if in sample mode
-    sample_authors = set()
-    if mode == 'sample':
-        sample_authors_file = script_dir / "SAMPLE_AUTHORS.md"
-        if sample_authors_file.exists():
-            with open(sample_authors_file, 'r') as f:
-                for line in f:
-                    author = line.strip()
-                    if author:
-                        sample_authors.add(author.lower())
-            print(f"Loaded {len(sample_authors)} sample authors: {', '.join(sorted(sample_authors))}")
-        else:
-            print(f"Error: Sample authors file not found at {sample_authors_file}")
-            return
-    
-    # Create tables with Room-compatible schema
-    print("Creating tables...")
+    return filtered_authors
+
+
+def create_schema(cursor):
+    """Create the text tables with the Room-compatible schema"""
+    # Create tables with Room-compatible schema
+    print("Creating tables...")
     
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS authors (
@@ -2782,56 +2587,22 @@ def create_database(mode='full'):
     # word_forms table removed - not needed for app functionality
     
     # word_forms indexes removed - not needed
-    
-    # Process specific authors we want
-    print("\n=== PROCESSING GREEK AUTHORS ===")
-    
+
+
+def ingest_greek_authors(conn, cursor, greek_dir, mode, sample_authors, book_stats, translation_prepass, catalog,
+                         profiler):
+    """Discover and process the Greek authors (all, the sample set, or a test phase)"""
     # Discover all Greek authors dynamically
-    greek_authors = {}
     print("Discovering Greek authors...")
     
-    for author_dir in sorted(greek_dir.iterdir()):
-        if author_dir.is_dir() and author_dir.name.startswith("tlg"):
-            cts_file = author_dir / "__cts__.xml"
-            author_name = f"Author {author_dir.name}"
-            
-            if cts_file.exists():
-                try:
-                    tree = ET.parse(cts_file)
-                    root = tree.getroot()
-                    
-                    # Find groupname element
-                    ns = {'ti': 'http://chs.harvard.edu/xmlns/cts'}
-                    groupname_elem = root.find('.//ti:groupname', ns)
-                    
-                    if groupname_elem is not None and groupname_elem.text:
-                        author_name = groupname_elem.text.strip()
-                except Exception as e:
-                    print(f"  Warning: Failed to parse {cts_file}: {e}")
-            
-            greek_authors[author_dir.name] = author_name
+    # Names come from the CTS catalog, which only re-reads changed author directories
+    greek_authors = catalog.author_names(greek_dir, "tlg")
     
     print(f"\nDiscovered {len(greek_authors)} Greek authors")
     
     # Filter authors based on mode
     if mode == 'sample' and sample_authors:
-        # Filter to only include authors in the sample list
-        filtered_authors = {}
-        for author_id, author_name in greek_authors.items():
-            # Check if author name matches any in sample list (case-insensitive)
-            if author_name.lower() in sample_authors:
-                filtered_authors[author_id] = author_name
-                print(f"  Including sample author: {author_name} ({author_id})")
-        
-        # Special handling for New Testament which might not be discovered as a single author
-        if 'new testament' in sample_authors and not any('testament' in name.lower() for name in filtered_authors.values()):
-            # Look for New Testament works (might be under various IDs)
-            for author_id, author_name in greek_authors.items():
-                if 'testament' in author_name.lower() or 'bible' in author_name.lower():
-                    filtered_authors[author_id] = author_name
-                    print(f"  Including New Testament author: {author_name} ({author_id})")
-        
-        greek_authors = filtered_authors
+        greek_authors = filter_sample_authors(greek_authors, sample_authors, 'greek')
         print(f"\nFiltered to {len(greek_authors)} Greek authors for sample database")
     
     # Add phase control for testing (only if not in sample mode)
@@ -2868,7 +2639,8 @@ def create_database(mode='full'):
         if author_path.exists():
             print(f"\n[{processed}/{total_authors}] Processing {author_name} ({author_id})")
             try:
-                process_perseus_author(author_path, "greek", cursor)
+                with profiler.author(author_id, author_name, "greek"):
+                    process_perseus_author(author_path, "greek", cursor, book_stats, translation_prepass, catalog)
                 # Commit periodically
                 if processed % 5 == 0:
                     conn.commit()
@@ -2885,50 +2657,21 @@ def create_database(mode='full'):
         print(f"\n=== FAILED AUTHORS ({len(failed_authors)}) ===")
         for auth_id, name, error in failed_authors:
             print(f"  {name} ({auth_id}): {error}")
-    
-    print("\n=== PROCESSING LATIN AUTHORS ===")
-    
+
+
+def ingest_latin_authors(cursor, latin_dir, mode, sample_authors, book_stats, translation_prepass, catalog, profiler):
+    """Discover and process the Latin authors"""
     # Discover all Latin authors dynamically
-    latin_authors = {}
     print("Discovering Latin authors...")
     
-    for author_dir in sorted(latin_dir.iterdir()):
-        if author_dir.is_dir() and author_dir.name.startswith("phi"):
-            cts_file = author_dir / "__cts__.xml"
-            author_name = f"Author {author_dir.name}"
-            
-            if cts_file.exists():
-                try:
-                    tree = ET.parse(cts_file)
-                    root = tree.getroot()
-                    
-                    # Find groupname element
-                    ns = {'ti': 'http://chs.harvard.edu/xmlns/cts'}
-                    groupname_elem = root.find('.//ti:groupname', ns)
-                    
-                    if groupname_elem is not None and groupname_elem.text:
-                        author_name = groupname_elem.text.strip()
-                except Exception as e:
-                    print(f"  Warning: Failed to parse {cts_file}: {e}")
-            
-            latin_authors[author_dir.name] = author_name
+    # Names come from the CTS catalog, which only re-reads changed author directories
+    latin_authors = catalog.author_names(latin_dir, "phi")
     
     print(f"\nDiscovered {len(latin_authors)} Latin authors")
     
     # Filter authors based on mode
     if mode == 'sample' and sample_authors:
-        # Filter to only include authors in the sample list
-        filtered_authors = {}
-        for author_id, author_name in latin_authors.items():
-            # Check if author name matches any in sample list (case-insensitive)
-            author_lower = author_name.lower()
-            
-            # Check if author name matches any in sample list
-            if any(sample in author_lower for sample in sample_authors):
-                filtered_authors[author_id] = author_name
-                print(f"  Including sample author: {author_name} ({author_id})")
-        
-        latin_authors = filtered_authors
+        latin_authors = filter_sample_authors(latin_authors, sample_authors, 'latin')
         print(f"\nFiltered to {len(latin_authors)} Latin authors for sample database")
     
     # Process each Latin author
@@ -2936,14 +2679,14 @@ def create_database(mode='full'):
         author_path = latin_dir / author_id
         if author_path.exists():
             print(f"\nProcessing {author_name} ({author_id})")
-            process_perseus_author(author_path, "latin", cursor)
+            with profiler.author(author_id, author_name, "latin"):
+                process_perseus_author(author_path, "latin", cursor, book_stats, translation_prepass, catalog)
         else:
             print(f"\nWarning: {author_name} ({author_id}) not found")
-    
-    # Import LSJ dictionary
-    print("\n=== PROCESSING LSJ DICTIONARY ===")
-    lsj_path = data_sources / "canonical-pdlrefwk" / "data" / "viaf66541464" / "001" / "viaf66541464.001.perseus-eng1.xml"
-    
+
+
+def import_lsj_dictionary(cursor, lsj_path):
+    """Import LSJ entries, Wiktionary fallback definitions and LSJ lemma mappings"""
     if lsj_path.exists():
         
         # Create dictionary tables
@@ -2981,31 +2724,44 @@ def create_database(mode='full'):
         
         # idx_lemma_map_normalized removed - Room doesn't expect it
         
-        # Parse and import LSJ
-        parser = LSJParser()
-        lsj_entries = parser.parse_lsj_xml(str(lsj_path))
+        # Bulk-load the entries parsed by an earlier build if the LSJ file and parser are unchanged
+        lsj_cache = LSJCache(Path(__file__).parent / LSJ_CACHE_FILE)
+        lsj_hash = file_sha256(lsj_path)
+        parser_version = code_fingerprint([LSJParser])
         
-        if lsj_entries:
-            print(f"Importing {len(lsj_entries)} LSJ entries...")
-            
-            # Import dictionary entries
-            for entry in lsj_entries:
-                cursor.execute("""
-                    INSERT INTO dictionary_entries 
-                    (headword, headword_normalized, language, entry_xml, entry_html, entry_plain, source)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    entry['headword'],
-                    entry['headword_normalized'], 
-                    entry['language'],
-                    entry['entry_xml'],
-                    entry['entry_html'],
-                    entry['entry_plain'],
-                    entry['source']
-                ))
-            
-            print("✓ LSJ dictionary entries imported successfully")
+        if lsj_cache.is_current(lsj_hash, parser_version):
+            print(f"Loading parsed LSJ entries from {lsj_cache.cache_file}...")
+            copied = lsj_cache.copy_into(cursor.connection)
+            lsj_entries = lsj_cache.headwords()
+            print(f"✓ {copied} cached LSJ dictionary entries imported")
+        else:
+            # Parse and import LSJ
+            parser = LSJParser()
+            lsj_entries = parser.parse_lsj_xml(str(lsj_path))
             
+            if lsj_entries:
+                print(f"Importing {len(lsj_entries)} LSJ entries...")
+                
+                # Import dictionary entries
+                for entry in lsj_entries:
+                    cursor.execute("""
+                        INSERT INTO dictionary_entries 
+                        (headword, headword_normalized, language, entry_xml, entry_html, entry_plain, source)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """, (
+                        entry['headword'],
+                        entry['headword_normalized'], 
+                        entry['language'],
+                        entry['entry_xml'],
+                        entry['entry_html'],
+                        entry['entry_plain'],
+                        entry['source']
+                    ))
+                
+                print("✓ LSJ dictionary entries imported successfully")
+                lsj_cache.store(lsj_entries, lsj_hash, parser_version)
+        
+        if lsj_entries:
             # Import Wiktionary definitions as fallback for missing LSJ entries
             load_wiktionary_definitions(cursor)
             
@@ -3036,24 +2792,10 @@ def create_database(mode='full'):
             print("Warning: No LSJ entries found")
     else:
         print(f"Warning: LSJ file not found at {lsj_path}")
-    
-    # Extract Wiktionary mappings if needed
-    extract_wiktionary_mappings()
-    
-    # Load Wiktionary morphological mappings
-    load_wiktionary_mappings(cursor)
-    
-    # Generate comprehensive mappings for all words in texts
-    print("\n=== GENERATING COMPREHENSIVE LEMMATIZATION ===")
-    generate_comprehensive_lemmatization(cursor)
-    
-    # Optimize lemma map to only include words in texts
-    optimize_lemma_map(cursor)
-    
-    # Commit
-    conn.commit()
-    
-    # Show statistics
+
+
+def report_database_statistics(cursor):
+    """Print statistics and write the manifest and quality report"""
     print("\n=== DATABASE STATISTICS ===")
     
     cursor.execute("SELECT COUNT(*) FROM authors")
@@ -3141,8 +2883,10 @@ def create_database(mode='full'):
     coverage = (works_with_trans / total_works * 100) if total_works > 0 else 0
     print(f"\n=== TRANSLATION COVERAGE ===")
     print(f"Works with translations: {works_with_trans}/{total_works} ({coverage:.1f}%)")
-    
-    # Update has_translations flag for authors
+
+
+def update_has_translations_flag(conn, cursor):
+    """Set authors.has_translations for authors with real translation text"""
     print("\nUpdating has_translations flag for authors...")
     cursor.execute("""
         UPDATE authors
@@ -3168,21 +2912,167 @@ def create_database(mode='full'):
     """)
     total_authors, authors_with_trans = cursor.fetchone()
     print(f"Greek authors with translations: {authors_with_trans}/{total_authors}")
+
+
+def create_database(mode='full', profile_stage=None, use_stage_cache=True, range_lookup=False,
+                    clustered_text=False):
+    """Create database from Perseus data
+    
+    The build runs as named stages (see stage_cache.py). A stage whose inputs
+    and code are unchanged since the last build is replayed from the stage
+    cache instead of being run again.
+    
+    Args:
+        mode: 'full' for all authors, 'sample' for limited set from SAMPLE_AUTHORS.md
+        profile_stage: Optional stage name to run under cProfile
+        use_stage_cache: Replay unchanged stages from stage_cache/ and save new snapshots
+        range_lookup: Replace the per-line translation_lookup table with
+            translation_lookup_ranges and a compatibility view
+        clustered_text: Store text_lines and words as WITHOUT ROWID tables
+            clustered by book and line
+    """
+    
+    # Paths
+    script_dir = Path(__file__).parent
+    db_filename = "perseus_texts_full.db" if mode == 'full' else "perseus_texts_sample.db"
+    db_path = script_dir / db_filename
+    data_sources = script_dir.parent / "data-sources"
+    
+    # Check paths
+    print("Checking data sources...")
+    greek_dir = data_sources / "canonical-greekLit" / "data"
+    latin_dir = data_sources / "canonical-latinLit" / "data"
+    
+    if not greek_dir.exists():
+        print(f"Error: Greek texts directory not found at {greek_dir}")
+        return
+    
+    if not latin_dir.exists():
+        print(f"Error: Latin texts directory not found at {latin_dir}")
+        return
+    
+    # Create new database
+    print(f"\nCreating new database at {db_path}...")
+    print(f"Mode: {mode.upper()}")
+    
+    # Remove existing database
+    if db_path.exists():
+        db_path.unlink()
+    
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
+    profiler = BuildProfiler(conn, mode, profile_stage)
+    stages = StageCache(conn, script_dir / STAGE_CACHE_DIR, mode, profiler, enabled=use_stage_cache)
+    # Line counts and line numbers of every book, filled while lines are inserted
+    book_stats = BookLineStats()
+    stages.on_restore(lambda: book_stats.reload(cursor))
+    # Translator and strategy of each translation file, cached across builds
+    translation_prepass = TranslationPrepassCache(script_dir / "translation_prepass_cache.json")
+    # Author and work metadata and file lists, refreshed only for changed directories
+    catalog = CTSCatalog(script_dir / "cts_catalog_cache.json")
+    
+    # Load sample authors if in sample mode
+    sample_authors = set()
+    if mode == 'sample':
+        sample_authors = load_sample_authors(script_dir)
+        if sample_authors is None:
+            return
+    
+    if stages.run('create_schema', code=[create_schema], cached=False):
+        create_schema(cursor)
+    
+    # Process specific authors we want
+    # The selected authors depend on the mode, SAMPLE_AUTHORS.md and the test phase argument
+    author_params = (sorted(sample_authors), sys.argv[2:3] if mode != 'sample' else [])
+    if stages.run('greek_authors', inputs=[greek_dir], params=author_params,
+                  code=[ingest_greek_authors, CTSCatalog, TranslationPrepassCache,
+                        scan_translation_file, find_translator, BookLineStats]):
+        print("\n=== PROCESSING GREEK AUTHORS ===")
+        ingest_greek_authors(conn, cursor, greek_dir, mode, sample_authors, book_stats, translation_prepass, catalog,
+                             profiler)
+    
+    if stages.run('latin_authors', inputs=[latin_dir], params=author_params,
+                  code=[ingest_latin_authors, CTSCatalog, TranslationPrepassCache,
+                        scan_translation_file, find_translator, BookLineStats]):
+        print("\n=== PROCESSING LATIN AUTHORS ===")
+        ingest_latin_authors(cursor, latin_dir, mode, sample_authors, book_stats, translation_prepass, catalog, profiler)
+    
+    translation_prepass.save()
+    print(f"Translation prepass: {translation_prepass.hits} cached, {translation_prepass.misses} scanned")
+    catalog.save()
+    print(f"CTS catalog: {catalog.hits} cached, {catalog.misses} scanned")
+    
+    # Import LSJ dictionary
+    lsj_path = data_sources / "canonical-pdlrefwk" / "data" / "viaf66541464" / "001" / "viaf66541464.001.perseus-eng1.xml"
+    if stages.run('lsj_dictionary', inputs=[lsj_path, script_dir / WIKTIONARY_DEFINITIONS_FILE],
+                  code=[import_lsj_dictionary]):
+        print("\n=== PROCESSING LSJ DICTIONARY ===")
+        import_lsj_dictionary(cursor, lsj_path)
+    
+    # Extract Wiktionary mappings if needed (their files are the next stage's inputs)
+    extract_wiktionary_mappings()
+    
+    # Load Wiktionary morphological mappings
+    if stages.run('wiktionary_mappings',
+                  inputs=[script_dir / relative_path for relative_path, _ in WIKTIONARY_MAPPING_FILES],
+                  code=[load_wiktionary_mappings]):
+        load_wiktionary_mappings(cursor)
+    
+    # Generate comprehensive mappings for all words in texts
+    if stages.run('comprehensive_lemmatization', code=[generate_comprehensive_lemmatization]):
+        print("\n=== GENERATING COMPREHENSIVE LEMMATIZATION ===")
+        generate_comprehensive_lemmatization(cursor)
+    
+    # Optimize lemma map to only include words in texts
+    if stages.run('optimize_lemma_map', code=[optimize_lemma_map], cached=False):
+        optimize_lemma_map(cursor)
+    
+    # Commit
+    conn.commit()
+    
+    # Show statistics (always run: the manifest and quality report are written to files)
+    if stages.run('statistics_and_reports', code=[report_database_statistics], cached=False):
+        report_database_statistics(cursor)
+    
+    # Update has_translations flag for authors
+    if stages.run('has_translations_flag', code=[update_has_translations_flag], cached=False):
+        update_has_translations_flag(conn, cursor)
     
     # Create translation lookup table for better alignment
-    print("\n=== CREATING TRANSLATION LOOKUP TABLE ===")
-    try:
-        create_translation_lookup_table(conn)
-    except Exception as e:
-        print(f"Warning during translation lookup table creation: {e}")
-        print("Continuing...")
+    if stages.run('translation_lookup', code=[create_translation_lookup_table, BookLineStats],
+                  cached=False):
+        print("\n=== CREATING TRANSLATION LOOKUP TABLE ===")
+        try:
+            create_translation_lookup_table(conn, book_stats)
+        except Exception as e:
+            print(f"Warning during translation lookup table creation: {e}")
+            print("Continuing...")
+    
+    if range_lookup and stages.run('translation_lookup_ranges', code=[create_translation_lookup_ranges],
+                                   cached=False):
+        print("\n=== RANGE-ENCODING TRANSLATION LOOKUP ===")
+        create_translation_lookup_ranges(conn, replace_lookup_table=True)
     
+    if clustered_text and stages.run('clustered_text_tables', code=[cluster_text_tables],
+                                     cached=False):
+        print("\n=== CLUSTERING TEXT TABLES ===")
+        cluster_text_tables(conn)
+    
+    stages.finish()
+    profiler.write_report()
     conn.close()
     print("\n✓ Database created successfully!")
+    
+    write_bootstrap_database(db_path)
 
 
-def create_translation_lookup_table(conn):
-    """Create a normalized lookup table for translation alignment"""
+def create_translation_lookup_table(conn, book_stats):
+    """Create a normalized lookup table for translation alignment
+    
+    Line counts, ranges and line numbers come from book_stats, recorded while
+    text_lines was filled, rather than from queries on text_lines.
+    """
     cursor = conn.cursor()
     
     # Drop and recreate the lookup table
@@ -3202,20 +3092,16 @@ def create_translation_lookup_table(conn):
     cursor.execute("CREATE INDEX index_translation_lookup_book_id_line_number ON translation_lookup(book_id, line_number)")
     cursor.execute("CREATE INDEX index_translation_lookup_segment_id ON translation_lookup(segment_id)")
     
-    # Get all books with translations
-    cursor.execute("""
-        SELECT DISTINCT b.id, COUNT(DISTINCT tl.line_number), 
-               MIN(tl.line_number), MAX(tl.line_number)
-        FROM books b
-        JOIN text_lines tl ON b.id = tl.book_id
-        WHERE EXISTS (SELECT 1 FROM translation_segments ts WHERE ts.book_id = b.id)
-        GROUP BY b.id
-    """)
-    
-    books = cursor.fetchall()
+    # Get all books with text lines and translations
+    translated_books = set(row[0] for row in cursor.execute("SELECT DISTINCT book_id FROM translation_segments"))
+    books = [book_id for book_id in book_stats.books() if book_id in translated_books]
     total_mappings = 0
     
-    for book_id, line_count, min_line, max_line in books:
+    for book_id in books:
+        valid_lines = book_stats.line_numbers(book_id)
+        line_count = len(valid_lines)
+        min_line, max_line = book_stats.line_range(book_id)
+        
         # Get translation segments
         cursor.execute("""
             SELECT id, start_line, end_line
@@ -3227,14 +3113,6 @@ def create_translation_lookup_table(conn):
         segments = cursor.fetchall()
         if not segments:
             continue
-            
-        # Get actual line numbers from text_lines
-        cursor.execute("""
-            SELECT DISTINCT line_number 
-            FROM text_lines 
-            WHERE book_id = ?
-        """, (book_id,))
-        valid_lines = set(row[0] for row in cursor.fetchall())
         
         # Detect if translation uses different numbering
         max_trans_line = max(seg[2] for seg in segments) if segments else 0
@@ -3269,12 +3147,13 @@ def create_translation_lookup_table(conn):
                         book_mappings += 1
         
         # For lines without direct mappings, find nearest segment
-        unmapped_lines = valid_lines - set(
+        mapped_lines = set(
             row[0] for row in cursor.execute(
                 "SELECT DISTINCT line_number FROM translation_lookup WHERE book_id = ?", 
                 (book_id,)
             )
         )
+        unmapped_lines = [line_num for line_num in valid_lines if line_num not in mapped_lines]
         
         if unmapped_lines and segments:
             for line_num in unmapped_lines:
@@ -3306,86 +3185,416 @@ def create_translation_lookup_table(conn):
     print(f"\nTotal translation mappings: {total_mappings}")
 
 
+def create_translation_lookup_ranges(conn, replace_lookup_table=False):
+    """Range-encode translation_lookup as (book, start_line, end_line, segment) intervals
+
+    A range covers a run of the segment's lines that are consecutive both in
+    text_lines and in the book's line numbers, so a segment spread over 500
+    lines is one row instead of 500.
+    The segments for a line range are found with
+
+        WHERE book_id = ? AND start_line <= :endLine AND end_line >= :startLine
+
+    Each range also keeps the text_lines ids of its first and last line. With
+    replace_lookup_table the per-line table is dropped and translation_lookup
+    becomes a view that expands the ranges over those ids, with the same
+    columns and rows, so the current Room queries keep working (the entity
+    must then be mapped as a view).
+    """
+    cursor = conn.cursor()
+    cursor.execute("DROP TABLE IF EXISTS translation_lookup_ranges")
+    cursor.execute("""
+        CREATE TABLE translation_lookup_ranges (
+            book_id TEXT NOT NULL,
+            start_line INTEGER NOT NULL,
+            end_line INTEGER NOT NULL,
+            segment_id INTEGER NOT NULL,
+            first_line_id INTEGER NOT NULL,
+            last_line_id INTEGER NOT NULL,
+            PRIMARY KEY (book_id, start_line, segment_id),
+            FOREIGN KEY (book_id) REFERENCES books(id) ON DELETE CASCADE,
+            FOREIGN KEY (segment_id) REFERENCES translation_segments(id) ON DELETE CASCADE
+        )
+    """)
+    
+    ranges = []
+    cursor.execute("SELECT DISTINCT book_id FROM translation_lookup ORDER BY book_id")
+    for (book_id,) in cursor.fetchall():
+        cursor.execute("""
+            SELECT line_number, MIN(id) FROM text_lines
+            WHERE book_id = ?
+            GROUP BY line_number
+        """, (book_id,))
+        line_ids = dict(cursor.fetchall())
+        # The next line number of the book after each line number
+        numbers = sorted(line_ids)
+        next_line = dict(zip(numbers, numbers[1:]))
+        
+        cursor.execute("""
+            SELECT segment_id, line_number FROM translation_lookup
+            WHERE book_id = ?
+        """, (book_id,))
+        rows = sorted((seg_id, line_ids[line_num], line_num) for seg_id, line_num in cursor.fetchall())
+        
+        # A run continues while the text_lines ids are consecutive and the line
+        # number is the book's next one, so [start_line, end_line] holds no
+        # lines of other runs even where line numbers do not rise with the ids
+        run = None
+        for seg_id, line_id, line_num in rows:
+            if run and run[3] == seg_id and run[5] + 1 == line_id and next_line.get(run[2]) == line_num:
+                run[2], run[5] = line_num, line_id
+                continue
+            if run:
+                ranges.append(tuple(run))
+            run = [book_id, line_num, line_num, seg_id, line_id, line_id]
+        if run:
+            ranges.append(tuple(run))
+    
+    cursor.executemany("INSERT INTO translation_lookup_ranges VALUES (?, ?, ?, ?, ?, ?)", ranges)
+    cursor.execute("CREATE INDEX idx_translation_lookup_ranges_lines ON translation_lookup_ranges(book_id, start_line, end_line)")
+    cursor.execute("CREATE INDEX idx_translation_lookup_ranges_segment ON translation_lookup_ranges(segment_id)")
+    
+    cursor.execute("SELECT COUNT(*) FROM translation_lookup")
+    line_rows = cursor.fetchone()[0]
+    print(f"✓ {len(ranges):,} translation lookup ranges for {line_rows:,} line mappings")
+    
+    if replace_lookup_table:
+        cursor.execute("DROP TABLE translation_lookup")
+        cursor.execute("""
+            CREATE VIEW translation_lookup AS
+            SELECT r.book_id AS book_id, t.line_number AS line_number, r.segment_id AS segment_id
+            FROM translation_lookup_ranges r
+            JOIN text_lines t ON t.id BETWEEN r.first_line_id AND r.last_line_id
+        """)
+        print("  translation_lookup is now a view over translation_lookup_ranges")
+    
+    conn.commit()
+
+
+# Tables rebuilt by cluster_text_tables: clustering key and the indexes it makes redundant
+CLUSTERED_TABLES = {
+    'text_lines': (('book_id', 'line_number'), ('idx_text_lines_book',)),
+    'words': (('book_id', 'line_number', 'word_position'), ('idx_words_book_line',)),
+}
+
+
+def cluster_text_tables(conn):
+    """Rebuild text_lines and words as WITHOUT ROWID tables keyed by book and position
+
+    A book's lines (and their words) are then stored contiguously in the primary
+    key b-tree, so reading a range of lines is one b-tree range scan instead of an
+    index scan plus a table lookup per row, and the (book_id, ...) indexes that
+    duplicate the key are dropped. The id column is kept as a plain column; if a
+    key is not unique, id is appended to it.
+
+    The Room entities must be changed to the new primary keys before an app can
+    open a database built this way.
+    """
+    cursor = conn.cursor()
+
+    # Views are recreated after the tables they read were replaced
+    cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'view'")
+    views = cursor.fetchall()
+    for name, _ in views:
+        cursor.execute(f"DROP VIEW {name}")
+
+    for table, (key, redundant_indexes) in CLUSTERED_TABLES.items():
+        cursor.execute(f"SELECT 1 FROM {table} GROUP BY {', '.join(key)} HAVING COUNT(*) > 1 LIMIT 1")
+        if cursor.fetchone():
+            print(f"⚠️  {table}: ({', '.join(key)}) is not unique, adding id to the key")
+            key = key + ('id',)
+
+        cursor.execute(f"PRAGMA table_info({table})")
+        columns = [(name, col_type, notnull) for _, name, col_type, notnull, _, _ in cursor.fetchall()]
+        column_defs = [f"{name} {col_type}{' NOT NULL' if notnull else ''}" for name, col_type, notnull in columns]
+        column_names = ', '.join(name for name, _, _ in columns)
+
+        cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                       (table,))
+        indexes = [(name, sql) for name, sql in cursor.fetchall() if name not in redundant_indexes]
+
+        cursor.execute(f"""
+            CREATE TABLE {table}_clustered (
+                {', '.join(column_defs)},
+                PRIMARY KEY ({', '.join(key)}),
+                FOREIGN KEY (book_id) REFERENCES books(id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(f"""
+            INSERT INTO {table}_clustered ({column_names})
+            SELECT {column_names} FROM {table} ORDER BY {', '.join(key)}
+        """)
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(f"ALTER TABLE {table}_clustered RENAME TO {table}")
+        for _, sql in indexes:
+            cursor.execute(sql)
+        print(f"✓ {table}: clustered on ({', '.join(key)}), dropped {', '.join(redundant_indexes)}")
+
+    for name, sql in views:
+        cursor.execute(sql)
+    if any(name == 'translation_lookup' for name, _ in views):
+        # The range-encoded lookup view expands ranges of text_lines ids
+        cursor.execute("CREATE INDEX idx_text_lines_id ON text_lines(id)")
+
+    conn.commit()
+    # Reclaim the pages of the replaced tables
+    cursor.execute("VACUUM")
+
+
+# Rows of each table that belong in the sample database (tables not listed are copied whole)
+SAMPLE_TABLE_FILTERS = {
+    'authors': "id IN (SELECT id FROM temp.sample_author_ids)",
+    'works': "author_id IN (SELECT id FROM main.authors)",
+    'books': "work_id IN (SELECT id FROM main.works)",
+    'text_lines': "book_id IN (SELECT id FROM main.books)",
+    'words': "book_id IN (SELECT id FROM main.books)",
+    'translation_segments': "book_id IN (SELECT id FROM main.books)",
+    'translation_lookup': "book_id IN (SELECT id FROM main.books)",
+    'translation_lookup_ranges': "book_id IN (SELECT id FROM main.books)",
+    # Algorithmic mappings are generated per corpus word; the rest come from LSJ and Wiktionary
+    'lemma_map': "source IS NOT 'algorithmic' OR word_form IN (SELECT word_normalized FROM main.words)",
+}
+
+
+def derive_sample_database(full_db_path, sample_db_path, sample_authors):
+    """Create the sample database by copying the sample authors' rows out of the full database
+    
+    The schema is copied from the full database, then every table is filled with
+    INSERT ... SELECT from the attached full database (see SAMPLE_TABLE_FILTERS).
+    Row ids are kept, so translation_lookup still points at the right segments.
+    """
+    print("\n=== DERIVING SAMPLE DATABASE ===")
+    print(f"Source: {full_db_path}")
+    
+    if not full_db_path.exists():
+        print(f"✗ Full database not found at {full_db_path}")
+        return False
+    
+    if sample_db_path.exists():
+        sample_db_path.unlink()
+    
+    conn = sqlite3.connect(sample_db_path)
+    cursor = conn.cursor()
+    cursor.execute("ATTACH DATABASE ? AS full", (str(full_db_path),))
+    
+    # Same selection rules as a sample build, applied to the authors of the full database
+    authors = {}
+    for author_id, name, language in cursor.execute("SELECT id, name, language FROM full.authors"):
+        authors.setdefault(language, {})[author_id] = name
+    sample_author_ids = []
+    for language in ('greek', 'latin'):
+        sample_author_ids.extend(filter_sample_authors(authors.get(language, {}), sample_authors, language))
+    
+    cursor.execute("CREATE TEMP TABLE sample_author_ids (id TEXT PRIMARY KEY)")
+    cursor.executemany("INSERT INTO temp.sample_author_ids VALUES (?)", [(a,) for a in sample_author_ids])
+    
+    # Tables first, indexes after the data is in
+    cursor.execute("""
+        SELECT type, name, sql FROM full.sqlite_master
+        WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%'
+        ORDER BY CASE type WHEN 'table' THEN 0 WHEN 'index' THEN 1 ELSE 2 END, rowid
+    """)
+    schema = cursor.fetchall()
+    
+    tables = [name for obj_type, name, _ in schema if obj_type == 'table']
+    for obj_type, name, sql in schema:
+        if obj_type == 'table':
+            cursor.execute(sql)
+    
+    # Filtered tables in SAMPLE_TABLE_FILTERS order, their filters read the tables before them
+    filter_order = list(SAMPLE_TABLE_FILTERS)
+    tables.sort(key=lambda name: filter_order.index(name) if name in filter_order else len(filter_order))
+    for name in tables:
+        where = SAMPLE_TABLE_FILTERS.get(name)
+        cursor.execute(f"INSERT INTO main.{name} SELECT * FROM full.{name}" + (f" WHERE {where}" if where else ""))
+        cursor.execute(f"SELECT (SELECT COUNT(*) FROM main.{name}), (SELECT COUNT(*) FROM full.{name})")
+        copied, total = cursor.fetchone()
+        print(f"  {name:<24} {copied:>10,} of {total:>10,} rows")
+    
+    for obj_type, name, sql in schema:
+        if obj_type != 'table':
+            cursor.execute(sql)
+    
+    conn.commit()
+    cursor.execute("DETACH DATABASE full")
+    conn.close()
+    
+    print(f"✓ Sample database derived: {len(sample_author_ids)} authors")
+    return True
+
+
+# Tables of the bootstrap catalog, copied with their Room schema and indexes
+BOOTSTRAP_TABLES = ('authors', 'works', 'books')
+
+
+def bootstrap_database_path(db_path):
+    """perseus_texts_full.db -> perseus_texts_full_bootstrap.db"""
+    db_path = Path(db_path)
+    return db_path.with_name(f"{db_path.stem}_bootstrap{db_path.suffix}")
+
+
+def write_bootstrap_database(db_path, bootstrap_path=None):
+    """Write the small catalog database the app can open before the main database is extracted
+
+    It holds authors, works and books exactly as in db_path (same schema and
+    indexes), and a manifest table (key, JSON value) with the manifest
+    statistics of db_path and a SHA-256 of the catalog rows. The row counts let
+    the app check that the main database it extracted belongs to the catalog.
+    """
+    db_path = Path(db_path)
+    bootstrap_path = Path(bootstrap_path or bootstrap_database_path(db_path))
+    print(f"\n=== WRITING BOOTSTRAP CATALOG {bootstrap_path.name} ===")
+
+    tmp_path = bootstrap_path.with_suffix('.tmp')
+    if tmp_path.exists():
+        tmp_path.unlink()
+    conn = sqlite3.connect(tmp_path)
+    cursor = conn.cursor()
+    cursor.execute("ATTACH DATABASE ? AS main_db", (str(db_path),))
+
+    placeholders = ', '.join('?' * len(BOOTSTRAP_TABLES))
+    cursor.execute(f"""
+        SELECT type, sql FROM main_db.sqlite_master
+        WHERE tbl_name IN ({placeholders}) AND sql IS NOT NULL
+        ORDER BY CASE type WHEN 'table' THEN 0 ELSE 1 END, rowid
+    """, BOOTSTRAP_TABLES)
+    schema = cursor.fetchall()
+
+    for obj_type, sql in schema:
+        if obj_type == 'table':
+            cursor.execute(sql)
+    checksum = hashlib.sha256()
+    for table in BOOTSTRAP_TABLES:
+        cursor.execute(f"INSERT INTO main.{table} SELECT * FROM main_db.{table} ORDER BY id")
+        for row in cursor.execute(f"SELECT * FROM main.{table} ORDER BY id"):
+            checksum.update(repr(row).encode('utf-8'))
+    for obj_type, sql in schema:
+        if obj_type != 'table':
+            cursor.execute(sql)
+
+    cursor.execute("""
+        CREATE TABLE manifest (
+            key TEXT PRIMARY KEY NOT NULL,
+            value TEXT NOT NULL
+        )
+    """)
+    manifest = {
+        "generated_at": datetime.now().isoformat(),
+        "database_version": MANIFEST_DATABASE_VERSION,
+        "source_database": db_path.name,
+        "catalog_sha256": checksum.hexdigest(),
+    }
+    source = sqlite3.connect(db_path)
+    manifest.update(manifest_statistics(source.cursor()))
+    source.close()
+    cursor.executemany("INSERT INTO manifest VALUES (?, ?)",
+                       [(key, json.dumps(value, ensure_ascii=False)) for key, value in manifest.items()])
+
+    conn.commit()
+    cursor.execute("DETACH DATABASE main_db")
+    conn.close()
+    tmp_path.replace(bootstrap_path)
+
+    print(f"✓ Bootstrap catalog: {manifest['total_authors']} authors, {manifest['total_works']} works, "
+          f"{manifest['total_books']} books ({bootstrap_path.stat().st_size / 1024:.0f}KB)")
+    return bootstrap_path
+
+
 def compress_and_copy_database(db_filename, is_sample=False):
     """Compress database and copy to asset pack location
     
+    The database is compressed once, on all cores (see parallel_zip.py), and
+    the archive is then hard-linked (or copied) to the other destinations.
+    
     Args:
         db_filename: Name of the database file to compress
         is_sample: If True, this is the sample database that goes to asset pack
     """
     import shutil
     import os
-    import zipfile
-    
-    # For debug builds
-    debug_asset_dir = "../app/src/debug/assets"
-    os.makedirs(debug_asset_dir, exist_ok=True)
-    
-    # For release builds
-    main_asset_dir = "../app/src/main/assets"
-    os.makedirs(main_asset_dir, exist_ok=True)
-    
-    if os.path.exists(db_filename):
-        # For sample database, copy to the standard location expected by the app
-        if is_sample:
-            # Create compressed version with the standard name expected by app
-            # Copy to both debug and main assets
-            for asset_dir in [debug_asset_dir, main_asset_dir]:
-                zip_path = os.path.join(asset_dir, "perseus_texts.db.zip")
-                print(f"\nCompressing sample database to {zip_path}...")
-                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
-                    # Archive name inside zip must be perseus_texts.db for app compatibility
-                    zf.write(db_filename, "perseus_texts.db")
-                
-                # Get file sizes
-                original_size = os.path.getsize(db_filename) / (1024 * 1024)
-                compressed_size = os.path.getsize(zip_path) / (1024 * 1024)
-                
-                print(f"Database compressed: {zip_path}")
-                print(f"Original size: {original_size:.1f}MB")
-                print(f"Compressed size: {compressed_size:.1f}MB ({compressed_size/original_size*100:.1f}%)")
-        else:
-            # For full database, keep it in data-prep with its full name
-            zip_path = f"{db_filename}.zip"
-            print(f"\nCompressing full database to {zip_path}...")
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
-                zf.write(db_filename, db_filename)
-            
-            # Get file sizes
-            original_size = os.path.getsize(db_filename) / (1024 * 1024)
-            compressed_size = os.path.getsize(zip_path) / (1024 * 1024)
-            
-            print(f"Database compressed: {zip_path}")
-            print(f"Original size: {original_size:.1f}MB")
-            print(f"Compressed size: {compressed_size:.1f}MB ({compressed_size/original_size*100:.1f}%)")
-        
-        return True
-    else:
+    
+    if not os.path.exists(db_filename):
         print(f"\nWarning: Database file {db_filename} not found")
         return False
+    
+    if is_sample:
+        # Debug and release builds get the same archive with the standard name expected by the app
+        destinations = [os.path.join(asset_dir, "perseus_texts.db.zip")
+                        for asset_dir in ("../app/src/debug/assets", "../app/src/main/assets")]
+        # Archive name inside zip must be perseus_texts.db for app compatibility
+        arcname = "perseus_texts.db"
+    else:
+        # For full database, keep it in data-prep with its full name
+        destinations = [f"{db_filename}.zip"]
+        arcname = db_filename
+    
+    for destination in destinations:
+        os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+    
+    zip_path = destinations[0]
+    print(f"\nCompressing {'sample' if is_sample else 'full'} database to {zip_path}...")
+    stats = write_parallel_zip(db_filename, zip_path, arcname)
+    print_zip_stats(zip_path, stats)
+    
+    for destination in destinations[1:]:
+        if os.path.exists(destination):
+            os.remove(destination)
+        try:
+            os.link(zip_path, destination)
+            print(f"Linked to {destination}")
+        except OSError:
+            shutil.copy2(zip_path, destination)
+            print(f"Copied to {destination}")
+    
+    return True
 
 
 if __name__ == "__main__":
     import time
     import sys
     
+    # Optional cProfile for a single stage, e.g. --profile-stage greek_authors
+    profile_stage = None
+    if "--profile-stage" in sys.argv:
+        flag_index = sys.argv.index("--profile-stage")
+        profile_stage = sys.argv[flag_index + 1] if flag_index + 1 < len(sys.argv) else None
+        del sys.argv[flag_index:flag_index + 2]
+    
+    # --no-stage-cache rebuilds every stage and leaves stage_cache/ untouched
+    use_stage_cache = "--no-stage-cache" not in sys.argv
+    if not use_stage_cache:
+        sys.argv.remove("--no-stage-cache")
+    
+    # --range-lookup stores translation_lookup as line ranges behind a view
+    range_lookup = "--range-lookup" in sys.argv
+    if range_lookup:
+        sys.argv.remove("--range-lookup")
+    
+    # --clustered-text stores text_lines and words WITHOUT ROWID, keyed by book and line
+    clustered_text = "--clustered-text" in sys.argv
+    if clustered_text:
+        sys.argv.remove("--clustered-text")
+    
     # Determine which databases to build
     build_mode = sys.argv[1] if len(sys.argv) > 1 else "both"
     
-    if build_mode not in ["sample", "full", "both"]:
+    if build_mode not in ["sample", "full", "both", "subset"]:
         print(f"Invalid build mode: {build_mode}")
-        print("Usage: python create_perseus_database.py [sample|full|both]")
+        print("Usage: python create_perseus_database.py [sample|full|both|subset] [phase] [--profile-stage STAGE] [--no-stage-cache] [--range-lookup] [--clustered-text]")
+        print("  both:   build the full database, then derive the sample database from it")
+        print("  subset: derive the sample database from an existing full database")
         sys.exit(1)
     
     overall_start = time.time()
     
-    # Build sample database
-    if build_mode in ["sample", "both"]:
+    # Build sample database from scratch
+    if build_mode == "sample":
         print("\n" + "="*60)
         print("BUILDING SAMPLE DATABASE")
         print("="*60)
         start_time = time.time()
-        create_database(mode='sample')
+        create_database(mode='sample', profile_stage=profile_stage, use_stage_cache=use_stage_cache,
+                        range_lookup=range_lookup, clustered_text=clustered_text)
         print(f"\nSample database build time: {(time.time() - start_time)/60:.1f} minutes")
         
         # Compress and copy sample database to asset pack
@@ -3397,10 +3606,27 @@ if __name__ == "__main__":
         print("BUILDING FULL DATABASE")
         print("="*60)
         start_time = time.time()
-        create_database(mode='full')
+        create_database(mode='full', profile_stage=profile_stage, use_stage_cache=use_stage_cache,
+                        range_lookup=range_lookup, clustered_text=clustered_text)
         print(f"\nFull database build time: {(time.time() - start_time)/60:.1f} minutes")
         
         # Compress full database (keep in data-prep directory)
         compress_and_copy_database("perseus_texts_full.db", is_sample=False)
     
+    # Derive sample database from the full one
+    if build_mode in ["both", "subset"]:
+        print("\n" + "="*60)
+        print("DERIVING SAMPLE DATABASE")
+        print("="*60)
+        start_time = time.time()
+        script_dir = Path(__file__).parent
+        sample_authors = load_sample_authors(script_dir)
+        if sample_authors is not None and derive_sample_database(
+                script_dir / "perseus_texts_full.db", script_dir / "perseus_texts_sample.db", sample_authors):
+            print(f"\nSample database derive time: {(time.time() - start_time)/60:.1f} minutes")
+            write_bootstrap_database(script_dir / "perseus_texts_sample.db")
+            
+            # Compress and copy sample database to asset pack
+            compress_and_copy_database("perseus_texts_sample.db", is_sample=True)
+    
     print(f"\nTotal build time: {(time.time() - overall_start)/60:.1f} minutes")
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Persistent catalog of the CTS metadata and files of the text corpora.
+
+Discovery used to parse every author's __cts__.xml, and process_perseus_author
+parsed it again along with each work's __cts__.xml and globbed the work
+directories for text and translation files. The catalog keeps the parsed
+author and work metadata and the text and translation file names in
+cts_catalog_cache.json. An entry is refreshed only when the modification time
+of its directory (files added, removed or renamed) or of its __cts__.xml
+changed, so a build over an unchanged corpus only stats the directories.
+The catalog also stores a fingerprint of the parsing code and is dropped
+when the code changes.
+
+Usage:
+    python cts_catalog.py [data-sources dir]
+
+refreshes the catalog, prints a summary per corpus and rewrites
+greek_authors_catalog.json (name, works and translations of every Greek author).
+"""
+
+import json
+import sys
+import xml_backend as ET
+from pathlib import Path
+
+from stage_cache import code_fingerprint
+
+DEFAULT_CACHE_FILE = 'cts_catalog_cache.json'
+
+XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+
+# Corpus directory and author directory prefix per language
+CORPORA = {
+    'greek': ('canonical-greekLit', 'tlg'),
+    'latin': ('canonical-latinLit', 'phi'),
+}
+
+
+def parse_cts_metadata(cts_path):
+    """Parse CTS metadata file to get work information"""
+    try:
+        tree = ET.parse(cts_path)
+        root = tree.getroot()
+
+        # Handle different namespace possibilities
+        work_info = {}
+        translation_title = None
+        work_urn = None
+
+        for elem in root.iter():
+            tag = elem.tag.lower()
+            # Extract title from title elements
+            if 'title' in tag:
+                lang = elem.get(XML_LANG, elem.get('lang', 'unk'))
+                if lang == 'eng':
+                    work_info['title_english'] = elem.text
+                elif lang == 'lat':
+                    work_info['title_latin'] = elem.text
+                elif lang in ['grc', 'greek']:
+                    work_info['title_greek'] = elem.text
+
+            # An English label within a translation takes precedence over the titles
+            if 'translation' in tag:
+                for label in elem.iter():
+                    if 'label' in label.tag.lower():
+                        lang = label.get(XML_LANG, label.get('lang', 'unk'))
+                        if lang == 'eng' and label.text:
+                            translation_title = label.text
+                            break
+
+            if work_urn is None and 'work' in tag:
+                work_urn = elem.get('urn', '')
+
+        if translation_title is not None:
+            work_info['title_english'] = translation_title
+
+        # Extract URN, from the work element if the root has none
+        work_info['urn'] = root.get('urn', '') or work_urn or ''
+
+        # Extract work type (if available)
+        work_info['type'] = 'text'  # default
+
+        return work_info
+    except Exception as e:
+        print(f"Error parsing CTS metadata {cts_path}: {e}")
+        return None
+
+
+def parse_groupname(cts_path):
+    """Return (groupname text, error message) of an author's __cts__.xml"""
+    try:
+        root = ET.parse(cts_path).getroot()
+    except Exception as e:
+        return None, str(e)
+    for elem in root.iter():
+        if 'groupname' in elem.tag.lower():
+            return elem.text, None
+    return None, None
+
+
+def _mtime_ns(path):
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class CTSCatalog:
+    """Author and work metadata and file lists, keyed by directory path and mtimes, and the parsing code"""
+
+    def __init__(self, cache_file=DEFAULT_CACHE_FILE):
+        self.cache_file = Path(cache_file)
+        self.code_version = code_fingerprint([parse_cts_metadata, parse_groupname, CTSCatalog])
+        self.entries = {}
+        self.dirty = False
+        self.hits = self.misses = 0
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('code_version') == self.code_version:
+                    self.entries = data.get('directories', {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable CTS catalog {self.cache_file}: {e}")
+
+    def _entry(self, directory, scan):
+        """Return the cached entry of directory, rescanning it if it or its __cts__.xml changed"""
+        key = str(directory.resolve())
+        stamp = [directory.stat().st_mtime_ns, _mtime_ns(directory / "__cts__.xml")]
+        entry = self.entries.get(key)
+        if entry and entry['mtime_ns'] == stamp:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = dict(scan(directory), mtime_ns=stamp)
+        self.entries[key] = entry
+        self.dirty = True
+        return entry
+
+    def author_ids(self, corpus_dir, prefix):
+        """Sorted author directory names in corpus_dir that start with prefix"""
+        entry = self._entry(Path(corpus_dir), lambda corpus: {
+            'directories': sorted(path.name for path in corpus.iterdir() if path.is_dir()),
+        })
+        return [name for name in entry['directories'] if name.startswith(prefix)]
+
+    def author(self, author_dir):
+        """groupname (None if missing), parse error and work directory names of an author"""
+        def scan(author_dir):
+            groupname, error = None, None
+            if (author_dir / "__cts__.xml").exists():
+                groupname, error = parse_groupname(author_dir / "__cts__.xml")
+            return {
+                'groupname': groupname,
+                'error': error,
+                'works': [path.name for path in author_dir.iterdir()
+                          if path.is_dir() and not path.name.startswith('__')],
+            }
+        return self._entry(Path(author_dir), scan)
+
+    def work(self, work_dir):
+        """CTS metadata (None if missing or unreadable) and text and translation file names of a work"""
+        def scan(work_dir):
+            work_cts = work_dir / "__cts__.xml"
+            return {
+                'has_cts': work_cts.exists(),
+                'metadata': parse_cts_metadata(work_cts) if work_cts.exists() else None,
+                'text_files': [path.name for path in work_dir.glob("*.xml") if not path.name.startswith('__')],
+                'translation_files': [path.name for path in work_dir.glob("*eng*.xml")],
+            }
+        return self._entry(Path(work_dir), scan)
+
+    def author_names(self, corpus_dir, prefix):
+        """Author id -> display name for discovery, warning about unreadable __cts__.xml files"""
+        authors = {}
+        for author_id in self.author_ids(corpus_dir, prefix):
+            entry = self.author(Path(corpus_dir) / author_id)
+            if entry['error']:
+                print(f"  Warning: Failed to parse {Path(corpus_dir) / author_id / '__cts__.xml'}: {entry['error']}")
+            groupname = (entry['groupname'] or '').strip()
+            authors[author_id] = groupname or f"Author {author_id}"
+        return authors
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp_file = self.cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'code_version': self.code_version, 'directories': self.entries}, f, ensure_ascii=False)
+        tmp_file.replace(self.cache_file)
+        self.dirty = False
+
+
+def author_summary(catalog, author_dir):
+    """Work count and whether any work has an English translation"""
+    works = [catalog.work(author_dir / work) for work in catalog.author(author_dir)['works']]
+    works = [work for work in works if work['has_cts']]
+    return len(works), any(work['translation_files'] for work in works)
+
+
+if __name__ == '__main__':
+    script_dir = Path(__file__).parent
+    data_sources = Path(sys.argv[1]) if len(sys.argv) > 1 else script_dir.parent / "data-sources"
+    catalog = CTSCatalog(script_dir / DEFAULT_CACHE_FILE)
+
+    greek_catalog = {}
+    for language, (corpus, prefix) in CORPORA.items():
+        corpus_dir = data_sources / corpus / "data"
+        if not corpus_dir.exists():
+            print(f"✗ {corpus_dir} not found")
+            continue
+        print(f"=== {language.upper()} CATALOG ===")
+        authors = catalog.author_names(corpus_dir, prefix)
+        work_total = translated = 0
+        for author_id, name in authors.items():
+            works, has_translations = author_summary(catalog, corpus_dir / author_id)
+            work_total += works
+            translated += has_translations
+            if language == 'greek':
+                greek_catalog[author_id] = {'name': name, 'works': works, 'has_translations': has_translations}
+        print(f"  {len(authors)} authors, {work_total} works, {translated} authors with translations")
+
+    if greek_catalog:
+        with open(script_dir / "greek_authors_catalog.json", 'w', encoding='utf-8') as f:
+            json.dump(greek_catalog, f, ensure_ascii=False, indent=2)
+        print(f"✓ Wrote greek_authors_catalog.json ({len(greek_catalog)} authors)")
+    print(f"Catalog: {catalog.hits} cached, {catalog.misses} scanned")
+    catalog.save()
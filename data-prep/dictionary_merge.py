@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Set-based merge of supplement sources into dictionary_entries and lemma_map.
+
+A supplement (the Wiktionary definitions, the curated supplements, the
+inflection mappings) is first bulk-loaded into a TEMP staging table and then
+merged with a few statements instead of a lookup per entry:
+
+dictionary_entries, keyed by (headword_normalized, language):
+  - staged entries whose headword already has an LSJ (or any other
+    non-Wiktionary) entry are skipped, LSJ takes precedence
+  - existing Wiktionary entries are updated with the staged content
+  - all other staged entries are inserted, in source order
+
+lemma_map, keyed by word_form:
+  - staged mappings for word forms that already have a mapping with at least
+    min_confidence are skipped
+  - the low-confidence mappings of the remaining word forms are replaced
+  - all other staged mappings are inserted
+  with replace_low_confidence=False the merge only adds: staged mappings
+  are inserted unless that (word_form, lemma) pair exists, and no existing
+  mapping is removed
+
+Both return {'added', 'updated', 'skipped'} counts.
+
+Usage:
+    python dictionary_merge.py definitions <supplement.json> [database]
+    python dictionary_merge.py mappings <mappings.json> [database]
+"""
+
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+WIKTIONARY_SOURCE = 'wiktionary'
+
+DICTIONARY_COLUMNS = ('headword', 'headword_normalized', 'language', 'entry_xml',
+                      'entry_html', 'entry_plain', 'source')
+
+LEMMA_COLUMNS = ('word_form', 'word_normalized', 'lemma', 'confidence', 'source', 'morph_info')
+
+# Existing mappings at or above this confidence win over staged ones
+DEFAULT_MIN_CONFIDENCE = 0.9
+
+
+def load_supplement(path):
+    """Entries of a supplement JSON file (a list, or a dict keyed by normalized form)
+
+    In a dict of mappings the key is the word form and the value holds the
+    lemma as 'lemma' or 'lemma_normalized'.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data
+    entries = []
+    for key, value in data.items():
+        if not isinstance(value, dict):
+            raise ValueError(f"{path} is not a supplement file ({key!r} is not an entry)")
+        if 'headword' not in value and 'word_form' not in value:
+            value = dict(value, word_form=key, lemma=value.get('lemma_normalized', value.get('lemma')))
+        entries.append(value)
+    return entries
+
+
+def merge_dictionary_entries(cursor, entries, source=None):
+    """Merge supplement entries into dictionary_entries; source overrides the entries' own"""
+    cursor.execute("DROP TABLE IF EXISTS temp.dictionary_staging")
+    cursor.execute("""
+        CREATE TEMP TABLE dictionary_staging (
+            headword TEXT NOT NULL,
+            headword_normalized TEXT NOT NULL,
+            language TEXT NOT NULL,
+            entry_xml TEXT,
+            entry_html TEXT,
+            entry_plain TEXT,
+            source TEXT,
+            PRIMARY KEY (headword_normalized, language)
+        )
+    """)
+    rows = [(entry['headword'], entry['headword_normalized'], entry['language'],
+             entry.get('entry_xml'), entry.get('entry_html'), entry.get('entry_plain'),
+             source or entry.get('source', WIKTIONARY_SOURCE))
+            for entry in entries]
+    # The first entry of a headword wins, later duplicates are ignored
+    cursor.executemany("INSERT OR IGNORE INTO dictionary_staging VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    staged = len(rows)
+
+    try:
+        # LSJ over Wiktionary
+        cursor.execute("""
+            DELETE FROM dictionary_staging
+            WHERE EXISTS (SELECT 1 FROM dictionary_entries d
+                          WHERE d.headword_normalized = dictionary_staging.headword_normalized
+                            AND d.language = dictionary_staging.language
+                            AND d.source IS NOT ?)
+        """, (WIKTIONARY_SOURCE,))
+
+        cursor.execute("""
+            UPDATE dictionary_entries
+            SET headword = s.headword, entry_xml = s.entry_xml,
+                entry_html = s.entry_html, entry_plain = s.entry_plain
+            FROM dictionary_staging s
+            WHERE dictionary_entries.headword_normalized = s.headword_normalized
+              AND dictionary_entries.language = s.language
+              AND dictionary_entries.source = ?
+              AND (dictionary_entries.headword IS NOT s.headword
+                   OR dictionary_entries.entry_xml IS NOT s.entry_xml
+                   OR dictionary_entries.entry_html IS NOT s.entry_html
+                   OR dictionary_entries.entry_plain IS NOT s.entry_plain)
+        """, (WIKTIONARY_SOURCE,))
+        updated = cursor.rowcount
+
+        columns = ', '.join(DICTIONARY_COLUMNS)
+        cursor.execute(f"""
+            INSERT INTO dictionary_entries ({columns})
+            SELECT {columns} FROM dictionary_staging s
+            WHERE NOT EXISTS (SELECT 1 FROM dictionary_entries d
+                              WHERE d.headword_normalized = s.headword_normalized
+                                AND d.language = s.language)
+            ORDER BY s.rowid
+        """)
+        added = cursor.rowcount
+    finally:
+        cursor.execute("DROP TABLE IF EXISTS temp.dictionary_staging")
+
+    return {'added': added, 'updated': updated, 'skipped': staged - added - updated}
+
+
+def merge_lemma_mappings(cursor, mappings, source=None, min_confidence=DEFAULT_MIN_CONFIDENCE,
+                         replace_low_confidence=True):
+    """Merge supplement mappings into lemma_map, replacing only low-confidence word forms
+
+    With replace_low_confidence=False existing mappings are kept and staged
+    pairs are only inserted where missing (INSERT OR IGNORE).
+    """
+    cursor.execute("DROP TABLE IF EXISTS temp.lemma_staging")
+    cursor.execute("""
+        CREATE TEMP TABLE lemma_staging (
+            word_form TEXT NOT NULL,
+            word_normalized TEXT NOT NULL,
+            lemma TEXT NOT NULL,
+            confidence REAL,
+            source TEXT,
+            morph_info TEXT,
+            PRIMARY KEY (word_form, lemma)
+        )
+    """)
+    rows = [(mapping['word_form'], mapping.get('word_normalized') or mapping['word_form'],
+             mapping['lemma'], mapping.get('confidence', 1.0),
+             source or mapping.get('source', WIKTIONARY_SOURCE),
+             mapping.get('morph_info'))
+            for mapping in mappings]
+    cursor.executemany("INSERT OR IGNORE INTO lemma_staging VALUES (?, ?, ?, ?, ?, ?)", rows)
+    staged = len(rows)
+
+    columns = ', '.join(LEMMA_COLUMNS)
+    try:
+        if not replace_low_confidence:
+            cursor.execute(f"""
+                INSERT OR IGNORE INTO lemma_map ({columns})
+                SELECT {columns} FROM lemma_staging ORDER BY rowid
+            """)
+            added = cursor.rowcount
+            return {'added': added, 'updated': 0, 'skipped': staged - added}
+
+        cursor.execute("""
+            DELETE FROM lemma_staging
+            WHERE EXISTS (SELECT 1 FROM lemma_map m
+                          WHERE m.word_form = lemma_staging.word_form AND m.confidence >= ?)
+        """, (min_confidence,))
+
+        # Whatever lemma_map still has for the staged word forms is low-confidence
+        cursor.execute("""
+            SELECT COUNT(*) FROM lemma_staging
+            WHERE word_form IN (SELECT word_form FROM lemma_map)
+        """)
+        updated = cursor.fetchone()[0]
+        cursor.execute("""
+            DELETE FROM lemma_map
+            WHERE word_form IN (SELECT word_form FROM lemma_staging)
+        """)
+
+        cursor.execute(f"""
+            INSERT INTO lemma_map ({columns})
+            SELECT {columns} FROM lemma_staging ORDER BY rowid
+        """)
+        added = cursor.rowcount - updated
+    finally:
+        cursor.execute("DROP TABLE IF EXISTS temp.lemma_staging")
+
+    return {'added': added, 'updated': updated, 'skipped': staged - added - updated}
+
+
+def print_merge_counts(counts, noun='entries'):
+    print(f"✓ Added {counts['added']:,} {noun}, updated {counts['updated']:,}, "
+          f"skipped {counts['skipped']:,}")
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ('definitions', 'mappings'):
+        print("Usage: python dictionary_merge.py definitions|mappings <supplement.json> [database]")
+        sys.exit(1)
+
+    kind, supplement_file = sys.argv[1], Path(sys.argv[2])
+    db_path = sys.argv[3] if len(sys.argv) > 3 else 'perseus_texts.db'
+    try:
+        entries = load_supplement(supplement_file)
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    print(f"=== MERGING {len(entries):,} {kind.upper()} FROM {supplement_file} INTO {db_path} ===")
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    if kind == 'definitions':
+        counts = merge_dictionary_entries(cursor, entries)
+    else:
+        counts = merge_lemma_mappings(cursor, entries)
+    conn.commit()
+    conn.close()
+
+    print_merge_counts(counts, kind)
+    print(f"  Merged in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of the parsed LSJ dictionary.
+
+Parsing the LSJ XML (reading, entity patching, formatting every entry as HTML
+and plain text) is the slow part of the dictionary import, and the LSJ file
+almost never changes. The parsed dictionary_entries rows are stored in
+lsj_cache.db together with the SHA-256 of the LSJ file and the parser version
+(a fingerprint of the LSJParser code). When both match, the build copies the
+rows into the database with one INSERT ... SELECT instead of parsing.
+
+Usage:
+    python lsj_cache.py [lsj_cache.db]
+
+prints what the cache holds.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+DEFAULT_CACHE_FILE = 'lsj_cache.db'
+
+ENTRY_COLUMNS = ('headword', 'headword_normalized', 'language', 'entry_xml',
+                 'entry_html', 'entry_plain', 'source')
+
+
+class LSJCache:
+    """Parsed LSJ entries keyed by LSJ file hash and parser version"""
+
+    def __init__(self, cache_file=DEFAULT_CACHE_FILE):
+        self.cache_file = Path(cache_file)
+
+    def _metadata(self):
+        if not self.cache_file.exists():
+            return {}
+        conn = sqlite3.connect(self.cache_file)
+        try:
+            return dict(conn.execute("SELECT key, value FROM metadata"))
+        except sqlite3.DatabaseError:
+            return {}
+        finally:
+            conn.close()
+
+    def is_current(self, lsj_hash, parser_version):
+        """True if the cache holds the entries of this LSJ file and parser"""
+        metadata = self._metadata()
+        return (metadata.get('lsj_sha256') == lsj_hash and
+                metadata.get('parser_version') == parser_version)
+
+    def store(self, entries, lsj_hash, parser_version):
+        """Replace the cached entries with freshly parsed ones"""
+        tmp_file = self.cache_file.with_suffix('.tmp')
+        if tmp_file.exists():
+            tmp_file.unlink()
+        conn = sqlite3.connect(tmp_file)
+        conn.execute(f"CREATE TABLE lsj_entries ({', '.join(ENTRY_COLUMNS)})")
+        conn.execute("CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT)")
+        conn.executemany(f"INSERT INTO lsj_entries VALUES ({', '.join('?' * len(ENTRY_COLUMNS))})",
+                         ([entry[column] for column in ENTRY_COLUMNS] for entry in entries))
+        conn.executemany("INSERT INTO metadata VALUES (?, ?)",
+                         [('lsj_sha256', lsj_hash), ('parser_version', parser_version),
+                          ('entry_count', str(len(entries)))])
+        conn.commit()
+        conn.close()
+        tmp_file.replace(self.cache_file)
+        print(f"✓ Cached {len(entries):,} parsed LSJ entries in {self.cache_file}")
+
+    def copy_into(self, conn):
+        """Append the cached rows to dictionary_entries in one INSERT ... SELECT"""
+        columns = ', '.join(ENTRY_COLUMNS)
+        conn.commit()  # ATTACH is not allowed inside a transaction
+        conn.execute("ATTACH DATABASE ? AS lsj_cache", (str(self.cache_file),))
+        try:
+            cursor = conn.execute(f"""
+                INSERT INTO dictionary_entries ({columns})
+                SELECT {columns} FROM lsj_cache.lsj_entries ORDER BY rowid
+            """)
+            copied = cursor.rowcount
+            conn.commit()
+        finally:
+            conn.execute("DETACH DATABASE lsj_cache")
+        return copied
+
+    def headwords(self):
+        """Headword fields of the cached entries, in order (for the lemma mappings)"""
+        conn = sqlite3.connect(self.cache_file)
+        try:
+            return [{'headword': headword, 'headword_normalized': normalized}
+                    for headword, normalized in conn.execute(
+                        "SELECT headword, headword_normalized FROM lsj_entries ORDER BY rowid")]
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    cache_file = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).parent / DEFAULT_CACHE_FILE
+    metadata = LSJCache(cache_file)._metadata()
+    if not metadata:
+        print(f"✗ No LSJ cache at {cache_file}")
+        sys.exit(1)
+    print(f"=== LSJ CACHE {cache_file} ===")
+    for key, value in sorted(metadata.items()):
+        print(f"  {key}: {value}")
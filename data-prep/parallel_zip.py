@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Block-parallel DEFLATE compression into a standard ZIP archive.
+
+The input is cut into blocks that are compressed on all cores (zlib releases
+the GIL, so threads are enough). Every block is primed with the last 32 KB of
+the block before it, the DEFLATE window, and ended with a sync flush, so the
+blocks concatenate into one ordinary DEFLATE stream, the way pigz does it. The
+result is a plain single-entry ZIP file that zipfile, unzip and the app's
+ZipInputStream read like any other; its size is within a fraction of a
+percent of single-threaded zipfile output at the same level.
+
+Usage:
+    python parallel_zip.py <file> [archive.zip] [archive name]
+"""
+
+import os
+import struct
+import sys
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+DEFLATE_WINDOW = 32 * 1024
+
+# Sizes and offsets above this need ZIP64 records, which this writer does not produce
+ZIP32_LIMIT = 0xFFFFFFFF
+
+
+def _compress_block(block, dictionary, level, last):
+    """Raw DEFLATE of one block, continuing the stream of the previous one"""
+    if dictionary:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=dictionary)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(block) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def _dos_datetime(timestamp):
+    stamp = datetime.fromtimestamp(timestamp)
+    year = max(stamp.year, 1980)
+    return ((stamp.hour << 11) | (stamp.minute << 5) | (stamp.second // 2),
+            ((year - 1980) << 9) | (stamp.month << 5) | stamp.day)
+
+
+def _local_header(name, dos_time, dos_date, crc, compressed_size, size):
+    return struct.pack('<IHHHHHIIIHH', 0x04034b50, 20, 0, zlib.DEFLATED, dos_time, dos_date,
+                       crc, compressed_size, size, len(name), 0) + name
+
+
+def write_parallel_zip(source, zip_path, arcname=None, level=9, block_size=DEFAULT_BLOCK_SIZE, workers=None):
+    """Compress source into a single-entry ZIP at zip_path; returns size and timing stats"""
+    source, zip_path = Path(source), Path(zip_path)
+    name = (arcname or source.name).encode('ascii')
+    size = source.stat().st_size
+    if size >= ZIP32_LIMIT:
+        raise ValueError(f"{source} is too large for a ZIP32 archive")
+    workers = workers or os.cpu_count() or 1
+    dos_time, dos_date = _dos_datetime(source.stat().st_mtime)
+
+    start = time.perf_counter()
+    crc = 0
+    compressed_size = 0
+    tmp_path = zip_path.with_name(zip_path.name + '.tmp')
+    with open(source, 'rb') as src, open(tmp_path, 'wb') as out, ThreadPoolExecutor(workers) as executor:
+        # Placeholder header, rewritten once the CRC and compressed size are known
+        out.write(_local_header(name, dos_time, dos_date, 0, 0, 0))
+
+        pending = deque()
+        dictionary = b''
+        block = src.read(block_size)
+        while True:
+            next_block = src.read(block_size)
+            last = not next_block
+            crc = zlib.crc32(block, crc)
+            pending.append(executor.submit(_compress_block, block, dictionary, level, last))
+            dictionary = block[-DEFLATE_WINDOW:]
+            # Keep a bounded number of blocks in flight
+            while len(pending) > workers * 2 or (last and pending):
+                data = pending.popleft().result()
+                out.write(data)
+                compressed_size += len(data)
+            if last:
+                break
+            block = next_block
+
+        if compressed_size >= ZIP32_LIMIT:
+            raise ValueError(f"{source} compresses to more than a ZIP32 archive can hold")
+        central_offset = out.tell()
+        out.write(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, 20, 20, 0, zlib.DEFLATED,
+                              dos_time, dos_date, crc, compressed_size, size, len(name),
+                              0, 0, 0, 0, 0o100644 << 16, 0) + name)
+        central_size = out.tell() - central_offset
+        out.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, 1, 1, central_size, central_offset, 0))
+
+        out.seek(0)
+        out.write(_local_header(name, dos_time, dos_date, crc, compressed_size, size))
+    tmp_path.replace(zip_path)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'size': size,
+        'zip_size': zip_path.stat().st_size,
+        'seconds': elapsed,
+        'mb_per_second': size / (1024 * 1024) / elapsed if elapsed else 0.0,
+        'workers': workers,
+    }
+
+
+def print_zip_stats(zip_path, stats):
+    original_mb = stats['size'] / (1024 * 1024)
+    compressed_mb = stats['zip_size'] / (1024 * 1024)
+    print(f"Database compressed: {zip_path}")
+    print(f"Original size: {original_mb:.1f}MB")
+    print(f"Compressed size: {compressed_mb:.1f}MB ({compressed_mb / original_mb * 100 if original_mb else 0:.1f}%)")
+    print(f"Throughput: {stats['mb_per_second']:.1f}MB/s on {stats['workers']} "
+          f"{'core' if stats['workers'] == 1 else 'cores'} ({stats['seconds']:.1f}s)")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python parallel_zip.py <file> [archive.zip] [archive name]")
+        sys.exit(1)
+    source = Path(sys.argv[1])
+    zip_path = Path(sys.argv[2]) if len(sys.argv) > 2 else source.with_name(source.name + '.zip')
+    arcname = sys.argv[3] if len(sys.argv) > 3 else None
+    print_zip_stats(zip_path, write_parallel_zip(source, zip_path, arcname))
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Synthetic databases for the checks (test_*.py) and benchmarks (benchmark_*.py)
+of the build stages, and the app queries they replay.
+
+Every database starts from create_schema, so the fixtures always have the
+schema the build writes. write_xml_fixtures writes the source documents of
+the stages that parse XML, and the run_* functions run those stages. The
+old_*_sentences functions are the sentence split SentenceSegmenter replaced.
+"""
+
+import bz2
+import contextlib
+import io
+import random
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "wiktionary-processing"))
+
+import xml_backend as ET
+from book_line_stats import BookLineStats
+from create_perseus_database import (LSJParser, create_schema, create_translation_lookup_table,
+                                     process_text_file, process_translations)
+from cts_catalog import parse_cts_metadata, parse_groupname
+from translation_prepass import TranslationPrepassCache
+from wiktionary_dump import PagePrefilter, iter_pages
+
+# The lookup part of TranslationSegmentDao.getTranslationSegments
+ROOM_LOOKUP_QUERY = """
+    SELECT DISTINCT ts.id FROM translation_segments ts
+    WHERE ts.book_id = ?
+    AND EXISTS (
+        SELECT 1 FROM translation_lookup tl
+        WHERE tl.book_id = ?
+        AND tl.segment_id = ts.id
+        AND tl.line_number BETWEEN ? AND ?
+    )
+"""
+
+# Segments of a line window in translation_lookup_ranges (book_id, end_line, start_line)
+RANGE_LOOKUP_QUERY = """
+    SELECT DISTINCT segment_id FROM translation_lookup_ranges
+    WHERE book_id = ? AND start_line <= ? AND end_line >= ?
+"""
+
+PAGE_LINES = 30
+
+# TextLineDao queries used when a book is opened and paged through
+OPEN_BOOK_QUERIES = (
+    "SELECT COUNT(*) FROM text_lines WHERE book_id = ?",
+    "SELECT MIN(line_number) FROM text_lines WHERE book_id = ?",
+    "SELECT MAX(line_number) FROM text_lines WHERE book_id = ?",
+)
+PAGE_QUERY = ("SELECT * FROM text_lines WHERE book_id = ? AND line_number >= ? AND line_number <= ? "
+              "ORDER BY line_number")
+
+# WordDao.findLinesWithLemma
+LEMMA_QUERY = """
+    SELECT DISTINCT w.book_id, w.line_number
+    FROM words w
+    INNER JOIN lemma_map lm ON w.word_normalized = lm.word_normalized
+    WHERE lm.lemma = ?
+    ORDER BY w.book_id, w.line_number
+    LIMIT 500
+"""
+
+VOCABULARY = [f"λεξις{i}" for i in range(3000)]
+
+TEI_NS = "http://www.tei-c.org/ns/1.0"
+WORDS = ["μῆνιν", "ἄειδε", "θεὰ", "Πηληϊάδεω", "Ἀχιλῆος", "οὐλομένην", "ἣ", "μυρί᾽", "Ἀχαιοῖς", "ἄλγε᾽", "ἔθηκε"]
+ENGLISH = ["wrath", "sing", "goddess", "son", "ruinous", "which", "countless", "woes", "brought", "upon"]
+
+GREEK_PARAGRAPH = ("ἐγὼ δὲ ὑμῖν ἐρῶ τὴν ἀλήθειαν. οὐ γὰρ δὴ ἐμὸν ἐρῶ τὸν λόγον· ἀλλ᾽ εἰς ἀξιόχρεων "
+                   "ὑμῖν τὸν λέγοντα ἀνοίσω; τῆς γὰρ ἐμῆς, εἰ δή τίς ἐστιν σοφία καὶ οἵα, μάρτυρα ὑμῖν "
+                   "παρέξομαι τὸν θεὸν τὸν ἐν Δελφοῖς! Χαιρεφῶντα γὰρ ἴστε που.")
+
+TRICKY_PARAGRAPHS = [
+    "",
+    "   ",
+    "short",
+    "  exactly six  ",
+    GREEK_PARAGRAPH,
+    "W: a note that is long enough. em. another emended reading here. add. and an addition "
+    "here. id. the same as above, long. Nauck reads it differently. so does Mullach, ad loc.",
+    "Gallia est omnis divisa in partes tres! quarum unam incolunt Belgae? aliam Aquitani; "
+    "tertiam qui ipsorum lingua Celtae appellantur.",
+    "ends without whitespace.next sentence is long enough\nand spans a line break.   trailing.  ",
+    "· starts with a raised dot·  then more than ten characters",
+]
+
+
+def create_database(db_path, lemma_map=False):
+    """Connection to a database with the text tables of the build (and lemma_map)"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_schema(cursor)
+    if lemma_map:
+        # lemma_map is created by the dictionary import
+        cursor.execute("""
+            CREATE TABLE lemma_map (
+                word_form TEXT NOT NULL,
+                word_normalized TEXT NOT NULL,
+                lemma TEXT NOT NULL,
+                confidence REAL DEFAULT 1.0,
+                source TEXT,
+                morph_info TEXT,
+                PRIMARY KEY (word_form, lemma)
+            )
+        """)
+        cursor.execute("CREATE INDEX idx_lemma_map_lemma ON lemma_map(lemma)")
+    return conn
+
+
+def add_book(cursor, book_id, line_numbers, book_stats=None):
+    """Insert a book and one text line per line number, in the given order"""
+    work_id, book_number = book_id.rsplit('.', 1)
+    cursor.execute("INSERT INTO books (id, work_id, book_number) VALUES (?, ?, ?)",
+                   (book_id, work_id, int(book_number)))
+    for line_num in line_numbers:
+        cursor.execute("INSERT INTO text_lines (book_id, line_number, line_text) VALUES (?, ?, 'x')",
+                       (book_id, line_num))
+        if book_stats is not None:
+            book_stats.add_line(book_id, line_num)
+
+
+def add_segment(cursor, book_id, start_line, end_line):
+    cursor.execute("""INSERT INTO translation_segments (book_id, start_line, end_line, translation_text)
+                      VALUES (?, ?, ?, 'x')""", (book_id, start_line, end_line))
+
+
+def build_lookup_corpus(db_path, books=40, seed=7):
+    """Books with line gaps and their translation_lookup; returns (conn, book_stats)
+
+    Even books are verse-like (segments of 10-40 lines numbered like the
+    text), odd books prose (a few long sections spread over all lines).
+    """
+    rng = random.Random(seed)
+    conn = create_database(db_path)
+    cursor = conn.cursor()
+    book_stats = BookLineStats()
+
+    for book_index in range(books):
+        book_id = f"tlg9999.tlg001.{book_index + 1}"
+        line_count = rng.randint(800, 3000)
+        add_book(cursor, book_id, [n for n in range(1, line_count + 1) if rng.random() > 0.05], book_stats)
+
+        if book_index % 2 == 0:
+            start = 1
+            while start <= line_count:
+                end = min(line_count, start + rng.randint(10, 40))
+                add_segment(cursor, book_id, start, end)
+                start = end + 1
+        else:
+            for section in range(1, rng.randint(4, 12) + 1):
+                add_segment(cursor, book_id, section, section)
+    conn.commit()
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_translation_lookup_table(conn, book_stats)
+    return conn, book_stats
+
+
+def build_text_corpus(db_path, books=120, seed=3):
+    """Books of 300-800 lines with about eight words per line, and a lemma_map; returns conn"""
+    rng = random.Random(seed)
+    conn = create_database(db_path, lemma_map=True)
+    cursor = conn.cursor()
+    for book_index in range(books):
+        book_id = f"tlg9999.tlg{book_index // 10 + 1:03d}.{book_index % 10 + 1}"
+        cursor.execute("INSERT INTO books (id, work_id, book_number) VALUES (?, ?, ?)",
+                       (book_id, book_id.rsplit('.', 1)[0], book_index % 10 + 1))
+        for line_num in range(1, rng.randint(300, 800) + 1):
+            words = [rng.choice(VOCABULARY) for _ in range(rng.randint(5, 11))]
+            cursor.execute("INSERT INTO text_lines (book_id, line_number, line_text, line_xml) VALUES (?, ?, ?, ?)",
+                           (book_id, line_num, ' '.join(words), f"<l n=\"{line_num}\">{' '.join(words)}</l>"))
+            cursor.executemany("""INSERT INTO words (word, word_normalized, book_id, line_number, word_position)
+                                  VALUES (?, ?, ?, ?, ?)""",
+                               [(word, word, book_id, line_num, position) for position, word in enumerate(words, 1)])
+    cursor.executemany("INSERT OR IGNORE INTO lemma_map (word_form, word_normalized, lemma) VALUES (?, ?, ?)",
+                       [(word, word, f"lemma{i % 500}") for i, word in enumerate(VOCABULARY)])
+    conn.commit()
+    return conn
+
+
+def write_xml_fixtures(directory, scale=1, seed=2):
+    """Write CTS, text, translation, LSJ and Wiktionary fixture files; returns their paths"""
+    rng = random.Random(seed)
+    directory = Path(directory)
+
+    def line(words=WORDS):
+        return ' '.join(rng.choice(words) for _ in range(rng.randint(4, 8)))
+
+    header = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '<!DOCTYPE TEI [<!ENTITY dagger "†">]>\n'
+              '<?xml-model href="tei.rng"?>\n')
+    works = []
+
+    # Verse with books, notes, line breaks, comments and an internal DTD entity
+    verse_dir = directory / "tlg0012" / "tlg001"
+    verse_dir.mkdir(parents=True)
+    books = []
+    for book in range(1, 3 * scale + 1):
+        lines = ''.join(f'<l n="{n}">{line()}<note>n. {n} &dagger;</note> {line()}</l>\n'
+                        if n % 7 == 0 else f'<l n="{n}">{line()}<lb/>{line()}</l>\n'
+                        for n in range(1, 40 * scale + 1))
+        books.append(f'<div type="textpart" subtype="book" n="{book}"><!-- book {book} -->\n{lines}</div>')
+    (verse_dir / "tlg0012.tlg001.perseus-grc2.xml").write_text(
+        f'{header}<TEI xmlns="{TEI_NS}"><teiHeader><fileDesc><titleStmt><title xml:lang="grc">Ἰλιάς</title>'
+        f'</titleStmt></fileDesc></teiHeader><text><body><div type="edition" xml:lang="grc">'
+        f'{"".join(books)}</div></body></text></TEI>', encoding='utf-8')
+    translation_books = ''.join(
+        f'<div type="textpart" subtype="book" n="{book}">'
+        + ''.join(f'<div type="textpart" subtype="card" n="{n}"><p>{line(ENGLISH)}</p></div>'
+                  for n in range(1, 40 * scale, 10)) + '</div>'
+        for book in range(1, 3 * scale + 1))
+    (verse_dir / "tlg0012.tlg001.perseus-eng2.xml").write_text(
+        f'{header}<TEI xmlns="{TEI_NS}"><teiHeader><fileDesc><titleStmt><title>Iliad</title>'
+        f'<editor role="translator">A. T. Murray</editor></titleStmt></fileDesc></teiHeader>'
+        f'<text><body><div type="translation">{translation_books}</div></body></text></TEI>', encoding='utf-8')
+    works.append(verse_dir)
+
+    # Drama with speakers
+    drama_dir = directory / "tlg0011" / "tlg004"
+    drama_dir.mkdir(parents=True)
+    speeches = ''.join(f'<sp><speaker>{"ΟΙ" if n % 3 else "ΚΡ"}</speaker><l n="{n}">{line()}</l></sp>'
+                       for n in range(1, 60 * scale + 1))
+    (drama_dir / "tlg0011.tlg004.perseus-grc2.xml").write_text(
+        f'{header}<TEI xmlns="{TEI_NS}"><teiHeader/><text><body><div type="edition">{speeches}'
+        f'</div></body></text></TEI>', encoding='utf-8')
+    works.append(drama_dir)
+
+    # Prose in sections, with a translation in sections
+    prose_dir = directory / "tlg0059" / "tlg030"
+    prose_dir.mkdir(parents=True)
+    sections = ''.join(f'<div type="textpart" subtype="section" n="{n}"><p>{line()} {line()}</p></div>'
+                       for n in range(1, 30 * scale + 1))
+    (prose_dir / "tlg0059.tlg030.perseus-grc2.xml").write_text(
+        f'{header}<TEI xmlns="{TEI_NS}"><teiHeader/><text><body><div type="edition">{sections}'
+        f'</div></body></text></TEI>', encoding='utf-8')
+    translation_sections = ''.join(f'<div type="textpart" subtype="section" n="{n}"><p>{line(ENGLISH)}</p></div>'
+                                   for n in range(1, 30 * scale + 1))
+    (prose_dir / "tlg0059.tlg030.perseus-eng2.xml").write_text(
+        f'{header}<TEI xmlns="{TEI_NS}"><teiHeader><fileDesc><titleStmt><respStmt><resp>translated by</resp>'
+        f'<name>Paul Shorey</name></respStmt></titleStmt></fileDesc></teiHeader><text><body>'
+        f'<div type="translation">{translation_sections}</div></body></text></TEI>', encoding='utf-8')
+    works.append(prose_dir)
+
+    # CTS metadata of the authors and works
+    for work_dir in works:
+        (work_dir.parent / "__cts__.xml").write_text(
+            f'<ti:textgroup xmlns:ti="http://chs.harvard.edu/xmlns/cts" urn="urn:cts:greekLit:{work_dir.parent.name}">'
+            f'<!-- generated --><ti:groupname xml:lang="eng">Author {work_dir.parent.name}</ti:groupname>'
+            f'</ti:textgroup>', encoding='utf-8')
+        (work_dir / "__cts__.xml").write_text(
+            f'<ti:work xmlns:ti="http://chs.harvard.edu/xmlns/cts" xml:lang="grc" '
+            f'urn="urn:cts:greekLit:{work_dir.parent.name}.{work_dir.name}">'
+            f'<ti:title xml:lang="lat">Opus {work_dir.name}</ti:title><ti:title xml:lang="grc">Ἔργον</ti:title>'
+            f'<ti:translation><ti:label xml:lang="eng">Work {work_dir.name}</ti:label></ti:translation>'
+            f'</ti:work>', encoding='utf-8')
+
+    # LSJ entries with the entities LSJParser replaces
+    entries = ''.join(
+        f'<entry type="main" key="le/cis{i}"><form><orth lang="greek">{WORDS[i % len(WORDS)]}</orth></form>'
+        f'<etym>from &lpar;{i}&rpar; &mdash; x</etym>'
+        f'<sense level="1" n="A"><trans><tr>{line(ENGLISH)}</tr></trans><usg>Ep.</usg>'
+        f'<foreign lang="greek">{line()}</foreign> <bibl>Il. {i}</bibl></sense>'
+        f'<sense level="2" n="II"><trans><tr>{line(ENGLISH)}</tr>, <tr>more</tr></trans></sense>'
+        f'<sense n="B"><usg>no translation</usg></sense></entry>'
+        for i in range(200 * scale))
+    lsj_path = directory / "lsj.xml"
+    lsj_path.write_text(f'<?xml version="1.0" encoding="UTF-8"?>\n<TEI.2><text><body><div0>'
+                        f'<entry type="main" key="none"><sense><usg>skipped</usg></sense></entry>'
+                        f'{entries}</div0></body></text></TEI.2>', encoding='utf-8')
+
+    # Wiktionary dump with Greek and other pages
+    pages = ''.join(
+        f'<page><title>{WORDS[i % len(WORDS)] if i % 2 else f"word{i}"}</title><ns>0</ns><id>{i}</id>'
+        f'<revision><text xml:space="preserve">==Ancient Greek==\n{{{{inflection of|grc|x}}}} &amp; {line()}</text>'
+        f'</revision></page>\n'
+        for i in range(300 * scale))
+    dump_path = directory / "dump.xml.bz2"
+    with bz2.open(dump_path, 'wt', encoding='utf-8') as f:
+        f.write(f'<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.11/"><siteinfo><sitename>W</sitename>'
+                f'</siteinfo>\n{pages}</mediawiki>')
+
+    return {
+        'cts': sorted(directory.glob("*/__cts__.xml")) + sorted(directory.glob("*/*/__cts__.xml")),
+        'works': works,
+        'lsj': lsj_path,
+        'dump': dump_path,
+    }
+
+
+def run_cts(paths):
+    return [parse_cts_metadata(path) if path.parent.name.startswith(('tlg', 'phi')) and
+            path.parent.parent.name.startswith(('tlg', 'phi')) else parse_groupname(path)
+            for path in paths]
+
+
+def run_ingestion(works, tmp_dir):
+    """Ingest the texts, then the translations of works; returns (rows, text seconds, translation seconds)"""
+    conn = create_database(':memory:')
+    cursor = conn.cursor()
+    book_stats = BookLineStats()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for work_dir in works:
+            work_id = f"{work_dir.parent.name}.{work_dir.name}"
+            language = 'latin' if work_dir.parent.name.startswith('phi') else 'greek'
+            for text_file in sorted(work_dir.glob("*perseus-*.xml")):
+                if ('grc' in text_file.name and language == 'greek') or ('lat' in text_file.name and language == 'latin'):
+                    process_text_file(text_file, work_id, cursor, language, book_stats)
+                    break
+        text_elapsed = time.perf_counter() - start
+
+        prepass = TranslationPrepassCache(Path(tmp_dir) / f"prepass_{ET.BACKEND}_{time.perf_counter_ns()}.json")
+        start = time.perf_counter()
+        for work_dir in works:
+            process_translations(work_dir, f"{work_dir.parent.name}.{work_dir.name}", cursor, book_stats, prepass,
+                                 sorted(path.name for path in work_dir.glob("*eng*.xml")))
+        translation_elapsed = time.perf_counter() - start
+
+    rows = {table: cursor.execute(f"SELECT * FROM {table} ORDER BY id").fetchall()
+            for table in ('books', 'text_lines', 'words', 'translation_segments')}
+    conn.close()
+    return rows, text_elapsed, translation_elapsed
+
+
+def run_lsj(path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return LSJParser().parse_lsj_xml(str(path))
+
+
+def run_wiktionary(dump_path):
+    return (list(iter_pages(dump_path)),
+            list(iter_pages(dump_path, prefilter=PagePrefilter(markers=['==Ancient Greek=='], greek_title=True))))
+
+
+def old_paragraph_sentences(text, language):
+    """The original per-paragraph split and filter"""
+    sentences_out = []
+    text = text.strip()
+    if text and len(text) > 5:
+        if language == 'greek':
+            sentences = re.split(r'[.!?·;]\s+', text)
+        else:
+            sentences = re.split(r'[.!?]\s+', text)
+        for sentence in sentences:
+            sentence = sentence.strip()
+            if (sentence and len(sentence) > 10 and
+                not re.match(r'^[A-Z]:', sentence) and
+                not sentence.startswith('em.') and
+                not sentence.startswith('add.') and
+                'Nauck' not in sentence and
+                'Mullach' not in sentence and
+                not sentence.startswith('id.')):
+                sentences_out.append(sentence)
+    return sentences_out
+
+
+def old_section_sentences(text, language):
+    """The original split and filter for sections without paragraphs"""
+    if language == 'greek':
+        sentences = re.split(r'[.!?·;]\s+', text)
+    else:
+        sentences = re.split(r'[.!?]\s+', text)
+    return [sentence.strip() for sentence in sentences
+            if (sentence.strip() and len(sentence.strip()) > 20 and
+                not re.match(r'^[A-Z]:', sentence.strip()) and
+                not sentence.strip().startswith('em.') and
+                not sentence.strip().startswith('add.') and
+                'Nauck' not in sentence and
+                'Mullach' not in sentence)]
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Sentence segmentation for prose texts.
+
+Prose paragraphs are split into sentences, one text_lines row per sentence.
+Greek ends sentences with . ! ? · or ; and Latin with . ! ? (each followed by
+whitespace). Sentences that are too short or look like editorial notes
+("W:" style notes, em./add./id. notes, Nauck and Mullach references) are
+dropped. The patterns are compiled once, each filter is a single alternation,
+and segment_paragraphs splits all the paragraphs of a section with one call.
+"""
+
+import re
+
+# Paragraphs are stripped, so joining them with ". " adds exactly one sentence
+# break between them and one split call segments the whole section
+PARAGRAPH_SEPARATOR = '. '
+
+GREEK_SENTENCE_END = re.compile(r'[.!?\u00b7;]\s+')
+LATIN_SENTENCE_END = re.compile(r'[.!?]\s+')
+
+# "W:" style notes and em. / add. / id. notes, matched at the sentence start
+EDITORIAL_NOTE = re.compile(r'[A-Z]:|em\.|add\.|id\.')
+# The same without "id." notes (used for sections without paragraphs)
+EDITORIAL_NOTE_KEEP_ID = re.compile(r'[A-Z]:|em\.|add\.')
+# Apparatus references; rare, so only looked for per sentence when the text has one
+EDITORIAL_REFERENCE = re.compile(r'Nauck|Mullach')
+
+
+class SentenceSegmenter:
+    """Split prose text into sentences and drop editorial notes"""
+
+    def __init__(self, language, min_length=10, skip_id_notes=True):
+        self.split = (GREEK_SENTENCE_END if language == 'greek' else LATIN_SENTENCE_END).split
+        self.is_note = (EDITORIAL_NOTE if skip_id_notes else EDITORIAL_NOTE_KEEP_ID).match
+        self.min_length = min_length
+
+    def sentences(self, text):
+        """Sentences of one text, longer than min_length and not editorial"""
+        min_length, is_note = self.min_length, self.is_note
+        sentences = [sentence for sentence in map(str.strip, self.split(text))
+                     if len(sentence) > min_length and not is_note(sentence)]
+        if EDITORIAL_REFERENCE.search(text):
+            sentences = [sentence for sentence in sentences if not EDITORIAL_REFERENCE.search(sentence)]
+        return sentences
+
+    def segment_paragraphs(self, paragraphs, min_paragraph_length=5):
+        """Sentences of all paragraphs of a section, in order
+
+        Paragraphs are stripped and the ones of min_paragraph_length characters
+        or fewer are skipped.
+        """
+        texts = [text for text in map(str.strip, paragraphs) if len(text) > min_paragraph_length]
+        if not texts:
+            return []
+        return self.sentences(PARAGRAPH_SEPARATOR.join(texts))
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of database build stages.
+
+The build is a fixed sequence of named stages. Each stage declares its input
+files, extra parameters and the code it runs; its cache key is a hash of the
+previous stage's key, the input contents and the source of that code
+(including the local functions, classes and constants it refers to). After a
+stage runs, a snapshot of the database is stored under its key. On the next
+build, stages whose snapshot exists are skipped, and the latest snapshot is
+restored right before the first stage that has to run again. Changing only
+the lemmatizer therefore replays text ingestion and the dictionary import
+from the cache.
+
+Files are hashed by content. Directories (the text corpora) are fingerprinted
+by the path, size and mtime of every file in them.
+
+Snapshots are full copies of the database: one per stage and build mode is
+kept in stage_cache/, older ones are removed. Only the stages that load or
+generate bulk data (the authors, LSJ, the Wiktionary mappings and the
+lemmatization) are snapshotted; the cheap stages after them (indexes, flags,
+the translation lookup) run with cached=False on every build, as re-running
+them costs less than storing another copy of the database.
+"""
+
+import hashlib
+import inspect
+import sqlite3
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = 'stage_cache'
+
+# Values of module constants that become part of the code fingerprint
+_CONSTANT_TYPES = (str, int, float, bool, tuple, list, dict, set, frozenset)
+
+
+def file_sha256(path):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _code_objects(code):
+    """A code object and the code objects nested in it (comprehensions, closures)"""
+    yield code
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            yield from _code_objects(const)
+
+
+def _stable_repr(value):
+    if isinstance(value, (set, frozenset)):
+        return repr(sorted(value, key=repr))
+    return repr(value)
+
+
+def code_fingerprint(objects, local_dir=None):
+    """Hash the source of functions/classes and of everything local they refer to"""
+    local_dir = Path(local_dir or Path(__file__).parent).resolve()
+    digest = hashlib.sha256()
+    seen = set()
+    pending = list(objects)
+
+    while pending:
+        obj = pending.pop(0)
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        try:
+            source_file = Path(inspect.getsourcefile(obj)).resolve()
+            source = inspect.getsource(obj)
+        except (TypeError, OSError):
+            continue
+        if source_file.parent != local_dir:
+            continue
+        digest.update(source.encode('utf-8'))
+
+        if inspect.isclass(obj):
+            functions = [f for f in vars(obj).values() if inspect.isfunction(f)]
+        else:
+            functions = [obj] if inspect.isfunction(obj) else []
+
+        for function in functions:
+            names = sorted({name for code in _code_objects(function.__code__) for name in code.co_names})
+            for name in names:
+                if name not in function.__globals__:
+                    continue
+                value = function.__globals__[name]
+                if inspect.isfunction(value) or inspect.isclass(value):
+                    pending.append(value)
+                elif isinstance(value, _CONSTANT_TYPES) and name.isupper():
+                    digest.update(f"{name}={_stable_repr(value)}".encode('utf-8'))
+
+    return digest.hexdigest()
+
+
+class StageCache:
+    """Runs the build stages in order, replaying the ones whose output is cached
+
+    Usage, once per stage:
+
+        if stages.run('name', inputs=[...], code=[function, ...]):
+            function(...)
+
+    run() returns False when the stage's output is cached. Starting a stage
+    closes (and snapshots) the previous one; finish() closes the last one and
+    restores the final snapshot if the build ended on cached stages.
+    """
+
+    def __init__(self, conn, cache_dir, mode, profiler=None, enabled=True):
+        self.conn = conn
+        self.cache_dir = Path(cache_dir)
+        self.mode = mode
+        self.profiler = profiler
+        self.enabled = enabled
+        self.key = hashlib.sha256(mode.encode('utf-8')).hexdigest()
+        self._running = None      # (name, key) of a stage to snapshot when it ends
+        self._pending = None      # Snapshot to restore before the next stage that runs
+        self._restore_hooks = []
+        self._file_hashes = {}
+        self.replayed = []
+        self.executed = []
+
+    def on_restore(self, hook):
+        """Call hook() after a snapshot was restored (to rebuild in-memory state)"""
+        self._restore_hooks.append(hook)
+
+    def _snapshot_path(self, name, key):
+        return self.cache_dir / f"{self.mode}-{name}-{key[:16]}.db"
+
+    def _file_hash(self, path):
+        stat = path.stat()
+        memo_key = (str(path), stat.st_size, stat.st_mtime_ns)
+        if memo_key not in self._file_hashes:
+            self._file_hashes[memo_key] = file_sha256(path)
+        return self._file_hashes[memo_key]
+
+    def input_fingerprint(self, inputs):
+        """Hash input files by content and input directories by their file listing"""
+        digest = hashlib.sha256()
+        for path in map(Path, inputs):
+            digest.update(str(path).encode('utf-8'))
+            if path.is_file():
+                digest.update(self._file_hash(path).encode('ascii'))
+            elif path.is_dir():
+                for file_path in sorted(p for p in path.rglob('*') if p.is_file()):
+                    stat = file_path.stat()
+                    digest.update(f"{file_path.relative_to(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8'))
+            else:
+                digest.update(b'<missing>')
+        return digest.hexdigest()
+
+    def run(self, name, inputs=(), code=(), params=(), cached=True):
+        """Start stage name; return True if it has to run, False if replayed from cache
+
+        Stages with cached=False always run and are not snapshotted: reports
+        that write files, and stages that change too little data to be worth
+        a copy of the database. They still take part in the keys of later stages.
+        """
+        self._end_running()
+        if self.profiler:
+            self.profiler.stage(name)
+
+        digest = hashlib.sha256(self.key.encode('ascii'))
+        digest.update(name.encode('utf-8'))
+        digest.update(code_fingerprint(code).encode('ascii'))
+        digest.update(self.input_fingerprint(inputs).encode('ascii'))
+        digest.update(repr(params).encode('utf-8'))
+        self.key = digest.hexdigest()
+
+        snapshot = self._snapshot_path(name, self.key)
+        if self.enabled and cached and snapshot.exists():
+            print(f"\n↺ Stage '{name}' replayed from cache ({self.key[:12]})")
+            self._pending = snapshot
+            self.replayed.append(name)
+            return False
+
+        self._restore_pending()
+        self.executed.append(name)
+        if self.enabled and cached:
+            self._running = (name, self.key)
+        elif self.enabled:
+            # Drop snapshots left from when the stage was still cached
+            for old_snapshot in self.cache_dir.glob(f"{self.mode}-{name}-*.db"):
+                old_snapshot.unlink()
+        return True
+
+    def finish(self):
+        """Close the last stage and restore the final snapshot if it was replayed"""
+        self._end_running()
+        self._restore_pending()
+        if self.enabled:
+            print(f"\nStage cache: {len(self.replayed)} replayed, {len(self.executed)} executed")
+
+    def _restore_pending(self):
+        if self._pending is None:
+            return
+        print(f"  Restoring database from stage cache {self._pending.name}...")
+        self.conn.commit()
+        source = sqlite3.connect(self._pending)
+        try:
+            source.backup(self.conn)
+        finally:
+            source.close()
+        self._pending = None
+        for hook in self._restore_hooks:
+            hook()
+
+    def _end_running(self):
+        if self._running is None:
+            return
+        name, key = self._running
+        self._running = None
+        self.conn.commit()
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        snapshot = self._snapshot_path(name, key)
+        tmp_path = snapshot.with_suffix('.tmp')
+        target = sqlite3.connect(tmp_path)
+        try:
+            self.conn.backup(target)
+        finally:
+            target.close()
+        tmp_path.replace(snapshot)
+
+        # One snapshot per stage and mode
+        for old_snapshot in self.cache_dir.glob(f"{self.mode}-{name}-*.db"):
+            if old_snapshot != snapshot:
+                old_snapshot.unlink()
+        print(f"  Stage cache: saved '{name}' ({snapshot.stat().st_size / (1024 * 1024):.1f}MB)")
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Check that cluster_text_tables keeps the rows and query results of text_lines
+and words and leaves them WITHOUT ROWID tables without the redundant indexes.
+
+Page reads and latency: benchmark_clustered_text_tables.py.
+"""
+
+import tempfile
+from pathlib import Path
+
+from create_perseus_database import cluster_text_tables
+from perseus_fixtures import LEMMA_QUERY, OPEN_BOOK_QUERIES, PAGE_LINES, PAGE_QUERY, build_text_corpus
+
+
+def table_rows(cursor, table):
+    cursor.execute(f"SELECT * FROM {table}")
+    return sorted(cursor.fetchall(), key=repr)
+
+
+def test_clustering_keeps_rows_and_results():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build_text_corpus(Path(tmp) / 'text.db', books=4)
+        cursor = conn.cursor()
+        # A duplicate line number: text_lines falls back to (book_id, line_number, id)
+        cursor.execute("INSERT INTO text_lines (book_id, line_number, line_text) "
+                       "SELECT book_id, line_number, 'repeated' FROM text_lines LIMIT 1")
+        conn.commit()
+        before = {table: table_rows(cursor, table) for table in ('text_lines', 'words')}
+        book_id = cursor.execute("SELECT id FROM books LIMIT 1").fetchone()[0]
+        queries = [(query, (book_id,)) for query in OPEN_BOOK_QUERIES]
+        queries += [(PAGE_QUERY, (book_id, 1, PAGE_LINES)), (LEMMA_QUERY, ('lemma7',))]
+        results = [cursor.execute(query, params).fetchall() for query, params in queries]
+
+        cluster_text_tables(conn)
+
+        for table in ('text_lines', 'words'):
+            sql = cursor.execute("SELECT sql FROM sqlite_master WHERE name = ?", (table,)).fetchone()[0]
+            assert sql.rstrip().endswith('WITHOUT ROWID'), sql
+            assert table_rows(cursor, table) == before[table]
+        assert "line_number, id)" in cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'text_lines'").fetchone()[0]
+        index_names = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert not index_names & {'idx_text_lines_book', 'idx_words_book_line'}
+        assert 'idx_words_normalized' in index_names
+        assert [cursor.execute(query, params).fetchall() for query, params in queries] == results
+        conn.close()
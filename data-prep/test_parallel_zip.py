@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Check that write_parallel_zip produces standard archives (zipfile and, when
+installed, unzip read them back unchanged) for empty, single-block and
+multi-block inputs.
+
+Throughput and sizes vs zipfile: benchmark_parallel_zip.py.
+"""
+
+import random
+import shutil
+import subprocess
+import tempfile
+import zipfile
+from pathlib import Path
+
+from parallel_zip import write_parallel_zip
+
+BLOCK_SIZE = 64 * 1024
+
+
+def sample_bytes(size, seed=5):
+    """Compressible text with some random bytes mixed in"""
+    rng = random.Random(seed)
+    words = [f"λόγος{i} ".encode('utf-8') for i in range(500)]
+    chunks = []
+    total = 0
+    while total < size:
+        chunk = rng.choice(words) if rng.random() < 0.9 else rng.randbytes(16)
+        chunks.append(chunk)
+        total += len(chunk)
+    return b''.join(chunks)[:size]
+
+
+def test_archives_read_back_unchanged():
+    sizes = (0, 1, BLOCK_SIZE - 1, BLOCK_SIZE, 5 * BLOCK_SIZE + 123)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            source = Path(tmp) / f'input_{size}.db'
+            data = sample_bytes(size)
+            source.write_bytes(data)
+            zip_path = Path(tmp) / f'input_{size}.db.zip'
+            for workers in (1, 3):
+                stats = write_parallel_zip(source, zip_path, 'perseus_texts.db',
+                                           block_size=BLOCK_SIZE, workers=workers)
+                assert stats['size'] == size
+                assert stats['zip_size'] == zip_path.stat().st_size
+                assert not zip_path.with_name(zip_path.name + '.tmp').exists()
+                with zipfile.ZipFile(zip_path) as archive:
+                    assert archive.namelist() == ['perseus_texts.db']
+                    assert archive.testzip() is None
+                    assert archive.read('perseus_texts.db') == data
+                if shutil.which('unzip'):
+                    result = subprocess.run(['unzip', '-tq', str(zip_path)], capture_output=True, text=True)
+                    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Check SentenceSegmenter against the per-paragraph re.split and editorial
+filter chain the prose processors used before.
+
+Paragraphs/second of both: benchmark_sentence_segmenter.py.
+"""
+
+from perseus_fixtures import TRICKY_PARAGRAPHS, old_paragraph_sentences, old_section_sentences
+from sentence_segmenter import SentenceSegmenter
+
+
+def test_matches_old_split():
+    for language in ('greek', 'latin'):
+        segmenter = SentenceSegmenter(language)
+        expected = [s for text in TRICKY_PARAGRAPHS for s in old_paragraph_sentences(text, language)]
+        assert segmenter.segment_paragraphs(TRICKY_PARAGRAPHS) == expected
+        for text in TRICKY_PARAGRAPHS:
+            assert segmenter.segment_paragraphs([text]) == old_paragraph_sentences(text, language), text
+
+
+def test_sections_without_paragraphs():
+    for language in ('greek', 'latin'):
+        segmenter = SentenceSegmenter(language, min_length=20, skip_id_notes=False)
+        for text in TRICKY_PARAGRAPHS:
+            assert segmenter.sentences(text) == old_section_sentences(text, language), text
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Check that translation_lookup_ranges and its compatibility view hold the same
+line-to-segment mappings as the per-line translation_lookup table, and that
+the direct range query finds the same segments as the per-line table.
+
+Sizes and latencies: benchmark_translation_lookup_ranges.py.
+"""
+
+import contextlib
+import io
+import tempfile
+from pathlib import Path
+
+from book_line_stats import BookLineStats
+from create_perseus_database import create_translation_lookup_ranges, create_translation_lookup_table
+from perseus_fixtures import (RANGE_LOOKUP_QUERY, add_book, add_segment, build_lookup_corpus,
+                              create_database)
+
+
+def line_mappings(cursor):
+    cursor.execute("SELECT DISTINCT book_id, line_number, segment_id FROM translation_lookup")
+    return set(cursor.fetchall())
+
+
+def test_ranges_match_line_table():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn, book_stats = build_lookup_corpus(Path(tmp) / 'lookup.db', books=6)
+        cursor = conn.cursor()
+        expected = line_mappings(cursor)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_translation_lookup_ranges(conn, replace_lookup_table=True)
+        cursor.execute("SELECT type FROM sqlite_master WHERE name = 'translation_lookup'")
+        assert cursor.fetchone()[0] == 'view'
+        assert line_mappings(cursor) == expected
+
+        # The direct range query finds the same segments for any window that has text lines
+        for book_id in book_stats.books():
+            lines = list(book_stats.line_numbers(book_id))
+            for start in range(0, len(lines), 37):
+                first, last = lines[start], lines[min(start + 20, len(lines) - 1)]
+                by_line = {seg for book, line, seg in expected if book == book_id and first <= line <= last}
+                by_range = {row[0] for row in cursor.execute(RANGE_LOOKUP_QUERY, (book_id, last, first))}
+                assert by_range == by_line, (book_id, first, last)
+        conn.close()
+
+
+def test_ranges_with_non_monotonic_line_numbers():
+    """Line numbers that do not rise with the text_lines ids must not widen a range"""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = create_database(Path(tmp) / 'lookup.db')
+        cursor = conn.cursor()
+        book_stats = BookLineStats()
+        book_id = 'tlg9999.tlg001.1'
+        # Lines 1-3, then 10, then 4-9 (e.g. a transposed passage)
+        add_book(cursor, book_id, (1, 2, 3, 10, 4, 5, 6, 7, 8, 9), book_stats)
+        add_segment(cursor, book_id, 1, 3)
+        add_segment(cursor, book_id, 4, 9)
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_translation_lookup_table(conn, book_stats)
+        # Segment 1 also gets the transposed line 10, whose id follows line 3
+        cursor.execute("DELETE FROM translation_lookup WHERE line_number = 10")
+        cursor.execute("INSERT INTO translation_lookup VALUES (?, 10, 1)", (book_id,))
+        conn.commit()
+        expected = line_mappings(cursor)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_translation_lookup_ranges(conn, replace_lookup_table=True)
+        assert line_mappings(cursor) == expected
+        for first in range(1, 11):
+            for last in range(first, 11):
+                by_line = {seg for _, line, seg in expected if first <= line <= last}
+                by_range = {row[0] for row in cursor.execute(RANGE_LOOKUP_QUERY, (book_id, last, first))}
+                assert by_range == by_line, (first, last)
+        conn.close()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Check that the lxml and ElementTree backends of xml_backend.py give the same
+results for every stage that parses XML: trees and serialized XML, CTS
+metadata, text ingestion, translations, LSJ entries and Wiktionary dump
+pages, on fixture documents with namespaces, comments, processing
+instructions, DTD entities and mixed content.
+
+Per-stage timings of both backends: benchmark_xml_backend.py.
+"""
+
+import contextlib
+import tempfile
+
+import pytest
+
+import xml_backend as ET
+from perseus_fixtures import run_cts, run_ingestion, run_lsj, run_wiktionary, write_xml_fixtures
+
+needs_lxml = pytest.mark.skipif('lxml' not in ET.available_backends(), reason="lxml is not installed")
+
+
+@contextlib.contextmanager
+def backend(name):
+    previous = ET.BACKEND
+    ET.use_backend(name)
+    try:
+        yield
+    finally:
+        ET.use_backend(previous)
+
+
+def tree_shape(element):
+    return [(elem.tag, dict(elem.attrib), elem.text, elem.tail) for elem in element.iter()]
+
+
+@needs_lxml
+def test_trees_and_serialization_match():
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = write_xml_fixtures(tmp)
+        documents = [path for work_dir in fixtures['works'] for path in sorted(work_dir.glob("*.xml"))]
+        results = {}
+        for name in ('etree', 'lxml'):
+            with backend(name):
+                roots = [ET.parse(path).getroot() for path in documents]
+                lsj_text = fixtures['lsj'].read_text(encoding='utf-8').replace('&lpar;', '(').replace(
+                    '&rpar;', ')').replace('&mdash;', '—')
+                roots.append(ET.fromstring(lsj_text))
+                results[name] = ([tree_shape(root) for root in roots],
+                                 [ET.tostring(elem) for root in roots for elem in root.iter()
+                                  if elem.tag.endswith(('}l', 'entry', '}sp'))])
+        assert results['lxml'] == results['etree']
+
+
+@needs_lxml
+def test_stages_match():
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = write_xml_fixtures(tmp)
+        results = {}
+        for name in ('etree', 'lxml'):
+            with backend(name):
+                rows, _, _ = run_ingestion(fixtures['works'], tmp)
+                results[name] = (run_cts(fixtures['cts']), rows, run_lsj(fixtures['lsj']),
+                                 run_wiktionary(fixtures['dump']))
+        cts, rows, lsj, wiktionary = results['etree']
+        # The fixtures exercise every stage
+        assert all(cts) and rows['text_lines'] and rows['translation_segments'] and lsj and wiktionary[1]
+        assert results['lxml'] == results['etree']
+
+
+def test_parse_errors_are_caught():
+    for name in ET.available_backends():
+        with backend(name):
+            with pytest.raises(ET.ParseError):
+                ET.fromstring('<TEI><l>unclosed</TEI>')
+            with pytest.raises(ET.ParseError):
+                ET.fromstring('<TEI>&undefined;</TEI>')
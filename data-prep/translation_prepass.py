@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Header-only prepass for English translation files.
+
+Before process_translations parses a translation it needs the translator and
+the processing strategy (book divisions, prose or drama). The prepass streams
+the file with XMLPullParser: the translator is read from the teiHeader and
+streaming stops at the first book division. Only files without book divisions
+are read to the end, to count paragraphs and lines; the tree is cleared as it
+goes. Results are cached per file (size and mtime) in
+translation_prepass_cache.json, so re-runs skip the prepass. The cache also
+stores a fingerprint of the scan code and is dropped when the code changes.
+
+Usage:
+    python translation_prepass.py [data-sources dir]
+
+prints the translator and strategy of every *eng*.xml file without building
+the database (a dry-run coverage report).
+"""
+
+import json
+import sys
+import xml_backend as ET
+from collections import Counter
+from pathlib import Path
+
+from stage_cache import code_fingerprint
+
+DEFAULT_CACHE_FILE = 'translation_prepass_cache.json'
+
+CHUNK_SIZE = 256 * 1024
+
+# Drama authors: Aeschylus, Sophocles, Euripides, Aristophanes
+DRAMA_AUTHORS = ['tlg0085', 'tlg0011', 'tlg0006', 'tlg0019']
+
+# Names in respStmt that are not the translator
+NON_TRANSLATOR_NAMES = ['lisa cerrato', 'william merrill', 'elli mylonas', 'david smith']
+
+# Common translator mappings based on filenames
+FILENAME_TRANSLATORS = {
+    # Homer
+    'tlg0012.tlg001.perseus-eng3.xml': 'Samuel Butler',
+    'tlg0012.tlg001.perseus-eng4.xml': 'A. T. Murray',
+    'tlg0012.tlg002.perseus-eng3.xml': 'Samuel Butler',
+    'tlg0012.tlg002.perseus-eng4.xml': 'A. T. Murray',
+    # Herodotus
+    'tlg0016.tlg001.perseus-eng2.xml': 'A. D. Godley',
+    # Xenophon
+    'tlg0032.tlg001.perseus-eng2.xml': 'H. G. Dakyns',
+    'tlg0032.tlg002.perseus-eng2.xml': 'H. G. Dakyns',
+    'tlg0032.tlg006.perseus-eng2.xml': 'H. G. Dakyns',
+    'tlg0032.tlg007.perseus-eng2.xml': 'H. G. Dakyns',
+    # Aristotle
+    'tlg0086.tlg003.perseus-eng2.xml': 'Frederic G. Kenyon',
+    'tlg0086.tlg025.perseus-eng2.xml': 'Hugh Tredennick',
+    'tlg0086.tlg010.perseus-eng2.xml': 'Harris Rackham',
+    'tlg0086.tlg038.perseus-eng2.xml': 'John Henry Freese',
+    'tlg0086.tlg034.perseus-eng2.xml': 'William Hamilton Fyfe',
+    'tlg0086.tlg035.perseus-eng2.xml': 'Harris Rackham',
+    'tlg0086.tlg009.perseus-eng2.xml': 'Harris Rackham',
+    'tlg0086.tlg029.perseus-eng2.xml': 'George Cyril Armstrong',
+    'tlg0086.tlg045.perseus-eng2.xml': 'H. Rackham',
+    # Plutarch
+    'tlg0007.tlg051.perseus-eng1.xml': 'Bernadotte Perrin',
+    'tlg0007.tlg052.perseus-eng1.xml': 'Bernadotte Perrin',
+    # Horace
+    'phi0893.phi004.perseus-eng2.xml': 'Christopher Smart'
+}
+
+
+def find_translator(header, filename):
+    """Find the translator in a teiHeader element, falling back to the file name"""
+    translator = None
+
+    # Try multiple locations for translator info
+    # 1. Editor with role="translator"
+    for elem in header.iter():
+        if 'editor' in elem.tag.lower() and elem.get('role') == 'translator':
+            translator = elem.text
+            if translator:
+                translator = translator.strip()
+                break
+
+    # 2. If not found, check respStmt
+    if not translator:
+        for resp in header.iter():
+            if resp.tag.endswith('respStmt'):
+                # Look for resp with "translator" or "trans" in it
+                resp_text = ''.join(resp.itertext()).lower()
+                if 'translat' in resp_text:
+                    # Find the name element
+                    for name in resp.iter():
+                        if name.tag.endswith('name') and name.text:
+                            translator = name.text.strip()
+                            # Filter out non-translator names
+                            if not any(skip in translator.lower() for skip in NON_TRANSLATOR_NAMES):
+                                break
+                if translator:
+                    break
+
+    # 3. Check author elements with translator role
+    if not translator:
+        for elem in header.iter():
+            if elem.tag.endswith('author'):
+                role = elem.get('role', '')
+                if 'trans' in role.lower():
+                    translator = elem.text
+                    if translator:
+                        translator = translator.strip()
+                        break
+
+    # 4. Extract from filename pattern (e.g., perseus-eng3.xml might be Butler)
+    if not translator and 'eng' in filename:
+        if filename in FILENAME_TRANSLATORS:
+            translator = FILENAME_TRANSLATORS[filename]
+        elif 'butler' in filename.lower():
+            translator = 'Samuel Butler'
+        elif 'murray' in filename.lower():
+            translator = 'A. T. Murray'
+        elif 'jowett' in filename.lower():
+            translator = 'Benjamin Jowett'
+
+    return translator
+
+
+def _read_events(xml_path):
+    """Yield XMLPullParser (event, element) pairs, reading the file in chunks"""
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    with open(xml_path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def scan_translation_file(xml_path):
+    """Return translator, has_books and p/l element counts for a translation file
+
+    Stops reading at the first textpart div with subtype book; p_count and
+    l_count are only complete when has_books is False (they are only used then).
+    """
+    xml_path = Path(xml_path)
+    translator = None
+    has_books = False
+    p_count = l_count = 0
+    in_header = False
+
+    for event, elem in _read_events(xml_path):
+        tag = elem.tag
+        if event == 'start':
+            if tag.endswith('p'):
+                p_count += 1
+            if tag.endswith('l'):
+                l_count += 1
+            if tag.endswith('teiHeader'):
+                in_header = True
+            elif (tag.endswith('div') and
+                  elem.get('type') == 'textpart' and
+                  elem.get('subtype', '').lower() == 'book'):
+                has_books = True
+                break
+        elif tag.endswith('teiHeader'):
+            translator = find_translator(elem, xml_path.name)
+            in_header = False
+            elem.clear()
+        elif not in_header:
+            # Only the header is needed as a tree
+            elem.clear()
+
+    if translator is None:
+        # No teiHeader: the file name mapping can still apply
+        translator = find_translator(ET.Element('teiHeader'), xml_path.name)
+
+    return {
+        'translator': translator,
+        'has_books': has_books,
+        'p_count': p_count,
+        'l_count': l_count,
+    }
+
+
+def choose_strategy(scan, work_id):
+    """Return 'books', 'prose' or 'drama' for a scanned translation file"""
+    # If it has books, it's epic poetry (Homer, Virgil, etc) - use regular processing
+    if scan['has_books']:
+        return 'books'
+
+    # If there are many more paragraphs than lines, it's prose (even if it has some verse quotations)
+    p_count, l_count = scan['p_count'], scan['l_count']
+    if p_count > 0 and p_count > (l_count * 2):
+        return 'prose'
+    if work_id.split('.')[0] in DRAMA_AUTHORS:
+        return 'drama'
+    return 'books'
+
+
+class TranslationPrepassCache:
+    """scan_translation_file results keyed by file path, size and mtime, and the scan code"""
+
+    def __init__(self, cache_file=DEFAULT_CACHE_FILE):
+        self.cache_file = Path(cache_file)
+        self.scan_version = code_fingerprint([scan_translation_file, find_translator])
+        self.entries = {}
+        self.dirty = False
+        self.hits = self.misses = 0
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('scan_version') == self.scan_version:
+                    self.entries = data.get('files', {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable translation prepass cache {self.cache_file}: {e}")
+
+    def scan(self, xml_path):
+        """Return the cached scan of xml_path, scanning it if new or changed"""
+        xml_path = Path(xml_path)
+        stat = xml_path.stat()
+        key = str(xml_path.resolve())
+        entry = self.entries.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            self.hits += 1
+            return entry['scan']
+
+        self.misses += 1
+        scan = scan_translation_file(xml_path)
+        self.entries[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'scan': scan}
+        self.dirty = True
+        return scan
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp_file = self.cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'scan_version': self.scan_version, 'files': self.entries}, f, ensure_ascii=False)
+        tmp_file.replace(self.cache_file)
+        self.dirty = False
+
+
+def coverage_report(data_sources, cache):
+    """Print translator and strategy for every translation file under data_sources"""
+    strategies = Counter()
+    unknown = 0
+    files = sorted(xml_path
+                   for corpus in ("canonical-greekLit", "canonical-latinLit")
+                   for xml_path in Path(data_sources).glob(f"{corpus}/data/*/*/*eng*.xml"))
+    print(f"=== TRANSLATION PREPASS: {len(files)} files ===")
+    for xml_path in files:
+        work_id = f"{xml_path.parent.parent.name}.{xml_path.parent.name}"
+        try:
+            scan = cache.scan(xml_path)
+        except ET.ParseError as e:
+            print(f"  ✗ {xml_path.name}: {e}")
+            continue
+        strategy = choose_strategy(scan, work_id)
+        strategies[strategy] += 1
+        if not scan['translator']:
+            unknown += 1
+        print(f"  {xml_path.name:<45} {strategy:<6} {scan['translator'] or 'Unknown'}")
+
+    print(f"\nStrategies: " + ', '.join(f"{name} {count}" for name, count in sorted(strategies.items())))
+    print(f"Translator not found: {unknown}")
+    print(f"Cache: {cache.hits} hits, {cache.misses} scanned")
+
+
+if __name__ == '__main__':
+    script_dir = Path(__file__).parent
+    data_sources = Path(sys.argv[1]) if len(sys.argv) > 1 else script_dir.parent / "data-sources"
+    cache = TranslationPrepassCache(script_dir / DEFAULT_CACHE_FILE)
+    coverage_report(data_sources, cache)
+    cache.save()
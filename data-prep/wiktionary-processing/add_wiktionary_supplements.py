@@ -6,6 +6,11 @@ but appear in our texts. This creates a supplemental dictionary.
 
 import sqlite3
 import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dictionary_merge import merge_dictionary_entries, merge_lemma_mappings
 
 # Manually curated Wiktionary definitions for important missing words
 # In production, these would be extracted from Wiktionary XML
@@ -84,33 +89,7 @@ def add_to_database(db_path='perseus_texts.db'):
     cursor.execute("SELECT COUNT(*) FROM dictionary_entries WHERE source = 'wiktionary'")
     before_count = cursor.fetchone()[0]
     
-    added = 0
-    for entry in WIKTIONARY_SUPPLEMENTS:
-        # Check if already exists
-        cursor.execute("""
-            SELECT COUNT(*) FROM dictionary_entries 
-            WHERE headword_normalized = ? AND language = ?
-        """, (entry['headword_normalized'], entry['language']))
-        
-        if cursor.fetchone()[0] == 0:
-            # Add the entry
-            cursor.execute("""
-                INSERT INTO dictionary_entries 
-                (headword, headword_normalized, language, entry_xml, entry_html, entry_plain, source)
-                VALUES (?, ?, ?, NULL, ?, ?, ?)
-            """, (
-                entry['headword'],
-                entry['headword_normalized'],
-                entry['language'],
-                entry['entry_html'],
-                entry['entry_plain'],
-                entry['source']
-            ))
-            added += 1
-            print(f"Added: {entry['headword']}")
-        else:
-            print(f"Skipped (already exists): {entry['headword']}")
-    
+    counts = merge_dictionary_entries(cursor, WIKTIONARY_SUPPLEMENTS)
     conn.commit()
     
     # Verify
@@ -119,25 +98,23 @@ def add_to_database(db_path='perseus_texts.db'):
     
     print(f"\nSummary:")
     print(f"  Before: {before_count} Wiktionary entries")
-    print(f"  Added: {added} new entries")
+    print(f"  Added: {counts['added']} new entries")
+    print(f"  Updated: {counts['updated']} existing entries")
+    print(f"  Skipped: {counts['skipped']} (in LSJ or unchanged)")
     print(f"  After: {after_count} Wiktionary entries")
     
-    # Also update lemma_map for words that are their own lemma
+    # Also add lemma_map entries for words that are their own lemma, keeping existing mappings
     print("\nUpdating lemma_map for self-lemmas...")
-    for entry in WIKTIONARY_SUPPLEMENTS:
-        headword_norm = entry['headword_normalized']
-        cursor.execute("""
-            INSERT OR IGNORE INTO lemma_map 
-            (word_form, word_normalized, lemma, confidence, source)
-            VALUES (?, ?, ?, 1.0, 'wiktionary:lemma')
-        """, (headword_norm, headword_norm, headword_norm))
+    counts = merge_lemma_mappings(cursor, (
+        {'word_form': entry['headword_normalized'], 'lemma': entry['headword_normalized']}
+        for entry in WIKTIONARY_SUPPLEMENTS
+    ), source='wiktionary:lemma', replace_low_confidence=False)
+    print(f"  Added: {counts['added']}, updated: {counts['updated']}, skipped: {counts['skipped']}")
     
     conn.commit()
     conn.close()
 
 def main():
-    import sys
-    
     if len(sys.argv) > 1 and sys.argv[1] == '--execute':
         add_to_database()
     else:
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Compare pages/second of plain single-stream bz2 reading with the parallel
+multistream reader on a generated Wiktionary-style dump.
+
+Usage:
+    python benchmark_multistream_reader.py [pages] [workers]
+"""
+
+import sys
+import tempfile
+import time
+
+from wiktionary_dump import iter_pages, iter_pages_multistream
+from wiktionary_fixtures import write_fixture
+
+
+def run_benchmark(page_count=50000, workers=None):
+    """Report pages/second for single-stream bz2 vs the multistream pool"""
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Generating {page_count:,}-page fixture...")
+        single_path, multi_path, index_path = write_fixture(tmp, page_count)
+
+        start = time.time()
+        single_count = sum(1 for _ in iter_pages(single_path))
+        single_elapsed = time.time() - start
+
+        start = time.time()
+        multi_count = sum(1 for _ in iter_pages_multistream(multi_path, index_path, workers))
+        multi_elapsed = time.time() - start
+
+    print(f"\n{'Reader':<28} {'Pages':>10} {'Seconds':>9} {'Pages/s':>10}")
+    print("-" * 60)
+    print(f"{'single-stream bz2.open':<28} {single_count:>10,} {single_elapsed:>9.2f} {single_count / single_elapsed:>10,.0f}")
+    print(f"{'multistream process pool':<28} {multi_count:>10,} {multi_elapsed:>9.2f} {multi_count / multi_elapsed:>10,.0f}")
+    print(f"\nSpeedup: {single_elapsed / multi_elapsed:.1f}x")
+
+
+def main():
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    print("=== MULTISTREAM READER BENCHMARK ===")
+    run_benchmark(page_count, workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Compare pages/second of the plain iterparse loop with the byte-level page
+prefilter on a generated Wiktionary-style dump.
+
+Usage:
+    python benchmark_page_prefilter.py [pages]
+"""
+
+import sys
+import tempfile
+import time
+
+from wiktionary_dump import iter_pages
+from wiktionary_fixtures import GREEK_SECTION, is_candidate, write_fixture
+
+
+def run_benchmark(page_count=100000):
+    """Report pages/second for the iterparse loop vs the byte prefilter"""
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Generating {page_count:,}-page fixture...")
+        single_path, _, _ = write_fixture(tmp, page_count)
+
+        start = time.time()
+        iterparse_hits = sum(1 for title, text in iter_pages(single_path) if is_candidate(title, text))
+        iterparse_elapsed = time.time() - start
+
+        start = time.time()
+        prefilter_hits = sum(1 for title, text in iter_pages(single_path, prefilter=GREEK_SECTION)
+                             if is_candidate(title, text))
+        prefilter_elapsed = time.time() - start
+
+    assert iterparse_hits == prefilter_hits
+    print(f"\n{'Reader':<28} {'Candidates':>10} {'Seconds':>9} {'Pages/s':>10}")
+    print("-" * 60)
+    print(f"{'iterparse every page':<28} {iterparse_hits:>10,} {iterparse_elapsed:>9.2f} {page_count / iterparse_elapsed:>10,.0f}")
+    print(f"{'byte prefilter':<28} {prefilter_hits:>10,} {prefilter_elapsed:>9.2f} {page_count / prefilter_elapsed:>10,.0f}")
+    print(f"\nSpeedup: {iterparse_elapsed / prefilter_elapsed:.1f}x")
+
+
+def main():
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    print("=== PAGE PREFILTER BENCHMARK ===")
+    run_benchmark(page_count)
+
+
+if __name__ == "__main__":
+    main()
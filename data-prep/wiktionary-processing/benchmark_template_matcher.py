@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Compare pages/second of the per-pattern re.findall loop with the single-scan
+TemplateMatcher.
+
+Runs on synthetic Ancient Greek entries, or on the real pages of a Greek
+pages cache when one is given.
+
+Usage:
+    python benchmark_template_matcher.py [all_greek_wiktionary_pages.db]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from wikitext_templates import extract_lemma_from_template
+from wiktionary_fixtures import FORM_ENTRY, LEMMA_ENTRY, findall_per_pattern, load_pages
+
+
+def run_benchmark(pages):
+    """Report pages/second for the per-pattern loop vs the TemplateMatcher"""
+    rounds = max(1, 200000 // len(pages))
+
+    start = time.time()
+    for _ in range(rounds):
+        expected = [findall_per_pattern(text) for text in pages]
+    findall_elapsed = time.time() - start
+
+    start = time.time()
+    for _ in range(rounds):
+        found = [extract_lemma_from_template(text) for text in pages]
+    matcher_elapsed = time.time() - start
+
+    assert found == expected
+    total = len(pages) * rounds
+    print(f"\n{'Matcher':<28} {'Pages':>10} {'Seconds':>9} {'Pages/s':>10}")
+    print("-" * 60)
+    print(f"{'re.findall per pattern':<28} {total:>10,} {findall_elapsed:>9.2f} {total / findall_elapsed:>10,.0f}")
+    print(f"{'TemplateMatcher':<28} {total:>10,} {matcher_elapsed:>9.2f} {total / matcher_elapsed:>10,.0f}")
+    print(f"\nSpeedup: {findall_elapsed / matcher_elapsed:.1f}x")
+
+
+def main():
+    cache_file = sys.argv[1] if len(sys.argv) > 1 else None
+    if cache_file and not Path(cache_file).exists():
+        print(f"Error: Greek pages cache not found at {cache_file}")
+        sys.exit(1)
+
+    print("=== TEMPLATE MATCHER BENCHMARK ===")
+    if cache_file:
+        pages = load_pages(cache_file, ancient_greek=True)
+        print(f"Benchmarking on {len(pages):,} Ancient Greek pages from {cache_file}")
+    else:
+        # Roughly the lemma / non-lemma mix of Ancient Greek entries
+        pages = [LEMMA_ENTRY] * 6 + [FORM_ENTRY] * 4
+        print("Benchmarking on synthetic Ancient Greek entries")
+    run_benchmark(pages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Compare pages/second of the section / POS / definition regexes the
+extractors used before with WikitextOutline, for one extractor alone and for
+three extractors reading the same page.
+
+Runs on synthetic Greek entries, or on the real pages of a Greek pages cache
+when one is given.
+
+Usage:
+    python benchmark_wikitext_outline.py [all_greek_wiktionary_pages.db]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from wiktionary_fixtures import (FORM_ENTRY, LARGE_ENTRY, LEMMA_ENTRY, load_pages, regex_outline,
+                                 single_scan_outline)
+
+
+def time_lookups(lookup, pages, rounds, extractors):
+    """Run lookup once per extractor on every page, like the multiplexer does"""
+    start = time.time()
+    for _ in range(rounds):
+        for text in pages:
+            # A fresh str per page, as the dump reader yields
+            text = text[:1] + text[1:]
+            for _ in range(extractors):
+                lookup(text)
+    return time.time() - start
+
+
+def run_benchmark(pages):
+    """Report pages/second for the regex lookups vs WikitextOutline, for one
+    extractor alone and for three extractors reading the same page"""
+    rounds = max(1, 100000 // len(pages))
+
+    mismatches = sum(1 for text in pages if single_scan_outline(text) != regex_outline(text))
+    total = len(pages) * rounds
+    print(f"\n{'Parser':<36} {'Pages':>10} {'Seconds':>9} {'Pages/s':>10}")
+    print("-" * 68)
+    for extractors in (1, 3):
+        regex_elapsed = time_lookups(regex_outline, pages, rounds, extractors)
+        outline_elapsed = time_lookups(single_scan_outline, pages, rounds, extractors)
+        print(f"{f'section/POS/line regexes x{extractors}':<36} {total:>10,} {regex_elapsed:>9.2f} {total / regex_elapsed:>10,.0f}")
+        print(f"{f'WikitextOutline (shared) x{extractors}':<36} {total:>10,} {outline_elapsed:>9.2f} {total / outline_elapsed:>10,.0f}")
+        print(f"{'':<36} Speedup: {regex_elapsed / outline_elapsed:.1f}x")
+    if mismatches:
+        # Malformed headings (e.g. "===Noun==" or "== Greek ==") are read as MediaWiki reads them
+        print(f"⚠️  {mismatches:,} of {len(pages):,} pages outline differently from the regexes")
+
+
+def main():
+    cache_file = sys.argv[1] if len(sys.argv) > 1 else None
+    if cache_file and not Path(cache_file).exists():
+        print(f"Error: Greek pages cache not found at {cache_file}")
+        sys.exit(1)
+
+    print("=== WIKITEXT OUTLINE BENCHMARK ===")
+    if cache_file:
+        pages = load_pages(cache_file)
+        print(f"Benchmarking on {len(pages):,} Greek pages from {cache_file}")
+    else:
+        pages = [LEMMA_ENTRY] * 6 + [FORM_ENTRY] * 4 + [LARGE_ENTRY]
+        print("Benchmarking on synthetic Greek entries")
+    run_benchmark(pages)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,9 @@ from collections import defaultdict
 from pathlib import Path
 from datetime import datetime
 
+from greek_pages_cache import DEFAULT_CACHE_FILE, GreekPagesCache
+from wikitext_templates import extract_lemma_from_template
+
 def normalize_greek(text):
     """Normalize Greek text by removing diacritics, punctuation, and converting to lowercase"""
     if not text:
@@ -31,54 +34,6 @@ def normalize_greek(text):
     text = ''.join(c for c in text if c.isalpha() and ('\u0370' <= c <= '\u03ff' or '\u1f00' <= c <= '\u1fff'))
     return text
 
-def extract_lemma_from_template(template_text):
-    """Extract lemma from various inflection templates"""
-    lemmas = []
-    
-    # Common patterns for lemma extraction from inflection templates
-    patterns = [
-        # {{inflection of|grc|LEMMA|...}}
-        r'\{\{inflection of\|grc\|([^|{}]+)\|',
-        # {{form of|TYPE|grc|LEMMA}}
-        r'\{\{form of\|[^|]+\|grc\|([^|{}]+)\}\}',
-        # {{grc-form of|LEMMA|...}}
-        r'\{\{grc-form of\|([^|{}]+)[|}]',
-        # Specific form templates
-        r'\{\{plural of\|grc\|([^|{}]+)\}\}',
-        r'\{\{genitive of\|grc\|([^|{}]+)\}\}',
-        r'\{\{dative of\|grc\|([^|{}]+)\}\}',
-        r'\{\{accusative of\|grc\|([^|{}]+)\}\}',
-        r'\{\{vocative of\|grc\|([^|{}]+)\}\}',
-        r'\{\{nominative plural of\|grc\|([^|{}]+)\}\}',
-        r'\{\{genitive plural of\|grc\|([^|{}]+)\}\}',
-        # Verb forms
-        r'\{\{aorist of\|grc\|([^|{}]+)\}\}',
-        r'\{\{present of\|grc\|([^|{}]+)\}\}',
-        r'\{\{imperfect of\|grc\|([^|{}]+)\}\}',
-        r'\{\{future of\|grc\|([^|{}]+)\}\}',
-        r'\{\{perfect of\|grc\|([^|{}]+)\}\}',
-        # Epic/Ionic/Doric/etc forms
-        r'\{\{epic form of\|grc\|([^|{}]+)\}\}',
-        r'\{\{ionic form of\|grc\|([^|{}]+)\}\}',
-        r'\{\{doric form of\|grc\|([^|{}]+)\}\}',
-        r'\{\{aeolic form of\|grc\|([^|{}]+)\}\}',
-        # Alternative spellings
-        r'\{\{alternative form of\|grc\|([^|{}]+)\}\}',
-        r'\{\{alternative spelling of\|grc\|([^|{}]+)\}\}',
-        r'\{\{obsolete form of\|grc\|([^|{}]+)\}\}',
-        r'\{\{archaic form of\|grc\|([^|{}]+)\}\}',
-        # Participles
-        r'\{\{present participle of\|grc\|([^|{}]+)\}\}',
-        r'\{\{past participle of\|grc\|([^|{}]+)\}\}',
-        r'\{\{participle of\|grc\|([^|{}]+)\}\}',
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, template_text)
-        lemmas.extend(matches)
-    
-    return lemmas
-
 def extract_pos_and_definition(content):
     """Extract part of speech and definition from entry content"""
     pos_patterns = {
@@ -114,10 +69,6 @@ def extract_pos_and_definition(content):
     
     return pos_found, definition
 
-def is_ancient_greek_entry(content):
-    """Check if the entry contains Ancient Greek content"""
-    return '==Ancient Greek==' in content
-
 def extract_all_greek_words(cache_path, output_path):
     """Extract all Ancient Greek words including standalone lemmas"""
     print(f"=== ENHANCED ANCIENT GREEK WORD EXTRACTION ===")
@@ -125,11 +76,10 @@ def extract_all_greek_words(cache_path, output_path):
     print(f"Output: {output_path}")
     print()
     
-    # Load cached data
-    print("Loading cached Wiktionary data...")
-    with open(cache_path, 'r', encoding='utf-8') as f:
-        all_pages = json.load(f)
-    print(f"Loaded {len(all_pages):,} pages")
+    # Open cached data; only Ancient Greek pages are read
+    print("Opening cached Wiktionary data...")
+    cache = GreekPagesCache(cache_path)
+    print(f"Cache holds {len(cache):,} pages")
     
     # Results storage
     all_mappings = {}  # word -> lemma info
@@ -137,10 +87,7 @@ def extract_all_greek_words(cache_path, output_path):
     stats = defaultdict(int)
     
     # Process each page
-    for word, content in all_pages.items():
-        if not is_ancient_greek_entry(content):
-            continue
-            
+    for word, content in cache.iter_pages(ancient_greek=True):
         stats['ancient_greek_entries'] += 1
         normalized_word = normalize_greek(word)
         
@@ -186,6 +133,8 @@ def extract_all_greek_words(cache_path, output_path):
                         'original_form': word
                     }
     
+    cache.close()
+    
     # Print statistics
     print("\n=== EXTRACTION STATISTICS ===")
     print(f"Ancient Greek entries processed: {stats['ancient_greek_entries']:,}")
@@ -249,7 +198,7 @@ def extract_all_greek_words(cache_path, output_path):
     return output_data, standalone_lemmas
 
 if __name__ == "__main__":
-    cache_path = Path("all_greek_wiktionary_pages.json")
+    cache_path = Path(DEFAULT_CACHE_FILE)
     output_path = Path("ancient_greek_complete_morphology.json")
     
     if not cache_path.exists():
@@ -5,15 +5,27 @@ This is a comprehensive extraction that will take several hours.
 """
 
 import json
-import bz2
-import xml.etree.ElementTree as ET
+import os
 import re
 import sqlite3
+import sys
 import unicodedata
 import time
 from datetime import datetime
 from pathlib import Path
 
+from wikitext_outline import POS_TITLES, outline_for
+from wiktionary_dump import PagePrefilter, iter_pages_resumable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dictionary_merge import merge_dictionary_entries
+
+ENTRIES_FILE = 'wiktionary_definitions.jsonl'
+STATUS_FILE = 'extraction_status.json'
+
+# Record the resume point this often (pages)
+CHECKPOINT_PAGES = 10000
+
 def normalize_greek(text):
     """Normalize Greek text - same as in main database creation"""
     text = unicodedata.normalize('NFD', text)
@@ -27,41 +39,42 @@ def extract_wiktionary_definition(title, text, normalized_title):
     """Extract a concise definition from Wiktionary page text"""
     
     # Look for Ancient Greek section
-    ag_match = re.search(r'==Ancient Greek==.*?(?=\n==[^=]|\Z)', text, re.DOTALL)
-    if not ag_match:
+    outline = outline_for(text)
+    ag_section = outline.language('Ancient Greek')
+    if not ag_section:
         return None
     
-    ag_section = ag_match.group(0)
-    
     # Find part of speech
-    pos_match = re.search(r'===(Noun|Verb|Adjective|Pronoun|Particle|Adverb|Preposition|Conjunction|Numeral|Interjection|Proper noun)===', ag_section)
-    if not pos_match:
+    pos_section = outline.find(ag_section, POS_TITLES)
+    if pos_section:
+        pos = pos_section.heading.title.lower()
+        definitions_start = pos_section.start
+    else:
         # Try alternative format
-        pos_match = re.search(r'{{head\|grc\|(noun|verb|adjective|pronoun|particle|adverb|preposition|conjunction|numeral|interjection|proper noun)', ag_section)
+        pos_match = re.search(r'{{head\|grc\|(noun|verb|adjective|pronoun|particle|adverb|preposition|conjunction|numeral|interjection|proper noun)',
+                              outline.section_text(ag_section))
         if not pos_match:
             return None
-    
-    pos = pos_match.group(1).lower()
+        pos = pos_match.group(1).lower()
+        definitions_start = ag_section.start + pos_match.end()
     
     # Extract first few definitions
     definitions = []
-    definition_section = ag_section[pos_match.end():]
     
-    for line in definition_section.split('\n'):
-        if line.startswith('# ') and not line.startswith('##'):
-            # Clean the definition
-            defn = line[2:].strip()
-            
-            # Remove wiki markup
-            defn = re.sub(r'\[\[([^|\]]+)\|([^\]]+)\]\]', r'\2', defn)
-            defn = re.sub(r'\[\[([^\]]+)\]\]', r'\1', defn)
-            defn = re.sub(r"'''?", '', defn)
-            defn = re.sub(r'\{\{[^}]+\}\}', '', defn)
-            defn = re.sub(r'\([^)]*\)', '', defn).strip()
+    for line in outline.definitions(definitions_start, ag_section.end):
+        # Clean the definition
+        defn = line.strip()
+        
+        # Remove wiki markup
+        defn = re.sub(r'\[\[([^|\]]+)\|([^\]]+)\]\]', r'\2', defn)
+        defn = re.sub(r'\[\[([^\]]+)\]\]', r'\1', defn)
+        defn = re.sub(r"'''?", '', defn)
+        defn = re.sub(r'\{\{[^}]+\}\}', '', defn)
+        defn = re.sub(r'\([^)]*\)', '', defn).strip()
+        
+        if defn and len(defn) > 3:
+            definitions.append(defn)
             
-            if defn and len(defn) > 3:
-                definitions.append(defn)
-                
         if len(definitions) >= 2:  # Limit to 2 definitions for space
             break
     
@@ -92,103 +105,208 @@ def extract_wiktionary_definition(title, text, normalized_title):
         'source': 'wiktionary'
     }
 
-def process_wiktionary_comprehensive(dump_file, words_file, output_dir):
-    """Process entire Wiktionary dump for all corpus words"""
-    
-    # Load target words
-    with open(words_file, 'r', encoding='utf-8') as f:
-        corpus_words = json.load(f)
-    
-    target_set = set(corpus_words.keys())
-    print(f"Looking for {len(target_set):,} unique Greek words in Wiktionary")
+class CorpusDefinitionsExtractor:
+    """Collects Ancient Greek definitions for every corpus word found in the dump
+
+    Each entry is appended to wiktionary_definitions.jsonl as soon as it is
+    found, and extraction_status.json records how far the run got (and in
+    which dump, as the resume offset depends on its layout), so an
+    interrupted run can be resumed (resume=True) instead of starting over.
+    """
+    
+    dump = 'en'
+    # Corpus words are Greek, and only Ancient Greek entries are used
+    prefilter = PagePrefilter(['==Ancient Greek==', '== Ancient Greek =='], greek_title=True)
+    
+    def __init__(self, words_file, output_dir, resume=False, dump_file=None):
+        # Load target words
+        with open(words_file, 'r', encoding='utf-8') as f:
+            self.corpus_words = json.load(f)
+        
+        self.target_set = set(self.corpus_words.keys())
+        print(f"Looking for {len(self.target_set):,} unique Greek words in Wiktionary")
+        
+        self.output_dir = output_dir
+        self.dump_file = dump_file
+        self.found_entries = {}
+        self.processed_pages = 0
+        self.resume_offset = 0
+        self.resume_pages = 0
+        self.start_time = time.time()
+        
+        # Create output directory
+        Path(output_dir).mkdir(exist_ok=True)
+        self.entries_file = Path(output_dir) / ENTRIES_FILE
+        self.status_file = Path(output_dir) / STATUS_FILE
+        
+        if resume:
+            self._load_checkpoint()
+        else:
+            self.entries_file.unlink(missing_ok=True)
+        
+        # Line buffered: every entry reaches the file as soon as it is found
+        self.entries_out = open(self.entries_file, 'a', encoding='utf-8', buffering=1)
     
-    namespace = {'ns': 'http://www.mediawiki.org/xml/export-0.11/'}
-    found_entries = {}
-    processed_pages = 0
-    start_time = time.time()
+    def _load_checkpoint(self):
+        status = read_status(self.output_dir)
+        if status is None:
+            print("No checkpoint found, starting from the beginning")
+            return
+        
+        self.found_entries = load_entries(self.entries_file)
+        self.target_set.difference_update(self.found_entries)
+        self.resume_offset = status['resume_offset']
+        self.resume_pages = self.processed_pages = status['resume_pages']
+        print(f"Resuming at page {self.processed_pages:,} (offset {self.resume_offset:,}) "
+              f"with {len(self.found_entries):,} entries already found")
+    
+    def process_page(self, title, text):
+        self.processed_pages += 1
+        
+        if title is not None and text is not None:
+            self._extract(title, text)
+        
+        # Status update every 10,000 pages
+        if self.processed_pages % 10000 == 0:
+            print(f"  Processed {self.processed_pages:,} Wiktionary pages...")
+    
+    def checkpoint(self, resume_offset, resume_pages, state='running'):
+        """Record that the resume_pages pages before resume_offset are done"""
+        self.resume_offset = resume_offset
+        self.resume_pages = resume_pages
+        self.entries_out.flush()
+        write_status(self.output_dir, {
+            'state': state,
+            'dump_file': str(self.dump_file) if self.dump_file else None,
+            'pages_processed': self.processed_pages,
+            'resume_offset': resume_offset,
+            'resume_pages': resume_pages,
+            'entries_found': len(self.found_entries),
+            'words_remaining': len(self.target_set),
+            'updated': datetime.now().isoformat(timespec='seconds'),
+        })
+    
+    def _extract(self, title, text):
+        found_entries = self.found_entries
+        target_set = self.target_set
+        
+        # Skip non-main namespace
+        if ':' in title and not title.startswith('Reconstruction:'):
+            return
+        
+        # Check if Greek word
+        normalized_title = normalize_greek(title)
+        
+        if normalized_title in target_set:
+            if '==Ancient Greek==' in text or '== Ancient Greek ==' in text:
+                entry = extract_wiktionary_definition(title, text, normalized_title)
+                if entry:
+                    found_entries[normalized_title] = entry
+                    self.entries_out.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                    
+                    # Remove from target set
+                    target_set.remove(normalized_title)
+                    
+                    # Progress update
+                    if len(found_entries) % 100 == 0:
+                        elapsed = time.time() - self.start_time
+                        rate = len(found_entries) / elapsed
+                        remaining = len(target_set) / rate if rate > 0 else 0
+                        
+                        print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Progress:")
+                        print(f"  Found: {len(found_entries):,} entries")
+                        print(f"  Remaining: {len(target_set):,} words")
+                        print(f"  Rate: {rate:.1f} entries/second")
+                        print(f"  Est. remaining: {remaining/3600:.1f} hours")
+    
+    def finish(self):
+        found_entries = self.found_entries
+        output_dir = self.output_dir
+        
+        # Save final results
+        final_file = f"{output_dir}/wiktionary_definitions_final.json"
+        with open(final_file, 'w', encoding='utf-8') as f:
+            json.dump(found_entries, f, ensure_ascii=False, indent=2)
+        
+        self.checkpoint(self.resume_offset, self.resume_pages, state='complete')
+        self.entries_out.close()
+        
+        # Summary
+        elapsed_total = time.time() - self.start_time
+        print(f"\n{'='*60}")
+        print(f"EXTRACTION COMPLETE")
+        print(f"{'='*60}")
+        print(f"Total time: {elapsed_total/3600:.1f} hours")
+        print(f"Pages processed: {self.processed_pages:,}")
+        print(f"Entries found: {len(found_entries):,}")
+        print(f"Success rate: {len(found_entries)/len(self.corpus_words)*100:.1f}%")
+        print(f"Final output: {final_file}")
+        
+        # Save list of words not found
+        not_found = sorted(self.target_set)
+        with open(f"{output_dir}/words_not_found.json", 'w', encoding='utf-8') as f:
+            json.dump(not_found, f, ensure_ascii=False, indent=2)
+        print(f"Words not found: {len(not_found):,} (saved to words_not_found.json)")
+
+def read_status(output_dir):
+    """Return the extraction status dict, or None if no run has been recorded"""
+    status_file = Path(output_dir) / STATUS_FILE
+    if not status_file.exists():
+        return None
+    with open(status_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_status(output_dir, status):
+    # Write then rename so a reader never sees a half-written file
+    status_file = Path(output_dir) / STATUS_FILE
+    tmp_file = status_file.with_suffix('.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(status, f, indent=2)
+    os.replace(tmp_file, status_file)
+
+def load_entries(entries_file):
+    """Read the entries appended so far, dropping a line cut off by a crash"""
+    entries = {}
+    if not Path(entries_file).exists():
+        return entries
+    
+    good_bytes = 0
+    with open(entries_file, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            entry = json.loads(line)
+            entries[entry['headword_normalized']] = entry
+            good_bytes += len(line)
+    
+    # Later appends must start on a fresh line
+    with open(entries_file, 'r+b') as f:
+        f.truncate(good_bytes)
+    return entries
+
+def process_wiktionary_comprehensive(dump_file, words_file, output_dir, resume=False):
+    """Process entire Wiktionary dump for all corpus words"""
     
-    # Create output directory
-    Path(output_dir).mkdir(exist_ok=True)
+    extractor = CorpusDefinitionsExtractor(words_file, output_dir, resume, dump_file)
     
     print(f"\nProcessing Wiktionary dump: {dump_file}")
     print("This will take several hours...")
     
-    with bz2.open(dump_file, 'rt', encoding='utf-8') as f:
-        for event, elem in ET.iterparse(f, events=('start', 'end')):
-            if event == 'end' and elem.tag.endswith('page'):
-                processed_pages += 1
-                
-                title_elem = elem.find('.//ns:title', namespace)
-                text_elem = elem.find('.//ns:text', namespace)
-                
-                if title_elem is not None and text_elem is not None:
-                    title = title_elem.text
-                    
-                    # Skip non-main namespace
-                    if ':' in title and not title.startswith('Reconstruction:'):
-                        elem.clear()
-                        continue
-                    
-                    # Check if Greek word
-                    normalized_title = normalize_greek(title)
-                    
-                    if normalized_title in target_set:
-                        text = text_elem.text or ''
-                        
-                        if '==Ancient Greek==' in text or '== Ancient Greek ==' in text:
-                            entry = extract_wiktionary_definition(title, text, normalized_title)
-                            if entry:
-                                found_entries[normalized_title] = entry
-                                
-                                # Remove from target set
-                                target_set.remove(normalized_title)
-                                
-                                # Progress update
-                                if len(found_entries) % 100 == 0:
-                                    elapsed = time.time() - start_time
-                                    rate = len(found_entries) / elapsed
-                                    remaining = len(target_set) / rate if rate > 0 else 0
-                                    
-                                    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Progress:")
-                                    print(f"  Found: {len(found_entries):,} entries")
-                                    print(f"  Remaining: {len(target_set):,} words")
-                                    print(f"  Rate: {rate:.1f} entries/second")
-                                    print(f"  Est. remaining: {remaining/3600:.1f} hours")
-                                
-                                # Save checkpoint every 1000 entries
-                                if len(found_entries) % 1000 == 0:
-                                    checkpoint_file = f"{output_dir}/wiktionary_checkpoint_{len(found_entries)}.json"
-                                    with open(checkpoint_file, 'w', encoding='utf-8') as out:
-                                        json.dump(found_entries, out, ensure_ascii=False, indent=2)
-                                    print(f"  Saved checkpoint: {checkpoint_file}")
-                
-                elem.clear()
-                
-                # Status update every 10,000 pages
-                if processed_pages % 10000 == 0:
-                    print(f"  Processed {processed_pages:,} Wiktionary pages...")
-    
-    # Save final results
-    final_file = f"{output_dir}/wiktionary_definitions_final.json"
-    with open(final_file, 'w', encoding='utf-8') as f:
-        json.dump(found_entries, f, ensure_ascii=False, indent=2)
-    
-    # Summary
-    elapsed_total = time.time() - start_time
-    print(f"\n{'='*60}")
-    print(f"EXTRACTION COMPLETE")
-    print(f"{'='*60}")
-    print(f"Total time: {elapsed_total/3600:.1f} hours")
-    print(f"Pages processed: {processed_pages:,}")
-    print(f"Entries found: {len(found_entries):,}")
-    print(f"Success rate: {len(found_entries)/len(corpus_words)*100:.1f}%")
-    print(f"Final output: {final_file}")
-    
-    # Save list of words not found
-    not_found = sorted(target_set)
-    with open(f"{output_dir}/words_not_found.json", 'w', encoding='utf-8') as f:
-        json.dump(not_found, f, ensure_ascii=False, indent=2)
-    print(f"Words not found: {len(not_found):,} (saved to words_not_found.json)")
+    pages = iter_pages_resumable(dump_file, extractor.resume_offset,
+                                 prefilter=CorpusDefinitionsExtractor.prefilter)
+    last_offset = None
+    for title, text, resume_offset in pages:
+        # Pages already processed when reading from resume_offset starts
+        if resume_offset != last_offset:
+            last_offset = resume_offset
+            pages_before_offset = extractor.processed_pages
+        
+        extractor.process_page(title, text)
+        
+        if extractor.processed_pages % CHECKPOINT_PAGES == 0:
+            extractor.checkpoint(resume_offset, pages_before_offset)
+    
+    extractor.finish()
 
 def add_to_database(definitions_file, db_path='../perseus_texts.db'):
     """Add all extracted definitions to database"""
@@ -203,56 +321,8 @@ def add_to_database(definitions_file, db_path='../perseus_texts.db'):
     cursor.execute("SELECT COUNT(*) FROM dictionary_entries WHERE source = 'wiktionary'")
     before_count = cursor.fetchone()[0]
     
-    added = 0
-    updated = 0
-    batch = []
-    
-    for norm_form, entry in entries.items():
-        # Check if exists
-        cursor.execute("""
-            SELECT id FROM dictionary_entries 
-            WHERE headword_normalized = ? AND language = ?
-        """, (entry['headword_normalized'], entry['language']))
-        
-        existing = cursor.fetchone()
-        
-        if not existing:
-            batch.append((
-                entry['headword'],
-                entry['headword_normalized'], 
-                entry['language'],
-                entry['entry_xml'],
-                entry['entry_html'],
-                entry['entry_plain'],
-                entry['source']
-            ))
-            added += 1
-        elif entry['source'] == 'wiktionary':
-            # Update if it's already a Wiktionary entry
-            cursor.execute("""
-                UPDATE dictionary_entries 
-                SET entry_html = ?, entry_plain = ?
-                WHERE id = ?
-            """, (entry['entry_html'], entry['entry_plain'], existing[0]))
-            updated += 1
-        
-        # Batch insert
-        if len(batch) >= 100:
-            cursor.executemany("""
-                INSERT INTO dictionary_entries 
-                (headword, headword_normalized, language, entry_xml, entry_html, entry_plain, source)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, batch)
-            batch = []
-    
-    # Insert remaining
-    if batch:
-        cursor.executemany("""
-            INSERT INTO dictionary_entries 
-            (headword, headword_normalized, language, entry_xml, entry_html, entry_plain, source)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, batch)
-    
+    # LSJ entries are kept, existing Wiktionary entries are updated
+    counts = merge_dictionary_entries(cursor, entries.values())
     conn.commit()
     
     # Final count
@@ -263,8 +333,9 @@ def add_to_database(definitions_file, db_path='../perseus_texts.db'):
     
     print(f"\nDatabase update complete:")
     print(f"  Before: {before_count:,} Wiktionary entries")
-    print(f"  Added: {added:,} new entries")
-    print(f"  Updated: {updated:,} existing entries")
+    print(f"  Added: {counts['added']:,} new entries")
+    print(f"  Updated: {counts['updated']:,} existing entries")
+    print(f"  Skipped: {counts['skipped']:,} (in LSJ or unchanged)")
     print(f"  After: {after_count:,} Wiktionary entries")
 
 def main():
@@ -274,6 +345,8 @@ def main():
         print("Usage: python extract_all_corpus_definitions.py <command>")
         print("Commands:")
         print("  extract - Extract all definitions from Wiktionary (takes hours)")
+        print("            resumes an interrupted run; add --restart to start over")
+        print("  status  - Show progress of the current or last extraction")
         print("  add     - Add extracted definitions to database")
         print("  stats   - Show statistics about corpus words")
         return
@@ -285,6 +358,14 @@ def main():
         words_file = 'all_greek_words_in_corpus.json'
         output_dir = 'wiktionary_extraction_results'
         
+        status = read_status(output_dir)
+        resume = (status is not None and status['state'] == 'running'
+                  and '--restart' not in sys.argv)
+        if resume and status.get('dump_file'):
+            # The resume offset belongs to the dump the run was reading (e.g.
+            # the multistream dump, when the multiplexer was interrupted)
+            dump_file = status['dump_file']
+        
         if not Path(dump_file).exists():
             print(f"Error: Wiktionary dump not found at {dump_file}")
             return
@@ -293,7 +374,15 @@ def main():
             print(f"Error: Corpus words file not found at {words_file}")
             return
         
-        process_wiktionary_comprehensive(dump_file, words_file, output_dir)
+        process_wiktionary_comprehensive(dump_file, words_file, output_dir, resume)
+    
+    elif command == 'status':
+        status = read_status('wiktionary_extraction_results')
+        if status is None:
+            print("No extraction has been recorded")
+            return
+        for key, value in status.items():
+            print(f"  {key}: {value:,}" if isinstance(value, int) else f"  {key}: {value}")
     
     elif command == 'add':
         definitions_file = 'wiktionary_extraction_results/wiktionary_definitions_final.json'
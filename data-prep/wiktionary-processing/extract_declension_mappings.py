@@ -4,13 +4,13 @@ Extract Ancient Greek mappings from declension templates in Greek Wiktionary
 This implements the actual declension patterns to generate inflected forms
 """
 
-import xml.etree.ElementTree as ET
 import re
-import bz2
 import json
 import unicodedata
 from pathlib import Path
 
+from wiktionary_dump import PagePrefilter, iter_pages
+
 def normalize_greek(text):
     """Normalize Greek text by removing diacritics, punctuation, and converting to lowercase"""
     if not text:
@@ -198,125 +198,129 @@ class GreekDeclensionGenerator:
         
         return forms
 
-def extract_declension_mappings(dump_path, output_path):
-    """Extract mappings from Greek declension templates"""
-    print(f"=== EXTRACTING DECLENSION MAPPINGS FROM GREEK WIKTIONARY ===")
-    print(f"Source: {dump_path}")
-    print(f"Output: {output_path}")
+class DeclensionMappingsExtractor:
+    """Generates inflected-form mappings from Greek Wiktionary declension templates"""
+    
+    dump = 'el'
+    prefilter = PagePrefilter(['{{grc-κλίση-'])
+    
+    def __init__(self, output_path, dump_path=''):
+        self.output_path = output_path
+        self.dump_path = dump_path
+        self.generator = GreekDeclensionGenerator()
+        self.all_mappings = []
+        self.pages_processed = 0
+        self.declension_pages = 0
     
-    generator = GreekDeclensionGenerator()
+    def process_page(self, title, text):
+        self.pages_processed += 1
+        
+        if title is not None and text is not None:
+            self._extract(title, text)
+        
+        # Progress
+        if self.pages_processed % 50000 == 0:
+            print(f"  Processed {self.pages_processed:,} pages, found {self.declension_pages:,} declensions, generated {len(self.all_mappings):,} mappings")
     
-    with bz2.open(dump_path, 'rt', encoding='utf-8') as f:
-        context = ET.iterparse(f, events=('start', 'end'))
-        context = iter(context)
-        event, root = next(context)
+    def _extract(self, title, text):
+        generator = self.generator
         
-        all_mappings = []
-        pages_processed = 0
-        declension_pages = 0
+        # Skip non-main namespace pages
+        if ':' in title:
+            return
         
-        for event, elem in context:
-            if event == 'end' and elem.tag.endswith('page'):
-                pages_processed += 1
+        # Look for declension templates
+        for pattern_name in generator.patterns:
+            template_pattern = f"{{{{grc-κλίση-'{pattern_name}'"
+            if template_pattern in text:
+                self.declension_pages += 1
                 
-                # Extract title and text
-                title_elem = elem.find('.//{http://www.mediawiki.org/xml/export-0.11/}title')
-                text_elem = elem.find('.//{http://www.mediawiki.org/xml/export-0.11/}text')
+                # Generate forms for this word
+                forms = generator.generate_forms(title, pattern_name)
                 
-                if title_elem is not None and text_elem is not None:
-                    title = title_elem.text or ''
-                    text = text_elem.text or ''
+                if forms:
+                    # Add mappings for each form
+                    title_normalized = normalize_greek(title)
                     
-                    # Skip non-main namespace pages
-                    if ':' in title:
-                        elem.clear()
-                        root.clear()
-                        continue
+                    for form_data in forms:
+                        form_normalized = normalize_greek(form_data['form'])
+                        
+                        if form_normalized != title_normalized:
+                            mapping = {
+                                'word_form': form_normalized,
+                                'lemma': title_normalized,
+                                'confidence': 0.9,  # Slightly lower confidence for generated forms
+                                'source': f'elwiktionary:declension:{pattern_name}',
+                                'morph_type': 'generated',
+                                'case': form_data['case'],
+                                'debug_title': title,
+                                'debug_form': form_data['form']
+                            }
+                            self.all_mappings.append(mapping)
                     
-                    # Look for declension templates
-                    for pattern_name in generator.patterns:
-                        template_pattern = f"{{{{grc-κλίση-'{pattern_name}'"
-                        if template_pattern in text:
-                            declension_pages += 1
-                            
-                            # Generate forms for this word
-                            forms = generator.generate_forms(title, pattern_name)
-                            
-                            if forms:
-                                # Add mappings for each form
-                                title_normalized = normalize_greek(title)
-                                
-                                for form_data in forms:
-                                    form_normalized = normalize_greek(form_data['form'])
-                                    
-                                    if form_normalized != title_normalized:
-                                        mapping = {
-                                            'word_form': form_normalized,
-                                            'lemma': title_normalized,
-                                            'confidence': 0.9,  # Slightly lower confidence for generated forms
-                                            'source': f'elwiktionary:declension:{pattern_name}',
-                                            'morph_type': 'generated',
-                                            'case': form_data['case'],
-                                            'debug_title': title,
-                                            'debug_form': form_data['form']
-                                        }
-                                        all_mappings.append(mapping)
-                                
-                                if declension_pages <= 5:
-                                    print(f"Generated {len(forms)} forms for {title} using {pattern_name}")
-                            
-                            break  # Only use first matching template
+                    if self.declension_pages <= 5:
+                        print(f"Generated {len(forms)} forms for {title} using {pattern_name}")
                 
-                # Clear memory
-                elem.clear()
-                root.clear()
-                
-                # Progress
-                if pages_processed % 50000 == 0:
-                    print(f"  Processed {pages_processed:,} pages, found {declension_pages:,} declensions, generated {len(all_mappings):,} mappings")
-    
-    print(f"\n✓ Extraction complete!")
-    print(f"  Total pages processed: {pages_processed:,}")
-    print(f"  Declension pages found: {declension_pages:,}")
-    print(f"  Total mappings generated: {len(all_mappings):,}")
+                break  # Only use first matching template
     
-    # Deduplicate mappings
-    print(f"\nDeduplicating mappings...")
-    unique_mappings = {}
-    
-    for mapping in all_mappings:
-        key = (mapping['word_form'], mapping['lemma'])
-        if key not in unique_mappings:
-            unique_mappings[key] = mapping
-    
-    final_mappings = list(unique_mappings.values())
-    print(f"  Unique mappings after deduplication: {len(final_mappings):,}")
-    
-    # Save to JSON file
-    print(f"\nSaving to {output_path}...")
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump({
-            'metadata': {
-                'source': 'Greek Wiktionary Declension Templates',
-                'source_file': str(dump_path),
-                'extraction_date': '2025-08-04',
-                'license': 'Creative Commons Attribution-ShareAlike 3.0 Unported License (CC BY-SA 3.0)',
-                'total_pages_processed': pages_processed,
-                'declension_pages_found': declension_pages,
-                'total_mappings': len(final_mappings),
-                'description': 'Ancient Greek inflection mappings generated from declension templates'
-            },
-            'mappings': final_mappings
-        }, f, ensure_ascii=False, indent=2)
-    
-    print(f"✓ Saved {len(final_mappings):,} unique mappings to {output_path}")
+    def finish(self):
+        all_mappings = self.all_mappings
+        output_path = self.output_path
+        
+        print(f"\n✓ Extraction complete!")
+        print(f"  Total pages processed: {self.pages_processed:,}")
+        print(f"  Declension pages found: {self.declension_pages:,}")
+        print(f"  Total mappings generated: {len(all_mappings):,}")
+        
+        # Deduplicate mappings
+        print(f"\nDeduplicating mappings...")
+        unique_mappings = {}
+        
+        for mapping in all_mappings:
+            key = (mapping['word_form'], mapping['lemma'])
+            if key not in unique_mappings:
+                unique_mappings[key] = mapping
+        
+        final_mappings = list(unique_mappings.values())
+        print(f"  Unique mappings after deduplication: {len(final_mappings):,}")
+        
+        # Save to JSON file
+        print(f"\nSaving to {output_path}...")
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'metadata': {
+                    'source': 'Greek Wiktionary Declension Templates',
+                    'source_file': str(self.dump_path),
+                    'extraction_date': '2025-08-04',
+                    'license': 'Creative Commons Attribution-ShareAlike 3.0 Unported License (CC BY-SA 3.0)',
+                    'total_pages_processed': self.pages_processed,
+                    'declension_pages_found': self.declension_pages,
+                    'total_mappings': len(final_mappings),
+                    'description': 'Ancient Greek inflection mappings generated from declension templates'
+                },
+                'mappings': final_mappings
+            }, f, ensure_ascii=False, indent=2)
+        
+        print(f"✓ Saved {len(final_mappings):,} unique mappings to {output_path}")
+        
+        # Show sample mappings
+        print(f"\nSample mappings:")
+        for mapping in final_mappings[:20]:
+            print(f"  {mapping['debug_form']} -> {mapping['debug_title']} ({mapping['case']})")
+        
+        return True
+
+def extract_declension_mappings(dump_path, output_path):
+    """Extract mappings from Greek declension templates"""
+    print(f"=== EXTRACTING DECLENSION MAPPINGS FROM GREEK WIKTIONARY ===")
+    print(f"Source: {dump_path}")
+    print(f"Output: {output_path}")
     
-    # Show sample mappings
-    print(f"\nSample mappings:")
-    for mapping in final_mappings[:20]:
-        print(f"  {mapping['debug_form']} -> {mapping['debug_title']} ({mapping['case']})")
+    extractor = DeclensionMappingsExtractor(output_path, dump_path)
+    for title, text in iter_pages(dump_path, prefilter=DeclensionMappingsExtractor.prefilter):
+        extractor.process_page(title, text)
     
-    return True
+    return extractor.finish()
 
 if __name__ == "__main__":
     dump_file = "../../data-sources/elwiktionary-latest-pages-articles.xml.bz2"
@@ -3,13 +3,13 @@
 Extract Ancient Greek inflection mappings from Greek Wiktionary - Fixed version
 """
 
-import xml.etree.ElementTree as ET
 import re
-import bz2
 import json
 import unicodedata
 from pathlib import Path
 
+from wiktionary_dump import PagePrefilter, iter_pages
+
 def normalize_greek(text):
     """Normalize Greek text by removing diacritics, punctuation, and converting to lowercase"""
     if not text:
@@ -27,148 +27,152 @@ def normalize_greek(text):
     text = ''.join(c for c in text if c.isalpha() and ('\u0370' <= c <= '\u03ff' or '\u1f00' <= c <= '\u1fff'))
     return text
 
-def extract_greek_inflections_fixed(dump_path, output_path):
-    """Extract Ancient Greek inflection mappings from Greek Wiktionary"""
-    print(f"=== EXTRACTING ANCIENT GREEK INFLECTIONS FROM GREEK WIKTIONARY ===")
-    print(f"Source: {dump_path}")
-    print(f"Output: {output_path}")
+class ElWiktionaryInflectionExtractor:
+    """Collects Ancient Greek inflection mappings from Greek Wiktionary pages"""
+    
+    dump = 'el'
+    # Inflection pages carry the noun form-of template
+    prefilter = PagePrefilter(['{{μορφή ουσιαστικού|grc}}'])
+    
+    def __init__(self, output_path, dump_path=''):
+        self.output_path = output_path
+        self.dump_path = dump_path
+        self.all_mappings = []
+        self.pages_processed = 0
+        self.inflection_pages = 0
     
-    with bz2.open(dump_path, 'rt', encoding='utf-8') as f:
-        context = ET.iterparse(f, events=('start', 'end'))
-        context = iter(context)
-        event, root = next(context)
+    def process_page(self, title, text):
+        self.pages_processed += 1
         
-        all_mappings = []
-        pages_processed = 0
-        inflection_pages = 0
+        if title is not None and text is not None:
+            self._extract(title, text)
         
-        for event, elem in context:
-            if event == 'end' and elem.tag.endswith('page'):
-                pages_processed += 1
-                
-                # Extract title and text
-                title_elem = elem.find('.//{http://www.mediawiki.org/xml/export-0.11/}title')
-                text_elem = elem.find('.//{http://www.mediawiki.org/xml/export-0.11/}text')
+        # Progress indicator
+        if self.pages_processed % 50000 == 0:
+            print(f"  Processed {self.pages_processed:,} pages, found {self.inflection_pages} inflection pages, extracted {len(self.all_mappings):,} mappings")
+    
+    def _extract(self, title, text):
+        # Skip non-main namespace pages
+        if ':' in title:
+            return
+        
+        # Look for Ancient Greek section
+        if '=={{-grc-}}==' in text:
+            # Check if this is an inflection page
+            if '{{μορφή ουσιαστικού|grc}}' in text:
+                self.inflection_pages += 1
                 
-                if title_elem is not None and text_elem is not None:
-                    title = title_elem.text or ''
-                    text = text_elem.text or ''
-                    
-                    # Skip non-main namespace pages
-                    if ':' in title:
-                        elem.clear()
-                        root.clear()
-                        continue
+                # Pattern 1: {{κλ|grc|π=α|α=ε|μῆνις}} - last parameter is lemma
+                kl_match = re.search(r'{{\s*κλ\s*\|\s*grc\s*\|[^}]*\|([^}|]+)\s*}}', text)
+                if kl_match:
+                    lemma = kl_match.group(1).strip()
+                    word_form_normalized = normalize_greek(title)
+                    lemma_normalized = normalize_greek(lemma)
                     
-                    # Look for Ancient Greek section
-                    if '=={{-grc-}}==' in text:
-                        # Check if this is an inflection page
-                        if '{{μορφή ουσιαστικού|grc}}' in text:
-                            inflection_pages += 1
+                    if word_form_normalized != lemma_normalized:
+                        mapping = {
+                            'word_form': word_form_normalized,
+                            'lemma': lemma_normalized,
+                            'confidence': 1.0,
+                            'source': 'elwiktionary:κλ',
+                            'debug_title': title,
+                            'debug_lemma': lemma
+                        }
+                        self.all_mappings.append(mapping)
+                        
+                        if len(self.all_mappings) <= 20:
+                            print(f"Found (κλ): {title} -> {lemma}")
+                else:
+                    # Pattern 2: της λέξης [[μῆνις]]
+                    lexis_match = re.search(r'της λέξης \[\[([^\]]+)\]\]', text)
+                    if lexis_match:
+                        lemma = lexis_match.group(1).strip()
+                        word_form_normalized = normalize_greek(title)
+                        lemma_normalized = normalize_greek(lemma)
+                        
+                        if word_form_normalized != lemma_normalized:
+                            mapping = {
+                                'word_form': word_form_normalized,
+                                'lemma': lemma_normalized,
+                                'confidence': 1.0,
+                                'source': 'elwiktionary:λέξης',
+                                'debug_title': title,
+                                'debug_lemma': lemma
+                            }
+                            self.all_mappings.append(mapping)
                             
-                            # Pattern 1: {{κλ|grc|π=α|α=ε|μῆνις}} - last parameter is lemma
-                            kl_match = re.search(r'{{\s*κλ\s*\|\s*grc\s*\|[^}]*\|([^}|]+)\s*}}', text)
-                            if kl_match:
-                                lemma = kl_match.group(1).strip()
-                                word_form_normalized = normalize_greek(title)
-                                lemma_normalized = normalize_greek(lemma)
-                                
-                                if word_form_normalized != lemma_normalized:
-                                    mapping = {
-                                        'word_form': word_form_normalized,
-                                        'lemma': lemma_normalized,
-                                        'confidence': 1.0,
-                                        'source': 'elwiktionary:κλ',
-                                        'debug_title': title,
-                                        'debug_lemma': lemma
-                                    }
-                                    all_mappings.append(mapping)
-                                    
-                                    if len(all_mappings) <= 20:
-                                        print(f"Found (κλ): {title} -> {lemma}")
-                            else:
-                                # Pattern 2: της λέξης [[μῆνις]]
-                                lexis_match = re.search(r'της λέξης \[\[([^\]]+)\]\]', text)
-                                if lexis_match:
-                                    lemma = lexis_match.group(1).strip()
-                                    word_form_normalized = normalize_greek(title)
-                                    lemma_normalized = normalize_greek(lemma)
-                                    
-                                    if word_form_normalized != lemma_normalized:
-                                        mapping = {
-                                            'word_form': word_form_normalized,
-                                            'lemma': lemma_normalized,
-                                            'confidence': 1.0,
-                                            'source': 'elwiktionary:λέξης',
-                                            'debug_title': title,
-                                            'debug_lemma': lemma
-                                        }
-                                        all_mappings.append(mapping)
-                                        
-                                        if len(all_mappings) <= 20:
-                                            print(f"Found (λέξης): {title} -> {lemma}")
-                
-                # Clear processed elements to save memory
-                elem.clear()
-                root.clear()
-                
-                # Progress indicator
-                if pages_processed % 50000 == 0:
-                    print(f"  Processed {pages_processed:,} pages, found {inflection_pages} inflection pages, extracted {len(all_mappings):,} mappings")
-    
-    print(f"\n✓ Extraction complete!")
-    print(f"  Total pages processed: {pages_processed:,}")
-    print(f"  Inflection pages found: {inflection_pages}")
-    print(f"  Total mappings extracted: {len(all_mappings):,}")
-    
-    # Deduplicate mappings
-    print(f"\nDeduplicating mappings...")
-    unique_mappings = {}
-    
-    for mapping in all_mappings:
-        key = (mapping['word_form'], mapping['lemma'])
-        if key not in unique_mappings:
-            unique_mappings[key] = mapping
-    
-    final_mappings = list(unique_mappings.values())
-    print(f"  Unique mappings after deduplication: {len(final_mappings):,}")
-    
-    # Check if we found μῆνιν specifically
-    menin_found = False
-    for mapping in final_mappings:
-        if mapping['word_form'] == 'μηνιν':
-            menin_found = True
-            print(f"  ✓ Found μῆνιν -> {mapping['lemma']} ({mapping['debug_lemma']})")
-            break
+                            if len(self.all_mappings) <= 20:
+                                print(f"Found (λέξης): {title} -> {lemma}")
     
-    if not menin_found:
-        print(f"  ⚠️  μῆνιν not found in extracted mappings")
-    
-    # Save to JSON file
-    print(f"\nSaving to {output_path}...")
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump({
-            'metadata': {
-                'source': 'Greek Wiktionary (Wikimedia Foundation)',
-                'source_file': str(dump_path),
-                'extraction_date': '2025-08-04',
-                'license': 'Creative Commons Attribution-ShareAlike 3.0 Unported License (CC BY-SA 3.0)',
-                'total_pages_processed': pages_processed,
-                'inflection_pages_found': inflection_pages,
-                'total_mappings': len(final_mappings),
-                'description': 'Ancient Greek inflection relationships extracted from Greek Wiktionary'
-            },
-            'mappings': final_mappings
-        }, f, ensure_ascii=False, indent=2)
-    
-    print(f"✓ Saved {len(final_mappings):,} unique mappings to {output_path}")
+    def finish(self):
+        all_mappings = self.all_mappings
+        output_path = self.output_path
+        
+        print(f"\n✓ Extraction complete!")
+        print(f"  Total pages processed: {self.pages_processed:,}")
+        print(f"  Inflection pages found: {self.inflection_pages}")
+        print(f"  Total mappings extracted: {len(all_mappings):,}")
+        
+        # Deduplicate mappings
+        print(f"\nDeduplicating mappings...")
+        unique_mappings = {}
+        
+        for mapping in all_mappings:
+            key = (mapping['word_form'], mapping['lemma'])
+            if key not in unique_mappings:
+                unique_mappings[key] = mapping
+        
+        final_mappings = list(unique_mappings.values())
+        print(f"  Unique mappings after deduplication: {len(final_mappings):,}")
+        
+        # Check if we found μῆνιν specifically
+        menin_found = False
+        for mapping in final_mappings:
+            if mapping['word_form'] == 'μηνιν':
+                menin_found = True
+                print(f"  ✓ Found μῆνιν -> {mapping['lemma']} ({mapping['debug_lemma']})")
+                break
+        
+        if not menin_found:
+            print(f"  ⚠️  μῆνιν not found in extracted mappings")
+        
+        # Save to JSON file
+        print(f"\nSaving to {output_path}...")
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'metadata': {
+                    'source': 'Greek Wiktionary (Wikimedia Foundation)',
+                    'source_file': str(self.dump_path),
+                    'extraction_date': '2025-08-04',
+                    'license': 'Creative Commons Attribution-ShareAlike 3.0 Unported License (CC BY-SA 3.0)',
+                    'total_pages_processed': self.pages_processed,
+                    'inflection_pages_found': self.inflection_pages,
+                    'total_mappings': len(final_mappings),
+                    'description': 'Ancient Greek inflection relationships extracted from Greek Wiktionary'
+                },
+                'mappings': final_mappings
+            }, f, ensure_ascii=False, indent=2)
+        
+        print(f"✓ Saved {len(final_mappings):,} unique mappings to {output_path}")
+        
+        # Show some sample mappings
+        print(f"\nSample mappings:")
+        for mapping in final_mappings[:20]:
+            print(f"  {mapping['debug_title']} -> {mapping['debug_lemma']}")
+        
+        return True
+
+def extract_greek_inflections_fixed(dump_path, output_path):
+    """Extract Ancient Greek inflection mappings from Greek Wiktionary"""
+    print(f"=== EXTRACTING ANCIENT GREEK INFLECTIONS FROM GREEK WIKTIONARY ===")
+    print(f"Source: {dump_path}")
+    print(f"Output: {output_path}")
     
-    # Show some sample mappings
-    print(f"\nSample mappings:")
-    for mapping in final_mappings[:20]:
-        print(f"  {mapping['debug_title']} -> {mapping['debug_lemma']}")
+    extractor = ElWiktionaryInflectionExtractor(output_path, dump_path)
+    for title, text in iter_pages(dump_path, prefilter=ElWiktionaryInflectionExtractor.prefilter):
+        extractor.process_page(title, text)
     
-    return True
+    return extractor.finish()
 
 if __name__ == "__main__":
     dump_file = "../../data-sources/elwiktionary-latest-pages-articles.xml.bz2"
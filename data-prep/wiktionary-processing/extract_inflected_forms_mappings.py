@@ -8,15 +8,20 @@ This script looks for inflected form entries in Wiktionary that contain:
 """
 
 import json
-import bz2
-import xml.etree.ElementTree as ET
 import re
 import sqlite3
+import sys
 import unicodedata
 import time
 from datetime import datetime
 from pathlib import Path
 
+from wikitext_outline import POS_TITLES, outline_for
+from wiktionary_dump import PagePrefilter, iter_pages
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dictionary_merge import merge_lemma_mappings
+
 def normalize_greek(text):
     """Normalize Greek text - same as in main database creation"""
     text = unicodedata.normalize('NFD', text)
@@ -30,14 +35,13 @@ def extract_inflection_info(title, text, normalized_title):
     """Extract lemma and morphology info from inflected form page"""
     
     # Look for Ancient Greek section
-    ag_match = re.search(r'==Ancient Greek==.*?(?=\n==[^=]|\Z)', text, re.DOTALL)
-    if not ag_match:
-        # Also check Greek section as some entries might be there
-        ag_match = re.search(r'==Greek==.*?(?=\n==[^=]|\Z)', text, re.DOTALL)
-        if not ag_match:
-            return None
+    # (also check Greek section as some entries might be there)
+    outline = outline_for(text)
+    section = outline.language('Ancient Greek', 'Greek')
+    if not section:
+        return None
     
-    ag_section = ag_match.group(0)
+    ag_section = outline.section_text(section)
     
     # Look for inflection_of templates
     inflection_patterns = [
@@ -97,22 +101,20 @@ def extract_inflection_info(title, text, normalized_title):
     lemma = re.sub(r'[#|].*', '', lemma).strip()
     
     # Get part of speech if available
-    pos_match = re.search(r'===(Noun|Verb|Adjective|Pronoun|Particle|Adverb|Preposition|Conjunction|Numeral|Interjection|Proper noun)===', ag_section)
-    pos = pos_match.group(1).lower() if pos_match else None
+    pos_section = outline.find(section, POS_TITLES)
+    pos = pos_section.heading.title.lower() if pos_section else None
     
     # Look for any definition
     definition = None
-    if pos_match:
-        definition_section = ag_section[pos_match.end():]
-        for line in definition_section.split('\n'):
-            if line.startswith('# ') and not line.startswith('##'):
-                definition = line[2:].strip()
-                # Clean wiki markup
-                definition = re.sub(r'\[\[([^|\]]+)\|([^\]]+)\]\]', r'\2', definition)
-                definition = re.sub(r'\[\[([^\]]+)\]\]', r'\1', definition)
-                definition = re.sub(r"'''?", '', definition)
-                definition = re.sub(r'\{\{[^}]+\}\}', '', definition)
-                break
+    if pos_section:
+        definitions = outline.definitions(pos_section.start, section.end)
+        if definitions:
+            definition = definitions[0].strip()
+            # Clean wiki markup
+            definition = re.sub(r'\[\[([^|\]]+)\|([^\]]+)\]\]', r'\2', definition)
+            definition = re.sub(r'\[\[([^\]]+)\]\]', r'\1', definition)
+            definition = re.sub(r"'''?", '', definition)
+            definition = re.sub(r'\{\{[^}]+\}\}', '', definition)
     
     return {
         'word_form': title,
@@ -125,118 +127,132 @@ def extract_inflection_info(title, text, normalized_title):
         'source': 'wiktionary'
     }
 
-def process_wiktionary_for_inflections(dump_file, words_file, output_dir):
-    """Process Wiktionary dump to extract inflection mappings"""
+class InflectedFormsExtractor:
+    """Collects lemma and morphology info for every corpus word found in the dump"""
     
-    # Load target words
-    with open(words_file, 'r', encoding='utf-8') as f:
-        corpus_words = json.load(f)
+    dump = 'en'
+    # Corpus words are Greek, and only Greek / Ancient Greek entries are used
+    prefilter = PagePrefilter(['==Ancient Greek==', '==Greek=='], greek_title=True)
     
-    target_set = set(corpus_words.keys())
-    print(f"Looking for inflection info for {len(target_set):,} unique Greek words")
-    
-    namespace = {'ns': 'http://www.mediawiki.org/xml/export-0.11/'}
-    found_mappings = {}
-    processed_pages = 0
-    start_time = time.time()
-    
-    # Create output directory
-    Path(output_dir).mkdir(exist_ok=True)
+    def __init__(self, words_file, output_dir):
+        # Load target words
+        with open(words_file, 'r', encoding='utf-8') as f:
+            self.corpus_words = json.load(f)
+        
+        self.target_set = set(self.corpus_words.keys())
+        print(f"Looking for inflection info for {len(self.target_set):,} unique Greek words")
+        
+        self.output_dir = output_dir
+        self.found_mappings = {}
+        self.processed_pages = 0
+        self.start_time = time.time()
+        
+        # Create output directory
+        Path(output_dir).mkdir(exist_ok=True)
     
-    print(f"\nProcessing Wiktionary dump: {dump_file}")
-    print("Looking for inflected form entries...")
+    def process_page(self, title, text):
+        self.processed_pages += 1
+        
+        if title is not None and text is not None:
+            self._extract(title, text)
+        
+        # Status update every 10,000 pages
+        if self.processed_pages % 10000 == 0:
+            print(f"  Processed {self.processed_pages:,} Wiktionary pages...")
     
-    with bz2.open(dump_file, 'rt', encoding='utf-8') as f:
-        for event, elem in ET.iterparse(f, events=('start', 'end')):
-            if event == 'end' and elem.tag.endswith('page'):
-                processed_pages += 1
+    def _extract(self, title, text):
+        found_mappings = self.found_mappings
+        target_set = self.target_set
+        
+        # Skip non-main namespace
+        if ':' in title and not title.startswith('Reconstruction:'):
+            return
+        
+        # Check if Greek word
+        normalized_title = normalize_greek(title)
+        
+        if normalized_title in target_set:
+            # Look for inflection information
+            inflection_info = extract_inflection_info(title, text, normalized_title)
+            if inflection_info:
+                found_mappings[normalized_title] = inflection_info
                 
-                title_elem = elem.find('.//ns:title', namespace)
-                text_elem = elem.find('.//ns:text', namespace)
+                # Remove from target set
+                target_set.remove(normalized_title)
                 
-                if title_elem is not None and text_elem is not None:
-                    title = title_elem.text
-                    
-                    # Skip non-main namespace
-                    if ':' in title and not title.startswith('Reconstruction:'):
-                        elem.clear()
-                        continue
+                # Progress update
+                if len(found_mappings) % 100 == 0:
+                    elapsed = time.time() - self.start_time
+                    rate = len(found_mappings) / elapsed
+                    remaining = len(target_set) / rate if rate > 0 else 0
                     
-                    # Check if Greek word
-                    normalized_title = normalize_greek(title)
+                    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Progress:")
+                    print(f"  Found: {len(found_mappings):,} mappings")
+                    print(f"  Remaining: {len(target_set):,} words")
+                    print(f"  Rate: {rate:.1f} mappings/second")
+                    print(f"  Est. remaining: {remaining/3600:.1f} hours")
                     
-                    if normalized_title in target_set:
-                        text = text_elem.text or ''
-                        
-                        # Look for inflection information
-                        inflection_info = extract_inflection_info(title, text, normalized_title)
-                        if inflection_info:
-                            found_mappings[normalized_title] = inflection_info
-                            
-                            # Remove from target set
-                            target_set.remove(normalized_title)
-                            
-                            # Progress update
-                            if len(found_mappings) % 100 == 0:
-                                elapsed = time.time() - start_time
-                                rate = len(found_mappings) / elapsed
-                                remaining = len(target_set) / rate if rate > 0 else 0
-                                
-                                print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Progress:")
-                                print(f"  Found: {len(found_mappings):,} mappings")
-                                print(f"  Remaining: {len(target_set):,} words")
-                                print(f"  Rate: {rate:.1f} mappings/second")
-                                print(f"  Est. remaining: {remaining/3600:.1f} hours")
-                                
-                                # Show example
-                                if inflection_info['morphology']:
-                                    print(f"  Example: {title} → {inflection_info['lemma']} ({', '.join(inflection_info['morphology'][:3])})")
-                            
-                            # Save checkpoint every 1000 entries
-                            if len(found_mappings) % 1000 == 0:
-                                checkpoint_file = f"{output_dir}/inflection_checkpoint_{len(found_mappings)}.json"
-                                with open(checkpoint_file, 'w', encoding='utf-8') as out:
-                                    json.dump(found_mappings, out, ensure_ascii=False, indent=2)
-                                print(f"  Saved checkpoint: {checkpoint_file}")
-                
-                elem.clear()
+                    # Show example
+                    if inflection_info['morphology']:
+                        print(f"  Example: {title} → {inflection_info['lemma']} ({', '.join(inflection_info['morphology'][:3])})")
                 
-                # Status update every 10,000 pages
-                if processed_pages % 10000 == 0:
-                    print(f"  Processed {processed_pages:,} Wiktionary pages...")
-    
-    # Save final results
-    final_file = f"{output_dir}/inflection_mappings_final.json"
-    with open(final_file, 'w', encoding='utf-8') as f:
-        json.dump(found_mappings, f, ensure_ascii=False, indent=2)
+                # Save checkpoint every 1000 entries
+                if len(found_mappings) % 1000 == 0:
+                    checkpoint_file = f"{self.output_dir}/inflection_checkpoint_{len(found_mappings)}.json"
+                    with open(checkpoint_file, 'w', encoding='utf-8') as out:
+                        json.dump(found_mappings, out, ensure_ascii=False, indent=2)
+                    print(f"  Saved checkpoint: {checkpoint_file}")
+    
+    def finish(self):
+        found_mappings = self.found_mappings
+        output_dir = self.output_dir
+        
+        # Save final results
+        final_file = f"{output_dir}/inflection_mappings_final.json"
+        with open(final_file, 'w', encoding='utf-8') as f:
+            json.dump(found_mappings, f, ensure_ascii=False, indent=2)
+        
+        # Summary
+        elapsed_total = time.time() - self.start_time
+        print(f"\n{'='*60}")
+        print(f"EXTRACTION COMPLETE")
+        print(f"{'='*60}")
+        print(f"Total time: {elapsed_total/3600:.1f} hours")
+        print(f"Pages processed: {self.processed_pages:,}")
+        print(f"Mappings found: {len(found_mappings):,}")
+        print(f"Success rate: {len(found_mappings)/len(self.corpus_words)*100:.1f}%")
+        print(f"Final output: {final_file}")
+        
+        # Show some statistics
+        lemmas = {}
+        for mapping in found_mappings.values():
+            lemma = mapping['lemma_normalized']
+            if lemma not in lemmas:
+                lemmas[lemma] = 0
+            lemmas[lemma] += 1
+        
+        print(f"\nUnique lemmas found: {len(lemmas):,}")
+        if lemmas:
+            print(f"Average forms per lemma: {len(found_mappings)/len(lemmas):.1f}")
+        
+        # Save words not found
+        not_found = sorted(self.target_set)
+        with open(f"{output_dir}/words_without_inflection_info.json", 'w', encoding='utf-8') as f:
+            json.dump(not_found, f, ensure_ascii=False, indent=2)
+        print(f"Words without inflection info: {len(not_found):,}")
+
+def process_wiktionary_for_inflections(dump_file, words_file, output_dir):
+    """Process Wiktionary dump to extract inflection mappings"""
     
-    # Summary
-    elapsed_total = time.time() - start_time
-    print(f"\n{'='*60}")
-    print(f"EXTRACTION COMPLETE")
-    print(f"{'='*60}")
-    print(f"Total time: {elapsed_total/3600:.1f} hours")
-    print(f"Pages processed: {processed_pages:,}")
-    print(f"Mappings found: {len(found_mappings):,}")
-    print(f"Success rate: {len(found_mappings)/len(corpus_words)*100:.1f}%")
-    print(f"Final output: {final_file}")
+    extractor = InflectedFormsExtractor(words_file, output_dir)
     
-    # Show some statistics
-    lemmas = {}
-    for mapping in found_mappings.values():
-        lemma = mapping['lemma_normalized']
-        if lemma not in lemmas:
-            lemmas[lemma] = 0
-        lemmas[lemma] += 1
+    print(f"\nProcessing Wiktionary dump: {dump_file}")
+    print("Looking for inflected form entries...")
     
-    print(f"\nUnique lemmas found: {len(lemmas):,}")
-    print(f"Average forms per lemma: {len(found_mappings)/len(lemmas):.1f}")
+    for title, text in iter_pages(dump_file, prefilter=InflectedFormsExtractor.prefilter):
+        extractor.process_page(title, text)
     
-    # Save words not found
-    not_found = sorted(target_set)
-    with open(f"{output_dir}/words_without_inflection_info.json", 'w', encoding='utf-8') as f:
-        json.dump(not_found, f, ensure_ascii=False, indent=2)
-    print(f"Words without inflection info: {len(not_found):,}")
+    extractor.finish()
 
 def add_to_database(mappings_file, db_path='../perseus_texts.db'):
     """Add inflection mappings to database"""
@@ -247,39 +263,19 @@ def add_to_database(mappings_file, db_path='../perseus_texts.db'):
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
-    # Update lemma_map table with better mappings
-    updated = 0
-    added = 0
-    
-    for norm_form, mapping in mappings.items():
-        # Check if we already have this mapping
-        cursor.execute("""
-            SELECT lemma, confidence FROM lemma_map 
-            WHERE word_form = ?
-        """, (norm_form,))
-        
-        existing = cursor.fetchone()
-        
-        if existing and existing[1] < 0.9:  # Update if confidence is low
-            cursor.execute("""
-                UPDATE lemma_map 
-                SET lemma = ?, confidence = 0.95, source = 'wiktionary_inflection'
-                WHERE word_form = ?
-            """, (mapping['lemma_normalized'], norm_form))
-            updated += 1
-        elif not existing:
-            cursor.execute("""
-                INSERT INTO lemma_map (word_form, lemma, confidence, source)
-                VALUES (?, ?, 0.95, 'wiktionary_inflection')
-            """, (norm_form, mapping['lemma_normalized']))
-            added += 1
+    # Replace only the mappings of word forms whose confidence is low
+    counts = merge_lemma_mappings(cursor, (
+        {'word_form': norm_form, 'lemma': mapping['lemma_normalized'], 'confidence': 0.95}
+        for norm_form, mapping in mappings.items()
+    ), source='wiktionary_inflection')
     
     conn.commit()
     conn.close()
     
     print(f"\nDatabase update complete:")
-    print(f"  Updated: {updated:,} mappings")
-    print(f"  Added: {added:,} new mappings")
+    print(f"  Updated: {counts['updated']:,} mappings")
+    print(f"  Added: {counts['added']:,} new mappings")
+    print(f"  Skipped: {counts['skipped']:,} (confident mapping exists)")
 
 def main():
     import sys
@@ -11,6 +11,9 @@ import time
 from datetime import datetime
 from pathlib import Path
 
+from greek_pages_cache import DEFAULT_CACHE_FILE, GreekPagesCache
+from wikitext_outline import POS_TITLES, outline_for
+
 def normalize_greek(text):
     """Normalize Greek text"""
     text = unicodedata.normalize('NFD', text)
@@ -24,13 +27,12 @@ def extract_inflection_info(title, text):
     """Extract lemma and morphology info from page"""
     
     # Look for Ancient Greek section first, then Greek
-    ag_match = re.search(r'==Ancient Greek==.*?(?=\n==[^=]|\Z)', text, re.DOTALL)
-    if not ag_match:
-        ag_match = re.search(r'==Greek==.*?(?=\n==[^=]|\Z)', text, re.DOTALL)
-        if not ag_match:
-            return None
+    outline = outline_for(text)
+    section = outline.language('Ancient Greek', 'Greek')
+    if not section:
+        return None
     
-    ag_section = ag_match.group(0)
+    ag_section = outline.section_text(section)
     
     # Look for inflection_of templates
     inflection_patterns = [
@@ -77,22 +79,20 @@ def extract_inflection_info(title, text):
     lemma = re.sub(r'[#|].*', '', lemma).strip()
     
     # Get part of speech if available
-    pos_match = re.search(r'===(Noun|Verb|Adjective|Pronoun|Particle|Adverb|Preposition|Conjunction|Numeral|Interjection|Proper noun)===', ag_section)
-    pos = pos_match.group(1).lower() if pos_match else None
+    pos_section = outline.find(section, POS_TITLES)
+    pos = pos_section.heading.title.lower() if pos_section else None
     
     # Look for any definition
     definition = None
-    if pos_match:
-        definition_section = ag_section[pos_match.end():]
-        for line in definition_section.split('\n'):
-            if line.startswith('# ') and not line.startswith('##'):
-                definition = line[2:].strip()
-                # Clean wiki markup
-                definition = re.sub(r'\[\[([^|\]]+)\|([^\]]+)\]\]', r'\2', definition)
-                definition = re.sub(r'\[\[([^\]]+)\]\]', r'\1', definition)
-                definition = re.sub(r"'''?", '', definition)
-                definition = re.sub(r'\{\{[^}]+\}\}', '', definition)
-                break
+    if pos_section:
+        definitions = outline.definitions(pos_section.start, section.end)
+        if definitions:
+            definition = definitions[0].strip()
+            # Clean wiki markup
+            definition = re.sub(r'\[\[([^|\]]+)\|([^\]]+)\]\]', r'\2', definition)
+            definition = re.sub(r'\[\[([^\]]+)\]\]', r'\1', definition)
+            definition = re.sub(r"'''?", '', definition)
+            definition = re.sub(r'\{\{[^}]+\}\}', '', definition)
     
     normalized_title = normalize_greek(title)
     
@@ -118,12 +118,10 @@ def process_greek_pages_for_corpus(greek_pages_file, corpus_words_file, output_d
     target_set = set(corpus_words.keys())
     print(f"Looking for {len(target_set):,} unique Greek words")
     
-    # Load Greek pages
-    print("\nLoading pre-extracted Greek pages...")
-    with open(greek_pages_file, 'r', encoding='utf-8') as f:
-        greek_pages = json.load(f)
-    
-    print(f"Loaded {len(greek_pages):,} Greek pages")
+    # Only pages titled with a corpus word are read from the cache
+    print("\nOpening pre-extracted Greek pages cache...")
+    cache = GreekPagesCache(greek_pages_file)
+    print(f"Cache holds {len(cache):,} Greek pages")
     
     # Create output directory
     Path(output_dir).mkdir(exist_ok=True)
@@ -135,7 +133,7 @@ def process_greek_pages_for_corpus(greek_pages_file, corpus_words_file, output_d
     start_time = time.time()
     
     print("\nProcessing pages...")
-    for title, text in greek_pages.items():
+    for title, text in cache.iter_pages_for_words(target_set):
         processed += 1
         normalized_title = normalize_greek(title)
         
@@ -167,7 +165,9 @@ def process_greek_pages_for_corpus(greek_pages_file, corpus_words_file, output_d
                     print(f"  Saved checkpoint: {checkpoint_file}")
         
         if processed % 10000 == 0:
-            print(f"  Processed {processed:,}/{len(greek_pages):,} Greek pages...")
+            print(f"  Processed {processed:,} matching Greek pages...")
+    
+    cache.close()
     
     # Save final results
     final_file = f"{output_dir}/inflection_mappings_final.json"
@@ -180,7 +180,7 @@ def process_greek_pages_for_corpus(greek_pages_file, corpus_words_file, output_d
     print(f"EXTRACTION COMPLETE")
     print(f"{'='*60}")
     print(f"Total time: {elapsed_total/60:.1f} minutes")
-    print(f"Pages processed: {len(greek_pages):,}")
+    print(f"Pages processed: {processed:,}")
     print(f"Mappings found: {len(found_mappings):,}")
     print(f"Success rate: {len(found_mappings)/len(corpus_words)*100:.1f}%")
     print(f"Final output: {final_file}")
@@ -208,7 +208,7 @@ def main():
         extract_all_greek_pages.main()
     
     elif command == 'extract':
-        greek_pages_file = 'all_greek_wiktionary_pages.json'
+        greek_pages_file = DEFAULT_CACHE_FILE
         if not Path(greek_pages_file).exists():
             print(f"Error: Greek pages cache not found at {greek_pages_file}")
             print("Run 'python extract_inflections_from_cache.py cache' first")
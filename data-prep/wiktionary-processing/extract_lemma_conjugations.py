@@ -10,6 +10,9 @@ import unicodedata
 from pathlib import Path
 from collections import defaultdict
 
+from greek_pages_cache import DEFAULT_CACHE_FILE, GreekPagesCache
+from wikitext_outline import outline_for
+
 def normalize_greek(text):
     """Normalize Greek text - remove diacritics and lowercase"""
     text = unicodedata.normalize('NFD', text)
@@ -23,11 +26,12 @@ def extract_conjugation_forms(lemma, content):
     forms = {}
     
     # Look for Ancient Greek section
-    ag_match = re.search(r'==Ancient Greek==.*?(?=\n==[^=]|\Z)', content, re.DOTALL)
-    if not ag_match:
+    outline = outline_for(content)
+    ag_section = outline.language('Ancient Greek')
+    if not ag_section:
         return forms
     
-    ag_section = ag_match.group(0)
+    ag_text = outline.section_text(ag_section)
     
     # Look for conjugation templates - these generate inflected forms
     conj_patterns = [
@@ -35,33 +39,33 @@ def extract_conjugation_forms(lemma, content):
         r'\{\{grc-conj[^}]*\}\}',
         r'\{\{grc-verb[^}]*\}\}',
         r'\{\{el-conj[^}]*\}\}',
-        
-        # Specific verb patterns that might have forms listed
-        r'====Conjugation====.*?(?=\n====|\n===|\Z)',
-        r'===Verb===.*?(?=\n===|\Z)',
     ]
+    blocks = [match for pattern in conj_patterns for match in re.findall(pattern, ag_text)]
+    
+    # Specific verb sections that might have forms listed (up to the next heading)
+    blocks += [outline.body_text(section) for section in outline.subsections(ag_section, ('Conjugation',))
+               if section.heading.level >= 4]
+    blocks += [outline.body_text(section) for section in outline.subsections(ag_section, ('Verb',))]
     
     # Extract verb forms from tables
     # Look for Greek words that might be inflected forms
     greek_word_pattern = r'[ἀ-���Α-Ω]+'
     
-    for pattern in conj_patterns:
-        matches = re.findall(pattern, ag_section, re.DOTALL)
-        for match in matches:
-            # Find all Greek words in the conjugation section
-            greek_words = re.findall(greek_word_pattern, match)
-            for word in greek_words:
-                if len(word) > 2 and word != lemma:  # Skip short particles and the lemma itself
-                    normalized = normalize_greek(word)
-                    if normalized and normalized != normalize_greek(lemma):
-                        forms[normalized] = {
-                            'lemma': lemma,
-                            'lemma_normalized': normalize_greek(lemma),
-                            'word_form': word,
-                            'word_form_normalized': normalized,
-                            'pos': 'verb',
-                            'source': 'wiktionary:conjugation'
-                        }
+    for match in blocks:
+        # Find all Greek words in the conjugation section
+        greek_words = re.findall(greek_word_pattern, match)
+        for word in greek_words:
+            if len(word) > 2 and word != lemma:  # Skip short particles and the lemma itself
+                normalized = normalize_greek(word)
+                if normalized and normalized != normalize_greek(lemma):
+                    forms[normalized] = {
+                        'lemma': lemma,
+                        'lemma_normalized': normalize_greek(lemma),
+                        'word_form': word,
+                        'word_form_normalized': normalized,
+                        'pos': 'verb',
+                        'source': 'wiktionary:conjugation'
+                    }
     
     return forms
 
@@ -70,11 +74,12 @@ def extract_declension_forms(lemma, content):
     forms = {}
     
     # Look for Ancient Greek section
-    ag_match = re.search(r'==Ancient Greek==.*?(?=\n==[^=]|\Z)', content, re.DOTALL)
-    if not ag_match:
+    outline = outline_for(content)
+    ag_section = outline.language('Ancient Greek')
+    if not ag_section:
         return forms
     
-    ag_section = ag_match.group(0)
+    ag_text = outline.section_text(ag_section)
     
     # Look for declension templates
     decl_patterns = [
@@ -83,27 +88,27 @@ def extract_declension_forms(lemma, content):
         r'\{\{el-nN[^}]*\}\}',
         r'\{\{el-nF[^}]*\}\}',
         r'\{\{el-nM[^}]*\}\}',
-        r'====Declension====.*?(?=\n====|\n===|\Z)',
     ]
+    blocks = [match for pattern in decl_patterns for match in re.findall(pattern, ag_text)]
+    blocks += [outline.body_text(section) for section in outline.subsections(ag_section, ('Declension',))
+               if section.heading.level >= 4]
     
     greek_word_pattern = r'[ἀ-ῷΑ-Ω]+'
     
-    for pattern in decl_patterns:
-        matches = re.findall(pattern, ag_section, re.DOTALL)
-        for match in matches:
-            greek_words = re.findall(greek_word_pattern, match)
-            for word in greek_words:
-                if len(word) > 2 and word != lemma:
-                    normalized = normalize_greek(word)
-                    if normalized and normalized != normalize_greek(lemma):
-                        forms[normalized] = {
-                            'lemma': lemma,
-                            'lemma_normalized': normalize_greek(lemma),
-                            'word_form': word,
-                            'word_form_normalized': normalized,
-                            'pos': 'noun',
-                            'source': 'wiktionary:declension'
-                        }
+    for match in blocks:
+        greek_words = re.findall(greek_word_pattern, match)
+        for word in greek_words:
+            if len(word) > 2 and word != lemma:
+                normalized = normalize_greek(word)
+                if normalized and normalized != normalize_greek(lemma):
+                    forms[normalized] = {
+                        'lemma': lemma,
+                        'lemma_normalized': normalize_greek(lemma),
+                        'word_form': word,
+                        'word_form_normalized': normalized,
+                        'pos': 'noun',
+                        'source': 'wiktionary:declension'
+                    }
     
     return forms
 
@@ -111,13 +116,11 @@ def main():
     """Extract conjugations and declensions from cached Greek pages"""
     
     # Load Greek pages cache
-    cache_file = Path("all_greek_wiktionary_pages.json")
-    print(f"Loading Greek pages from {cache_file}...")
+    cache_file = Path(DEFAULT_CACHE_FILE)
+    print(f"Opening Greek pages cache {cache_file}...")
     
-    with open(cache_file) as f:
-        pages = json.load(f)
-    
-    print(f"Loaded {len(pages):,} pages")
+    cache = GreekPagesCache(cache_file)
+    print(f"{cache.count_pages(ancient_greek=True):,} of {len(cache):,} pages have an Ancient Greek section")
     
     # Load corpus words to prioritize
     corpus_file = Path("all_greek_words_in_corpus.json")
@@ -130,10 +133,7 @@ def main():
     
     print("\nExtracting inflected forms from lemma pages...")
     
-    for lemma, content in pages.items():
-        if '==Ancient Greek==' not in content:
-            continue
-        
+    for lemma, content in cache.iter_pages(ancient_greek=True):
         # Check if this is a verb or noun page
         if any(marker in content for marker in ['===Verb===', '====Conjugation====', '{{grc-conj']):
             forms = extract_conjugation_forms(lemma, content)
@@ -150,6 +150,8 @@ def main():
         if processed % 100 == 0 and processed > 0:
             print(f"  Processed {processed} lemma pages, found {len(all_forms):,} forms...")
     
+    cache.close()
+    
     print(f"\nTotal forms extracted: {len(all_forms):,}")
     
     # Filter to corpus words
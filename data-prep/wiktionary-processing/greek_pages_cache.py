@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Indexed SQLite cache of the Greek pages extracted from the English Wiktionary dump.
+
+Replaces the old all_greek_wiktionary_pages.json (one big dict that every
+consumer had to json.load). Each page is stored once with its zlib-compressed
+wikitext, keyed by title and indexed by normalized title, together with flags
+computed at extraction time so consumers can select only the pages they need
+and stream them one row at a time.
+
+Usage:
+    python greek_pages_cache.py stats [cache.db]
+    python greek_pages_cache.py show <title> [cache.db]
+    python greek_pages_cache.py import <all_greek_wiktionary_pages.json> [cache.db]
+"""
+
+import json
+import re
+import sqlite3
+import sys
+import unicodedata
+import zlib
+from pathlib import Path
+
+DEFAULT_CACHE_FILE = 'all_greek_wiktionary_pages.db'
+
+# {{inflection of|...}}, {{infl of|...}}, {{form of|...}}, {{grc-form of|...}},
+# {{genitive plural of|...}}, {{epic form of|...}}, ...
+INFLECTION_TEMPLATE_PATTERN = re.compile(r'\{\{\s*[^{}|]* of\s*\|', re.IGNORECASE)
+
+BATCH_SIZE = 1000
+
+def normalize_greek(text):
+    """Normalize Greek text - same as in main database creation"""
+    text = unicodedata.normalize('NFD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    text = text.lower()
+    text = text.replace('ς', 'σ')
+    text = ''.join(c for c in text if c.isalpha() and ('\u0370' <= c <= '\u03ff' or '\u1f00' <= c <= '\u1fff'))
+    return text
+
+def page_flags(text):
+    """Return (has_ancient_greek, has_greek, has_inflection_template) for a page"""
+    return (
+        int('==Ancient Greek==' in text),
+        int('==Greek==' in text),
+        int(INFLECTION_TEMPLATE_PATTERN.search(text) is not None),
+    )
+
+class GreekPagesCache:
+    """Read/write access to the Greek pages cache database"""
+
+    def __init__(self, path=DEFAULT_CACHE_FILE, create=False):
+        self.path = Path(path)
+
+        if create:
+            # The cache is always rebuilt from scratch from the dump
+            self.path.unlink(missing_ok=True)
+        elif not self.path.exists():
+            raise FileNotFoundError(f"Greek pages cache not found at {self.path}")
+
+        self.conn = sqlite3.connect(str(self.path))
+        self.pending = []
+
+        if create:
+            self.conn.execute("PRAGMA journal_mode = OFF")
+            self.conn.execute("PRAGMA synchronous = OFF")
+            self.conn.execute("""
+                CREATE TABLE pages (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT NOT NULL UNIQUE,
+                    title_normalized TEXT NOT NULL,
+                    has_ancient_greek INTEGER NOT NULL,
+                    has_greek INTEGER NOT NULL,
+                    has_inflection_template INTEGER NOT NULL,
+                    text BLOB NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX idx_pages_title_normalized ON pages(title_normalized)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def add_page(self, title, text):
+        """Queue a page for insertion; pages are written in batches"""
+        self.pending.append((
+            title,
+            normalize_greek(title),
+            *page_flags(text),
+            zlib.compress(text.encode('utf-8')),
+        ))
+        if len(self.pending) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            # A repeated title keeps its first position, like a dict assignment would
+            self.conn.executemany("""
+                INSERT INTO pages
+                (title, title_normalized, has_ancient_greek, has_greek, has_inflection_template, text)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(title) DO UPDATE SET
+                    title_normalized = excluded.title_normalized,
+                    has_ancient_greek = excluded.has_ancient_greek,
+                    has_greek = excluded.has_greek,
+                    has_inflection_template = excluded.has_inflection_template,
+                    text = excluded.text
+            """, self.pending)
+            self.pending = []
+        self.conn.commit()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def get_page(self, title):
+        """Return the wikitext of one page, or None"""
+        row = self.conn.execute("SELECT text FROM pages WHERE title = ?", (title,)).fetchone()
+        return _decompress(row[0]) if row else None
+
+    def pages_by_normalized(self, normalized_title):
+        """Return [(title, text)] for every page whose normalized title matches"""
+        rows = self.conn.execute(
+            "SELECT title, text FROM pages WHERE title_normalized = ? ORDER BY id",
+            (normalized_title,))
+        return [(title, _decompress(text)) for title, text in rows]
+
+    def iter_pages(self, ancient_greek=None, greek=None, inflection_template=None):
+        """Yield (title, text) in extraction order, optionally filtered by flags.
+
+        Rows are decompressed one at a time, so memory does not grow with
+        the size of the cache.
+        """
+        where, params = _flag_filter(ancient_greek, greek, inflection_template)
+        query = "SELECT title, text FROM pages"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY id"
+
+        for title, text in self.conn.execute(query, params):
+            yield title, _decompress(text)
+
+    def iter_pages_for_words(self, normalized_words, ancient_greek=None, greek=None, inflection_template=None):
+        """Yield (title, text) in extraction order for pages whose normalized
+        title is in normalized_words"""
+        self.conn.execute("DROP TABLE IF EXISTS temp.wanted_words")
+        self.conn.execute("CREATE TEMP TABLE wanted_words (word TEXT PRIMARY KEY) WITHOUT ROWID")
+        self.conn.executemany("INSERT OR IGNORE INTO wanted_words VALUES (?)",
+                              ((word,) for word in normalized_words))
+
+        where, params = _flag_filter(ancient_greek, greek, inflection_template)
+        where.insert(0, "title_normalized IN (SELECT word FROM wanted_words)")
+        query = f"SELECT title, text FROM pages WHERE {' AND '.join(where)} ORDER BY id"
+
+        for title, text in self.conn.execute(query, params):
+            yield title, _decompress(text)
+
+    def count_pages(self, ancient_greek=None, greek=None, inflection_template=None):
+        where, params = _flag_filter(ancient_greek, greek, inflection_template)
+        query = "SELECT COUNT(*) FROM pages"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        return self.conn.execute(query, params).fetchone()[0]
+
+def _decompress(blob):
+    return zlib.decompress(blob).decode('utf-8')
+
+def _flag_filter(ancient_greek, greek, inflection_template):
+    where = []
+    params = []
+    for column, value in (('has_ancient_greek', ancient_greek),
+                          ('has_greek', greek),
+                          ('has_inflection_template', inflection_template)):
+        if value is not None:
+            where.append(f"{column} = ?")
+            params.append(int(value))
+    return where, params
+
+def import_json_cache(json_file, cache_file=DEFAULT_CACHE_FILE):
+    """Convert an old all_greek_wiktionary_pages.json into the SQLite cache"""
+    print(f"Loading {json_file}...")
+    with open(json_file, 'r', encoding='utf-8') as f:
+        pages = json.load(f)
+
+    with GreekPagesCache(cache_file, create=True) as cache:
+        for title, text in pages.items():
+            cache.add_page(title, text)
+
+    print(f"✓ Imported {len(pages):,} pages into {cache_file}")
+
+def print_stats(cache_file=DEFAULT_CACHE_FILE):
+    with GreekPagesCache(cache_file) as cache:
+        print(f"Greek pages cache: {cache_file} ({Path(cache_file).stat().st_size / 1024 / 1024:.1f} MB)")
+        print(f"  Pages: {len(cache):,}")
+        print(f"  With Ancient Greek section: {cache.count_pages(ancient_greek=True):,}")
+        print(f"  With Greek section: {cache.count_pages(greek=True):,}")
+        print(f"  With inflection template: {cache.count_pages(inflection_template=True):,}")
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip())
+        return
+
+    command = sys.argv[1]
+
+    if command == 'stats':
+        print_stats(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_CACHE_FILE)
+
+    elif command == 'show' and len(sys.argv) > 2:
+        cache_file = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_CACHE_FILE
+        with GreekPagesCache(cache_file) as cache:
+            pages = cache.pages_by_normalized(normalize_greek(sys.argv[2]))
+        if not pages:
+            print(f"✗ No page for {sys.argv[2]}")
+        for title, text in pages:
+            print(f"=== {title} ===")
+            print(text)
+
+    elif command == 'import' and len(sys.argv) > 2:
+        import_json_cache(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else DEFAULT_CACHE_FILE)
+
+    else:
+        print(__doc__.strip())
+
+if __name__ == '__main__':
+    main()
@@ -12,11 +12,10 @@ while true; do
         break
     fi
     
-    # Check latest checkpoint
-    latest_checkpoint=$(ls -t wiktionary_extraction_results/wiktionary_checkpoint_*.json 2>/dev/null | head -1)
-    if [ -n "$latest_checkpoint" ]; then
-        count=$(basename "$latest_checkpoint" | grep -o '[0-9]*' | tail -1)
-        echo "[$(date +%H:%M:%S)] Progress: $count entries extracted"
+    # Check status file (rewritten every 10,000 pages)
+    status_file=wiktionary_extraction_results/extraction_status.json
+    if [ -f "$status_file" ]; then
+        jq -r '"[\(.updated)] Progress: \(.entries_found) entries extracted, \(.pages_processed) pages processed, \(.words_remaining) words remaining"' "$status_file"
     fi
     
     # Check log file
@@ -29,10 +28,11 @@ done
 
 echo
 echo "=== Final Results ==="
-if [ -f wiktionary_extraction_results/wiktionary_definitions_final.json ]; then
+if [ "$(jq -r .state wiktionary_extraction_results/extraction_status.json 2>/dev/null)" = "complete" ]; then
     echo "Extraction completed successfully!"
     entries=$(jq 'length' wiktionary_extraction_results/wiktionary_definitions_final.json)
     echo "Total entries extracted: $entries"
 else
     echo "Extraction did not complete normally."
+    echo "Run 'python3 extract_all_corpus_definitions.py extract' again to resume it."
 fi
\ No newline at end of file
@@ -10,17 +10,17 @@ echo
 # Step 1: Wait for extraction to complete
 echo "Step 1: Waiting for extraction to complete..."
 while pgrep -f "extract_all_corpus_definitions.py extract" > /dev/null; do
-    latest_checkpoint=$(ls -t wiktionary_extraction_results/wiktionary_checkpoint_*.json 2>/dev/null | head -1)
-    if [ -n "$latest_checkpoint" ]; then
-        count=$(basename "$latest_checkpoint" | grep -o '[0-9]*' | tail -1)
+    if [ -f wiktionary_extraction_results/extraction_status.json ]; then
+        count=$(jq .entries_found wiktionary_extraction_results/extraction_status.json)
         echo "[$(date +%H:%M:%S)] Progress: $count entries extracted"
     fi
     sleep 600  # Check every 10 minutes
 done
 
 # Check if extraction completed successfully
-if [ ! -f wiktionary_extraction_results/wiktionary_definitions_final.json ]; then
+if [ "$(jq -r .state wiktionary_extraction_results/extraction_status.json 2>/dev/null)" != "complete" ]; then
     echo "ERROR: Extraction did not complete successfully!"
+    echo "Run 'python3 extract_all_corpus_definitions.py extract' again to resume it."
     exit 1
 fi
 
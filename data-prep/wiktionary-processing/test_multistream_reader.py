@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Check the parallel multistream reader against plain single-stream bz2 reading:
+both layouts of a generated dump must yield the same pages in the same order.
+
+Pages/second of both: benchmark_multistream_reader.py.
+"""
+
+import tempfile
+
+from wiktionary_dump import iter_pages, iter_pages_multistream
+from wiktionary_fixtures import make_page, write_fixture
+
+
+def test_multistream_matches_single_stream():
+    with tempfile.TemporaryDirectory() as tmp:
+        single_path, multi_path, index_path = write_fixture(tmp, 1050)
+
+        single = list(iter_pages(single_path))
+        multi = list(iter_pages_multistream(multi_path, index_path, workers=2))
+        detected = list(iter_pages(multi_path, workers=2))
+
+    expected = [make_page(i) for i in range(1050)]
+    assert single == expected
+    assert multi == expected
+    assert detected == expected
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Check the byte-level page prefilter against the plain iterparse reader.
+
+Uses the synthetic dump from wiktionary_fixtures.py (about 1 in 20 pages is
+an Ancient Greek entry with a Greek title) and verifies the prefiltered
+reader yields exactly the accepted pages and (None, None) for the rest.
+
+Pages/second of both: benchmark_page_prefilter.py.
+"""
+
+import tempfile
+
+import wiktionary_dump
+from wiktionary_dump import PagePrefilter, iter_pages
+from wiktionary_fixtures import GREEK_SECTION, is_candidate, make_page, write_fixture
+
+
+def test_prefilter_bytes():
+    page = ('<page><title>{}</title><revision><text xml:space="preserve">{}</text>'
+            '</revision></page>')
+    assert GREEK_SECTION(page.format('λόγος', '==Ancient Greek==').encode('utf-8'))
+    assert GREEK_SECTION(page.format('Ωμέγα', '==Greek==').encode('utf-8'))
+    assert not GREEK_SECTION(page.format('logos', '==Ancient Greek==').encode('utf-8'))
+    assert not GREEK_SECTION(page.format('λόγος', '==English==').encode('utf-8'))
+    assert PagePrefilter(['{{inflection of|'])(page.format('x', '{{inflection of|grc|a}}').encode('utf-8'))
+
+
+def test_prefilter_matches_iterparse():
+    expected = []
+    for i in range(1050):
+        title, text = make_page(i)
+        expected.append((title, text) if is_candidate(title, text) else (None, None))
+
+    chunk_size = wiktionary_dump.CHUNK_SIZE
+    wiktionary_dump.CHUNK_SIZE = 1000  # make pages straddle read boundaries
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            single_path, multi_path, index_path = write_fixture(tmp, 1050)
+            unfiltered = list(iter_pages(single_path))
+            single = list(iter_pages(single_path, prefilter=GREEK_SECTION))
+            multi = list(iter_pages(multi_path, index_path, workers=2, prefilter=GREEK_SECTION))
+    finally:
+        wiktionary_dump.CHUNK_SIZE = chunk_size
+
+    assert unfiltered == [make_page(i) for i in range(1050)]
+    assert single == expected
+    assert multi == expected
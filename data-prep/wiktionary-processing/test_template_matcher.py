@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Check the single-scan TemplateMatcher against the per-pattern re.findall loop
+it replaces.
+
+Pages/second of both: benchmark_template_matcher.py.
+"""
+
+from wikitext_templates import extract_lemma_from_template
+from wiktionary_fixtures import FORM_ENTRY, LEMMA_ENTRY, findall_per_pattern
+
+TRICKY_ENTRIES = [
+    "",
+    "no templates at all",
+    "{{{inflection of|grc|λόγος|gen|s}}",
+    "{{plural of|grc|λόγος}}{{plural of|grc|θεός}}{{nominative plural of|grc|λόγος}}",
+    "{{present participle of|grc|λύω}} {{past participle of|grc|λύω}} {{participle of|grc|λύω}}",
+    "{{form of|x{{form of|y|grc|A}}|grc|B}}",
+    "{{grc-form of|A}} {{grc-form of|B|x}} {{grc-form of|C",
+    "{{inflection of|grc|A|{{inflection of|grc|B|x}}",
+    "{{Inflection of|grc|A|x}} {{inflection of|el|B|x}}",
+]
+
+
+def test_matches_per_pattern_findall():
+    for text in TRICKY_ENTRIES + [LEMMA_ENTRY, FORM_ENTRY, LEMMA_ENTRY + FORM_ENTRY * 3]:
+        assert extract_lemma_from_template(text) == findall_per_pattern(text), text
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Check WikitextOutline against the section / POS / definition regexes the
+extractors used before.
+
+Pages/second of both: benchmark_wikitext_outline.py.
+"""
+
+from wikitext_outline import WikitextOutline
+from wiktionary_fixtures import (ENGLISH_ENTRY, FORM_ENTRY, GREEK_ENTRY, LARGE_ENTRY, LEMMA_ENTRY,
+                                 regex_outline, single_scan_outline)
+
+TRICKY_ENTRIES = [
+    "",
+    "no headings at all\n# but a definition",
+    "==Ancient Greek==",
+    "==Ancient Greek==\n===Noun===\n# only line",
+    "==Ancient Greek==\n\n===Noun===\n#no space\n## nested\n# [[first]]\n# second\n",
+    ENGLISH_ENTRY + "\n" + LEMMA_ENTRY + "\n----\n\n" + GREEK_ENTRY,
+    GREEK_ENTRY + "\n" + FORM_ENTRY,
+    LEMMA_ENTRY + "\n" + FORM_ENTRY,
+    LARGE_ENTRY,
+]
+
+
+def test_matches_regex_lookups():
+    for text in TRICKY_ENTRIES:
+        assert single_scan_outline(text) == regex_outline(text), text
+
+
+def test_subsections():
+    outline = WikitextOutline(LEMMA_ENTRY + "\n" + FORM_ENTRY)
+    ag_section = outline.language('Ancient Greek')
+    assert [s.heading.title for s in outline.subsections(ag_section, ('Noun', 'Verb'))] == ['Noun']
+    declension, = outline.subsections(ag_section, ('Declension',))
+    assert declension.heading.level == 4
+    assert outline.body_text(declension) == "====Declension====\n{{grc-decl-3rd-dent-prx|μῆνι|μήνῐδ|form=F}}\n"
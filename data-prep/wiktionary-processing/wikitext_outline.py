@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Single-pass outline of a Wiktionary page: headings and definition lines.
+
+Extractors used to cut the language section out with
+re.search(r'==Ancient Greek==.*?(?=\\n==[^=]|\\Z)', text, re.DOTALL) and then
+scan that section again for POS headers and "# " definition lines, once per
+script and per page. WikitextOutline finds every heading line in one scan of
+the page; language, POS and other sections are then spans between heading
+offsets, and definition lines are only looked for inside the span asked for.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import NamedTuple
+
+# A heading line (==Title==, ===Title===, ...). Matching from the preceding
+# newline keeps the literal "\n=" prefix, which re searches for much faster
+# than trying ^ at every position; a heading on the first line is checked apart.
+_HEADING_PATTERN = re.compile(r'\n(=+)([^\n]+?)(=+)[ \t]*(?=\n|\Z)')
+_FIRST_HEADING_PATTERN = re.compile(r'(=+)([^\n]+?)(=+)[ \t]*(?=\n|\Z)')
+
+# A top-level "# " definition line (not "##", "#:", "#*")
+_DEFINITION_PATTERN = re.compile(r'\n# ')
+
+POS_TITLES = (
+    'Noun', 'Verb', 'Adjective', 'Pronoun', 'Particle', 'Adverb', 'Preposition',
+    'Conjunction', 'Numeral', 'Interjection', 'Proper noun',
+)
+
+
+class Heading(NamedTuple):
+    level: int
+    title: str
+    start: int  # offset of the heading line
+    end: int    # offset just past the heading line (before its newline)
+
+
+class Section(NamedTuple):
+    heading: Heading
+    start: int     # offset of the heading line
+    end: int       # up to the next heading of the same or a higher level (before its newline)
+    body_end: int  # up to the next heading of any level (before its newline)
+
+
+class WikitextOutline:
+    """Headings of one page, found in a single scan, and the spans between them"""
+
+    def __init__(self, text):
+        self.text = text
+        self.headings = [Heading(min(len(match[1]), len(match[3])), match[2].strip(), match.start() + 1, match.end())
+                         for match in _HEADING_PATTERN.finditer(text)]
+        first = _FIRST_HEADING_PATTERN.match(text)
+        if first:
+            self.headings.insert(0, Heading(min(len(first[1]), len(first[3])), first[2].strip(), 0, first.end()))
+
+        self.heading_starts = [heading.start for heading in self.headings]
+
+    def _section(self, index):
+        heading = self.headings[index]
+        end = len(self.text)
+        for later in self.headings[index + 1:]:
+            if later.level <= heading.level:
+                end = later.start
+                break
+        body_end = self.headings[index + 1].start if index + 1 < len(self.headings) else len(self.text)
+        # Drop the newline before the next heading, as the old lookahead regexes did
+        if end < len(self.text):
+            end -= 1
+        if body_end < len(self.text):
+            body_end -= 1
+        return Section(heading, heading.start, end, body_end)
+
+    def language(self, *languages):
+        """Return the level-2 section of the first language present, in the order given"""
+        for language in languages:
+            for index, heading in enumerate(self.headings):
+                if heading.level == 2 and heading.title == language:
+                    return self._section(index)
+        return None
+
+    def subsections(self, section, titles):
+        """Return the sections inside section whose heading title is in titles, in page order"""
+        first = bisect_right(self.heading_starts, section.start)
+        last = bisect_left(self.heading_starts, section.end)
+        return [self._section(index) for index in range(first, last)
+                if self.headings[index].title in titles]
+
+    def find(self, section, titles):
+        """Return the first section inside section whose title is in titles, or None"""
+        found = self.subsections(section, titles)
+        return found[0] if found else None
+
+    def definitions(self, start, end):
+        """Return the "# " definition lines (without the "# ") between two offsets"""
+        text = self.text
+        lines = []
+        if start == 0 < end and text.startswith('# '):
+            line_end = text.find('\n')
+            lines.append(text[2:line_end if line_end >= 0 else len(text)])
+        # The newline before a line starting at `start` is at start - 1
+        for match in _DEFINITION_PATTERN.finditer(text, max(start - 1, 0), end + 2):
+            if match.start() + 1 >= end:
+                break
+            line_end = text.find('\n', match.end())
+            lines.append(text[match.end():line_end if line_end >= 0 else len(text)])
+        return lines
+
+    def section_text(self, section):
+        return self.text[section.start:section.end]
+
+    def body_text(self, section):
+        return self.text[section.start:section.body_end]
+
+
+_last_outline = None
+
+
+def outline_for(text):
+    """Return the WikitextOutline of text, reusing the last one built for the same page.
+
+    The multiplexer hands the same page text to every extractor in turn, so the
+    page is outlined once however many extractors look at it.
+    """
+    global _last_outline
+    if _last_outline is None or _last_outline.text is not text:
+        _last_outline = WikitextOutline(text)
+    return _last_outline
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Single-scan template matching for Wiktionary wikitext.
+
+A TemplateMatcher takes a list of template regexes that each start with a
+literal "{{name|". Instead of running one re.findall per pattern over the
+page, it finds every "{{name|" opening for any of the names with one
+combined regex and applies only that name's pattern at that position.
+findall() returns exactly what the per-pattern findall loop would: each
+pattern's matches in text order, patterns in list order.
+"""
+
+import re
+
+# Lemma-bearing form-of templates used by the Ancient Greek extractors
+LEMMA_TEMPLATE_PATTERNS = [
+    # {{inflection of|grc|LEMMA|...}}
+    r'\{\{inflection of\|grc\|([^|{}]+)\|',
+    # {{form of|TYPE|grc|LEMMA}}
+    r'\{\{form of\|[^|]+\|grc\|([^|{}]+)\}\}',
+    # {{grc-form of|LEMMA|...}}
+    r'\{\{grc-form of\|([^|{}]+)[|}]',
+    # Specific form templates
+    r'\{\{plural of\|grc\|([^|{}]+)\}\}',
+    r'\{\{genitive of\|grc\|([^|{}]+)\}\}',
+    r'\{\{dative of\|grc\|([^|{}]+)\}\}',
+    r'\{\{accusative of\|grc\|([^|{}]+)\}\}',
+    r'\{\{vocative of\|grc\|([^|{}]+)\}\}',
+    r'\{\{nominative plural of\|grc\|([^|{}]+)\}\}',
+    r'\{\{genitive plural of\|grc\|([^|{}]+)\}\}',
+    # Verb forms
+    r'\{\{aorist of\|grc\|([^|{}]+)\}\}',
+    r'\{\{present of\|grc\|([^|{}]+)\}\}',
+    r'\{\{imperfect of\|grc\|([^|{}]+)\}\}',
+    r'\{\{future of\|grc\|([^|{}]+)\}\}',
+    r'\{\{perfect of\|grc\|([^|{}]+)\}\}',
+    # Epic/Ionic/Doric/etc forms
+    r'\{\{epic form of\|grc\|([^|{}]+)\}\}',
+    r'\{\{ionic form of\|grc\|([^|{}]+)\}\}',
+    r'\{\{doric form of\|grc\|([^|{}]+)\}\}',
+    r'\{\{aeolic form of\|grc\|([^|{}]+)\}\}',
+    # Alternative spellings
+    r'\{\{alternative form of\|grc\|([^|{}]+)\}\}',
+    r'\{\{alternative spelling of\|grc\|([^|{}]+)\}\}',
+    r'\{\{obsolete form of\|grc\|([^|{}]+)\}\}',
+    r'\{\{archaic form of\|grc\|([^|{}]+)\}\}',
+    # Participles
+    r'\{\{present participle of\|grc\|([^|{}]+)\}\}',
+    r'\{\{past participle of\|grc\|([^|{}]+)\}\}',
+    r'\{\{participle of\|grc\|([^|{}]+)\}\}',
+]
+
+_NAME_PREFIX = re.compile(r'\\\{\\\{([^\\|{}()\[\]?*+]+)\\\|')
+
+
+class TemplateMatcher:
+    """Applies a list of "{{name|..." template patterns (one capture group
+    each) in one pass over the text"""
+
+    def __init__(self, patterns):
+        self.patterns = []
+        self.by_name = {}
+        for index, pattern in enumerate(patterns):
+            prefix = _NAME_PREFIX.match(pattern)
+            if not prefix:
+                raise ValueError(f"Template pattern must start with a literal {{{{name|: {pattern}")
+            name = prefix.group(1)
+            if name in self.by_name:
+                raise ValueError(f"Duplicate template name: {name}")
+            self.by_name[name] = (index, re.compile(pattern))
+            self.patterns.append(pattern)
+
+        # Every name is followed by "|", so at most one alternative fits a position
+        self.openings = re.compile(r'\{\{(' + '|'.join(re.escape(name) for name in self.by_name) + r')\|')
+
+    def findall(self, text):
+        """Same result as [m for p in patterns for m in re.findall(p, text)]"""
+        found = [[] for _ in self.patterns]
+        # findall never returns overlapping matches of one pattern
+        match_end = [0] * len(self.patterns)
+
+        for opening in self.openings.finditer(text):
+            index, pattern = self.by_name[opening.group(1)]
+            start = opening.start()
+            if start < match_end[index]:
+                continue
+            match = pattern.match(text, start)
+            if match:
+                found[index].append(match.group(1))
+                match_end[index] = match.end()
+
+        return [value for values in found for value in values]
+
+
+LEMMA_TEMPLATES = TemplateMatcher(LEMMA_TEMPLATE_PATTERNS)
+
+
+def extract_lemma_from_template(template_text):
+    """Extract lemma from various inflection templates"""
+    return LEMMA_TEMPLATES.findall(template_text)
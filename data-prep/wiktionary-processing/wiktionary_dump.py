@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Shared page reader for Wiktionary XML dumps.
+Streams (title, text) pairs out of a bz2 pages-articles dump so extractors
+only deal with page content, not with iterparse bookkeeping.
+
+Multistream dumps (pages-articles-multistream.xml.bz2 plus its
+-index.txt.bz2) are split into independent bz2 streams of ~100 pages each;
+those are decompressed and parsed in a process pool and yielded in order.
+
+With a prefilter, pages are cut out of the decompressed bytes and only
+candidates (a Greek title, a section marker, ...) are parsed into elements;
+every other page is yielded as (None, None) so page counts stay the same.
+
+iter_pages_resumable() also yields, with every page, an offset from which a
+later run can restart (see its docstring) for long extractions that record
+checkpoints.
+"""
+
+import bz2
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import xml_backend as ET
+
+
+# UTF-8 bytes of Greek and Coptic (plus combining marks U+0340-036F,
+# harmless for a prefilter), Greek Extended, and the Ohm sign (NFD omega)
+GREEK_TITLE_BYTES = re.compile(rb'[\xcd-\xcf][\x80-\xbf]|\xe1[\xbc-\xbf][\x80-\xbf]|\xe2\x84\xa6')
+
+CHUNK_SIZE = 4 * 1024 * 1024
+
+
+class PagePrefilter:
+    """Byte-level test of a raw <page>...</page> block before it is parsed.
+
+    A page is a candidate when it contains any of the markers (anywhere in
+    the page) and, with greek_title, its <title> has a Greek character.
+    Extractors declare one as a class attribute; it must accept every page
+    the extractor could do anything with.
+    """
+
+    def __init__(self, markers=(), greek_title=False):
+        self.markers = tuple(m.encode('utf-8') if isinstance(m, str) else m for m in markers)
+        self.greek_title = greek_title
+
+    def __call__(self, page):
+        if self.greek_title:
+            start = page.find(b'<title>')
+            end = page.find(b'</title>', start)
+            if start < 0 or end < 0 or not GREEK_TITLE_BYTES.search(page, start, end):
+                return False
+        return not self.markers or any(marker in page for marker in self.markers)
+
+
+class AnyPrefilter:
+    """Candidate for any of several prefilters (used when extractors share a pass)"""
+
+    def __init__(self, prefilters):
+        self.prefilters = list(prefilters)
+
+    def __call__(self, page):
+        return any(prefilter(page) for prefilter in self.prefilters)
+
+
+def _page_from_element(page):
+    title_elem = page.find('.//{*}title')
+    text_elem = page.find('.//{*}text')
+
+    title = title_elem.text if title_elem is not None else None
+    text = None
+    if text_elem is not None:
+        text = text_elem.text or ''
+    return title, text
+
+
+def _split_pages(buffer):
+    """Return the (start, end) spans of the complete <page>...</page> blocks
+    in buffer and the offset of the unconsumed rest"""
+    spans = []
+    pos = 0
+    while True:
+        start = buffer.find(b'<page>', pos)
+        if start < 0:
+            return spans, pos
+        end = buffer.find(b'</page>', start)
+        if end < 0:
+            return spans, start
+        end += len(b'</page>')
+        spans.append((start, end))
+        pos = end
+
+
+def _parse_block(block, prefilter):
+    """Parse one raw <page> block, or return (None, None) if prefilter rejects it"""
+    if prefilter is None or prefilter(block):
+        return _page_from_element(ET.fromstring(block))
+    return None, None
+
+
+def _iter_raw_pages(dump_path, start_offset=0):
+    """Yield (page bytes, offset of the page) for every <page> of a bz2 dump
+    without parsing XML. Offsets count decompressed bytes."""
+    with bz2.open(dump_path, 'rb') as f:
+        # Decompresses up to the offset without keeping the data
+        f.seek(start_offset)
+        buffer = b''
+        buffer_offset = start_offset
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            buffer += chunk
+            spans, rest = _split_pages(buffer)
+            for start, end in spans:
+                yield buffer[start:end], buffer_offset + start
+            buffer = buffer[rest:]
+            buffer_offset += rest
+
+
+def find_multistream_index(dump_path):
+    """Return the index file next to a multistream dump, or None"""
+    dump_path = Path(dump_path)
+    if 'multistream' not in dump_path.name:
+        return None
+
+    stem = dump_path.name[:-len('.xml.bz2')] if dump_path.name.endswith('.xml.bz2') else dump_path.stem
+    for candidate in (f"{stem}-index.txt.bz2", f"{stem}-index.txt"):
+        index_path = dump_path.with_name(candidate)
+        if index_path.exists():
+            return index_path
+    return None
+
+
+def read_stream_offsets(index_path):
+    """Read the sorted byte offsets of every page stream from a multistream index.
+
+    Index lines look like "offset:page_id:title"; consecutive pages share
+    the offset of the stream that holds them.
+    """
+    opener = bz2.open if str(index_path).endswith('.bz2') else open
+    offsets = set()
+    with opener(index_path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            offset = line.split(':', 1)[0]
+            if offset:
+                offsets.add(int(offset))
+    return sorted(offsets)
+
+
+def _parse_stream(args):
+    """Decompress one bz2 stream of the multistream dump and return its pages"""
+    dump_path, offset, length, prefilter = args
+    with open(dump_path, 'rb') as f:
+        f.seek(offset)
+        raw = f.read(length) if length is not None else f.read()
+
+    # BZ2Decompressor stops at the end of the first stream
+    data = bz2.BZ2Decompressor().decompress(raw)
+
+    if prefilter is not None:
+        return [_parse_block(data[start:end], prefilter) for start, end in _split_pages(data)[0]]
+
+    # Streams hold bare <page> fragments without the <mediawiki> root
+    root = ET.fromstring(b'<pages>' + data + b'</pages>')
+    return [_page_from_element(page) for page in root.iter() if page.tag.endswith('page')]
+
+
+def _iter_streams(dump_path, index_path, workers=None, prefilter=None, start_offset=0):
+    """Yield (stream offset, pages) for every stream of a multistream dump
+    at or after start_offset, in dump order"""
+    offsets = read_stream_offsets(index_path)
+    ranges = [
+        (str(dump_path), offset, offsets[i + 1] - offset if i + 1 < len(offsets) else None, prefilter)
+        for i, offset in enumerate(offsets)
+        if offset >= start_offset
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 4
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        next_range = 0
+
+        while next_range < len(ranges) or pending:
+            while next_range < len(ranges) and len(pending) < max_in_flight:
+                pending.append((ranges[next_range][1], executor.submit(_parse_stream, ranges[next_range])))
+                next_range += 1
+
+            offset, future = pending.popleft()
+            yield offset, future.result()
+
+
+def iter_pages_multistream(dump_path, index_path, workers=None, prefilter=None):
+    """Yield (title, text) for every page of a multistream dump, in dump order.
+
+    Streams are decompressed and parsed by a pool of worker processes; at
+    most a few streams per worker are in flight so memory stays bounded.
+    """
+    for _, pages in _iter_streams(dump_path, index_path, workers, prefilter):
+        yield from pages
+
+
+def iter_pages_resumable(dump_path, start_offset=0, index_path=None, workers=None, prefilter=None):
+    """Yield (title, text, resume_offset) for every page from start_offset on.
+
+    Restarting with start_offset=resume_offset re-reads the page it came
+    with and everything after it. For multistream dumps it is the compressed
+    byte offset of the bz2 stream holding the page, so a restart seeks
+    straight there (pages of one stream share it). A single-stream bz2 file
+    cannot be entered mid-stream, so there it is the decompressed offset of
+    the page; a restart decompresses up to it without parsing.
+    """
+    index_path = index_path or find_multistream_index(dump_path)
+    if index_path is not None:
+        for offset, pages in _iter_streams(dump_path, index_path, workers, prefilter, start_offset):
+            for title, text in pages:
+                yield title, text, offset
+        return
+
+    for block, offset in _iter_raw_pages(dump_path, start_offset):
+        title, text = _parse_block(block, prefilter)
+        yield title, text, offset
+
+
+def iter_pages(dump_path, index_path=None, workers=None, prefilter=None):
+    """Yield (title, text) for every <page> in a bz2 Wiktionary dump.
+
+    title or text is None when the page has no such element, and both are
+    None for pages rejected by prefilter (a PagePrefilter or any callable
+    taking the raw page bytes). Multistream dumps with an index file next
+    to them (or passed as index_path) are read in parallel; plain dumps are
+    streamed with iterparse, clearing elements as soon as a page has been
+    read to keep memory flat.
+    """
+    index_path = index_path or find_multistream_index(dump_path)
+    if index_path is not None:
+        yield from iter_pages_multistream(dump_path, index_path, workers, prefilter)
+        return
+
+    if prefilter is not None:
+        for block, _ in _iter_raw_pages(dump_path):
+            yield _parse_block(block, prefilter)
+        return
+
+    with bz2.open(dump_path, 'rb') as f:
+        context = iter(ET.iterparse(f, events=('start', 'end')))
+        event, root = next(context)
+
+        for event, elem in context:
+            if event == 'end' and elem.tag.endswith('page'):
+                # Works for any export schema version (0.10, 0.11, ...)
+                namespace = elem.tag[:-len('page')]
+                title_elem = elem.find(f'.//{namespace}title')
+                text_elem = elem.find(f'.//{namespace}text')
+
+                title = title_elem.text if title_elem is not None else None
+                text = None
+                if text_elem is not None:
+                    text = text_elem.text or ''
+
+                elem.clear()
+                root.clear()
+
+                yield title, text
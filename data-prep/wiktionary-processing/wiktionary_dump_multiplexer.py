@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Read each Wiktionary dump once and feed every page to all extractors.
+
+Each extractor script exposes a plugin class with process_page(title, text)
+and finish(). Instead of running the scripts one after another (one full
+decompress + iterparse of the dump each), this runs every registered plugin
+in a single pass per dump. Each plugin still writes its own output file.
+
+Usage:
+    python wiktionary_dump_multiplexer.py [plugin ...]
+    python wiktionary_dump_multiplexer.py --list
+
+With no plugin names, every registered plugin runs.
+
+Plugins that record a resume point (corpus_definitions) get checkpoints
+while the dump is read, so an interrupted run can be resumed by the plugin's
+own script. A plugin whose previous run was interrupted is skipped rather
+than started over, as that would discard what the interrupted run found.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from wiktionary_dump import AnyPrefilter, iter_pages_resumable
+
+SCRIPT_DIR = Path(__file__).parent
+DATA_SOURCES = SCRIPT_DIR.parent.parent / "data-sources"
+
+
+def _dump_path(wiki):
+    """Prefer the multistream dump (read in parallel) when it has been downloaded"""
+    multistream = DATA_SOURCES / f"{wiki}-latest-pages-articles-multistream.xml.bz2"
+    if multistream.exists():
+        return multistream
+    return DATA_SOURCES / f"{wiki}-latest-pages-articles.xml.bz2"
+
+
+DUMPS = {
+    'en': _dump_path('enwiktionary'),
+    'el': _dump_path('elwiktionary'),
+}
+
+CORPUS_WORDS_FILE = SCRIPT_DIR / "all_greek_words_in_corpus.json"
+
+# Pages between the checkpoints of plugins that record a resume point
+CHECKPOINT_PAGES = 10000
+
+
+class PluginUnavailable(Exception):
+    """Raised by a plugin factory when the plugin cannot run now"""
+
+
+def _greek_pages():
+    from extract_all_greek_pages import GreekPagesExtractor
+    return GreekPagesExtractor(str(SCRIPT_DIR / "all_greek_wiktionary_pages.db"))
+
+
+def _inflection_of():
+    from extract_inflection_of_template import InflectionOfExtractor
+    return InflectionOfExtractor(str(SCRIPT_DIR / "greek_inflection_of_mappings.json"), DUMPS['en'])
+
+
+def _ancient_greek_forms():
+    from extract_all_ancient_greek_forms import AncientGreekFormsExtractor
+    return AncientGreekFormsExtractor(SCRIPT_DIR / "ancient_greek_all_forms.json")
+
+
+def _corpus_definitions():
+    from extract_all_corpus_definitions import STATUS_FILE, CorpusDefinitionsExtractor, read_status
+    output_dir = SCRIPT_DIR / "wiktionary_extraction_results"
+    status = read_status(output_dir)
+    if status is not None and status['state'] == 'running':
+        # Starting over would delete the entries the interrupted run found
+        raise PluginUnavailable(f"an interrupted run is recorded in {output_dir / STATUS_FILE}; resume it with "
+                                f"'extract_all_corpus_definitions.py extract' (or start over with --restart)")
+    return CorpusDefinitionsExtractor(CORPUS_WORDS_FILE, str(output_dir), dump_file=DUMPS['en'])
+
+
+def _inflected_forms():
+    from extract_inflected_forms_mappings import InflectedFormsExtractor
+    return InflectedFormsExtractor(CORPUS_WORDS_FILE, str(SCRIPT_DIR / "inflection_extraction_results"))
+
+
+def _el_inflections():
+    from extract_greek_wiktionary_fixed import ElWiktionaryInflectionExtractor
+    return ElWiktionaryInflectionExtractor(str(SCRIPT_DIR / "ancient_greek_elwiktionary_mappings.json"), DUMPS['el'])
+
+
+def _el_declensions():
+    from extract_declension_mappings import DeclensionMappingsExtractor
+    return DeclensionMappingsExtractor(str(SCRIPT_DIR / "ancient_greek_declension_mappings.json"), DUMPS['el'])
+
+
+# name -> (dump, factory, files the plugin needs besides the dump)
+PLUGINS = {
+    'greek_pages': ('en', _greek_pages, []),
+    'inflection_of': ('en', _inflection_of, []),
+    'ancient_greek_forms': ('en', _ancient_greek_forms, []),
+    'corpus_definitions': ('en', _corpus_definitions, [CORPUS_WORDS_FILE]),
+    'inflected_forms': ('en', _inflected_forms, [CORPUS_WORDS_FILE]),
+    'el_inflections': ('el', _el_inflections, []),
+    'el_declensions': ('el', _el_declensions, []),
+}
+
+
+def register_plugin(name, dump, factory, required_files=()):
+    """Register an extra extractor; factory() must return an object with
+    process_page(title, text) and finish(), and optionally a prefilter
+    (see wiktionary_dump.PagePrefilter) and checkpoint(resume_offset,
+    resume_pages). factory() raises PluginUnavailable to skip the plugin."""
+    PLUGINS[name] = (dump, factory, list(required_files))
+
+
+def run_dump(dump_path, plugins, page_source=iter_pages_resumable):
+    """Stream one dump and hand every page to each plugin, then finish them all
+
+    plugins is a dict of name -> plugin instance. Returns the page count.
+    Pages are only parsed when some plugin's prefilter accepts them; if any
+    plugin has no prefilter, every page is parsed. Every CHECKPOINT_PAGES
+    pages, plugins with a checkpoint method get the resume offset of the
+    dump and the number of pages read before it.
+    """
+    print(f"\n=== READING {dump_path} FOR {len(plugins)} EXTRACTORS ===")
+    print(f"Extractors: {', '.join(plugins)}")
+
+    prefilters = [getattr(plugin, 'prefilter', None) for plugin in plugins.values()]
+    prefilter = None if None in prefilters else AnyPrefilter(prefilters)
+
+    start_time = time.time()
+    pages = 0
+    active = dict(plugins)
+    last_offset = None
+
+    for title, text, resume_offset in page_source(dump_path, prefilter=prefilter):
+        # Pages already read when reading from resume_offset starts
+        if resume_offset != last_offset:
+            last_offset = resume_offset
+            pages_before_offset = pages
+        pages += 1
+        for name, plugin in list(active.items()):
+            plugin.process_page(title, text)
+            if pages % CHECKPOINT_PAGES == 0 and hasattr(plugin, 'checkpoint'):
+                plugin.checkpoint(resume_offset, pages_before_offset)
+            # Plugins with a page limit drop out once they are done
+            if getattr(plugin, 'done', False):
+                del active[name]
+        if not active:
+            break
+
+    elapsed = time.time() - start_time
+    print(f"\n✓ Read {pages:,} pages in {elapsed/60:.1f} minutes "
+          f"({pages/elapsed if elapsed > 0 else 0:.0f} pages/second)")
+
+    for name, plugin in plugins.items():
+        print(f"\n--- {name} ---")
+        plugin.finish()
+
+    return pages
+
+
+def run_plugins(names):
+    """Run the named plugins, grouped so each dump is read only once"""
+    by_dump = {}
+    for name in names:
+        dump, factory, required_files = PLUGINS[name]
+
+        if not DUMPS[dump].exists():
+            print(f"⚠️  Skipping {name}: dump not found at {DUMPS[dump]}")
+            continue
+        missing = [str(p) for p in required_files if not Path(p).exists()]
+        if missing:
+            print(f"⚠️  Skipping {name}: missing {', '.join(missing)}")
+            continue
+
+        try:
+            plugin = factory()
+        except PluginUnavailable as e:
+            print(f"⚠️  Skipping {name}: {e}")
+            continue
+        by_dump.setdefault(dump, {})[name] = plugin
+
+    for dump, plugins in by_dump.items():
+        run_dump(DUMPS[dump], plugins)
+
+
+def main():
+    args = sys.argv[1:]
+
+    if '--list' in args:
+        for name, (dump, _, _) in PLUGINS.items():
+            print(f"  {name:<22} ({dump}wiktionary)")
+        return
+
+    names = args or list(PLUGINS)
+    unknown = [name for name in names if name not in PLUGINS]
+    if unknown:
+        print(f"Unknown extractor(s): {', '.join(unknown)}")
+        print(f"Available: {', '.join(PLUGINS)}")
+        sys.exit(1)
+
+    run_plugins(names)
+
+
+if __name__ == '__main__':
+    main()
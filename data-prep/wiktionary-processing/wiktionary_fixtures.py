@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Synthetic Wiktionary dumps for the checks (test_*.py) and benchmarks
+(benchmark_*.py) of the dump readers.
+
+write_fixture writes the same pages as a single-stream dump and as a
+multistream dump with its index; make_page gives the (title, text) of page i,
+so tests can compute the expected output without reading the dump.
+is_candidate is the check the extractors run on a parsed page, to compare
+the prefiltered reader with.
+
+LEMMA_ENTRY and FORM_ENTRY are typical Ancient Greek entries for the wikitext
+parsers; load_pages reads real pages from a Greek pages cache instead.
+findall_per_pattern and regex_outline are the lookups TemplateMatcher and
+WikitextOutline replaced.
+"""
+
+import bz2
+import re
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from extract_all_greek_pages import is_greek_word
+from wikitext_outline import POS_TITLES, outline_for
+from wikitext_templates import LEMMA_TEMPLATE_PATTERNS
+from wiktionary_dump import PagePrefilter
+
+NAMESPACE = 'http://www.mediawiki.org/xml/export-0.11/'
+PAGES_PER_STREAM = 100
+
+GREEK_SECTION = PagePrefilter(['==Ancient Greek==', '==Greek=='], greek_title=True)
+
+LEMMA_ENTRY = """==Ancient Greek==
+
+===Etymology===
+From {{inh|grc|ine-pro|*méh₂-}}. Cognate with {{cog|la|mēns}}.
+
+===Pronunciation===
+{{grc-IPA|μῆνιν}}
+
+===Noun===
+{{grc-noun|μῆνις|μήνῐδος|f|third}}
+
+# [[wrath]], [[anger]] {{q|especially of the gods}}
+#: {{quote-book|grc|author=Homer|title=Iliad|passage=μῆνιν ἄειδε θεὰ}}
+
+====Declension====
+{{grc-decl-3rd-dent-prx|μῆνι|μήνῐδ|form=F}}
+
+====Derived terms====
+{{col3|grc|μηνίω|μήνιμα|ἀμήνιτος}}
+"""
+
+FORM_ENTRY = """==Ancient Greek==
+
+===Pronunciation===
+{{grc-IPA|μῆνιν}}
+
+===Noun===
+{{head|grc|noun form}}
+
+# {{inflection of|grc|μῆνις||acc|s}}
+# {{genitive plural of|grc|μῆνις}}
+# {{epic form of|grc|μῆνις}} {{alternative form of|grc|μᾶνις}}
+
+===Verb===
+{{head|grc|verb form}}
+
+# {{aorist of|grc|μηνίω}}
+# {{grc-form of|μηνίω|aor}}
+# {{form of|dual|grc|μηνίω}} {{participle of|grc|μηνίω}}
+"""
+
+ENGLISH_ENTRY = """==English==
+
+===Noun===
+{{en-noun}}
+
+# A [[word]] that is not Greek.
+"""
+
+GREEK_ENTRY = """==Greek==
+
+===Verb===
+{{el-verb}}
+
+# to [[loosen]]
+## a sub-sense
+"""
+
+# A long lemma entry: an English section, then an Ancient Greek section full of quotations
+LARGE_ENTRY = ENGLISH_ENTRY + "\n" + LEMMA_ENTRY.replace(
+    "====Declension====",
+    "#: {{quote-book|grc|author=Homer|title=Iliad|passage=μῆνιν ἄειδε θεὰ Πηληϊάδεω Ἀχιλῆος}}\n" * 200
+    + "====Declension====")
+
+POS_PATTERN = r'===(Noun|Verb|Adjective|Pronoun|Particle|Adverb|Preposition|Conjunction|Numeral|Interjection|Proper noun)==='
+
+
+def make_page(i):
+    """Return (title, text) for synthetic page i; about 1 in 20 is Ancient Greek"""
+    if i % 20 == 0:
+        title = f"μῆνιν{i}"
+        text = ("==Ancient Greek==\n===Noun===\n{{head|grc|noun}}\n"
+                "# {{inflection of|grc|μῆνις||acc|s}}\n# [[wrath]] & anger <of gods>\n")
+    elif i % 97 == 0:
+        title = f"Talk:page{i}"
+        text = ""
+    else:
+        title = f"word{i}"
+        text = "==English==\n===Noun===\n# a thing\n" + "lorem ipsum dolor " * (i % 40)
+    return title, text
+
+
+def page_xml(i):
+    title, text = make_page(i)
+    return (f'  <page>\n    <title>{escape(title)}</title>\n    <ns>0</ns>\n    <id>{i + 1}</id>\n'
+            f'    <revision>\n      <id>{i + 1000}</id>\n'
+            f'      <text bytes="{len(text)}" xml:space="preserve">{escape(text)}</text>\n'
+            f'    </revision>\n  </page>\n')
+
+
+def write_fixture(directory, page_count):
+    """Write single-stream and multistream dumps (plus index) of the same pages"""
+    directory = Path(directory)
+    header = (f'<mediawiki xmlns="{NAMESPACE}" version="0.11" xml:lang="en">\n'
+              '  <siteinfo>\n    <sitename>Wiktionary</sitename>\n  </siteinfo>\n')
+    footer = '</mediawiki>\n'
+    pages = [page_xml(i) for i in range(page_count)]
+
+    single_path = directory / "fixture-pages-articles.xml.bz2"
+    with open(single_path, 'wb') as f:
+        f.write(bz2.compress((header + ''.join(pages) + footer).encode('utf-8')))
+
+    multi_path = directory / "fixture-pages-articles-multistream.xml.bz2"
+    index_path = directory / "fixture-pages-articles-multistream-index.txt.bz2"
+    index_lines = []
+    with open(multi_path, 'wb') as f:
+        f.write(bz2.compress(header.encode('utf-8')))
+        for start in range(0, page_count, PAGES_PER_STREAM):
+            offset = f.tell()
+            for i in range(start, min(page_count, start + PAGES_PER_STREAM)):
+                index_lines.append(f"{offset}:{i + 1}:{make_page(i)[0]}\n")
+            f.write(bz2.compress(''.join(pages[start:start + PAGES_PER_STREAM]).encode('utf-8')))
+        f.write(bz2.compress(footer.encode('utf-8')))
+
+    with bz2.open(index_path, 'wt', encoding='utf-8') as f:
+        f.writelines(index_lines)
+
+    return single_path, multi_path, index_path
+
+
+def is_candidate(title, text):
+    """What the extractors check after parsing, for comparison"""
+    return (title is not None and text is not None and is_greek_word(title)
+            and ('==Ancient Greek==' in text or '==Greek==' in text))
+
+
+def findall_per_pattern(text):
+    """The original extract_lemma_from_template loop"""
+    lemmas = []
+    for pattern in LEMMA_TEMPLATE_PATTERNS:
+        lemmas.extend(re.findall(pattern, text))
+    return lemmas
+
+
+def regex_outline(text):
+    """The original section, part of speech and definition lookups"""
+    ag_match = re.search(r'==Ancient Greek==.*?(?=\n==[^=]|\Z)', text, re.DOTALL)
+    if not ag_match:
+        ag_match = re.search(r'==Greek==.*?(?=\n==[^=]|\Z)', text, re.DOTALL)
+        if not ag_match:
+            return None
+    ag_section = ag_match.group(0)
+
+    pos_match = re.search(POS_PATTERN, ag_section)
+    definitions = []
+    if pos_match:
+        for line in ag_section[pos_match.end():].split('\n'):
+            if line.startswith('# ') and not line.startswith('##'):
+                definitions.append(line[2:])
+    return ag_section, pos_match.group(1) if pos_match else None, definitions
+
+
+def single_scan_outline(text):
+    """The same lookups through WikitextOutline"""
+    outline = outline_for(text)
+    section = outline.language('Ancient Greek', 'Greek')
+    if not section:
+        return None
+
+    pos_section = outline.find(section, POS_TITLES)
+    definitions = outline.definitions(pos_section.start, section.end) if pos_section else []
+    return outline.section_text(section), pos_section.heading.title if pos_section else None, definitions
+
+
+def load_pages(cache_file, ancient_greek=False):
+    """Page texts of a Greek pages cache (only the Ancient Greek ones if asked)"""
+    from greek_pages_cache import GreekPagesCache
+    with GreekPagesCache(cache_file) as cache:
+        return [text for _, text in cache.iter_pages(ancient_greek=ancient_greek)]
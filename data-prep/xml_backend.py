@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+XML parser backend for the build: xml.etree.ElementTree or, when installed
+and selected, lxml.
+
+Modules import this instead of ElementTree (`import xml_backend as ET`) and
+keep using the ElementTree API: parse, fromstring, iterparse, XMLPullParser,
+Element, tostring and ParseError. The lxml parser drops comments and
+processing instructions and allows huge text nodes, as ElementTree does, so
+the trees are the same. tostring always uses the ElementTree serializer (it
+accepts lxml elements), so the XML stored in the database does not depend on
+the backend.
+
+ElementTree is the default: it is C-accelerated too, and although lxml
+parses about 20% faster, the stages walk the trees from Python (iter, tag
+checks, itertext), which is several times slower on lxml's element proxies;
+see benchmark_xml_backend.py for the per-stage numbers. Select lxml with
+PERSEUS_XML_BACKEND=lxml or use_backend('lxml'). Worker processes inherit the
+choice through the environment.
+
+Usage:
+    python xml_backend.py
+
+prints the backend in use and the ones available.
+"""
+
+import os
+import xml.etree.ElementTree as _etree
+
+try:
+    from lxml import etree as _lxml
+except ImportError:
+    _lxml = None
+
+BACKEND_ENV = 'PERSEUS_XML_BACKEND'
+DEFAULT_BACKEND = 'etree'
+
+# Parser options that make lxml build the same trees as ElementTree
+_LXML_OPTIONS = {'remove_comments': True, 'remove_pis': True, 'huge_tree': True}
+
+ParseError = (_etree.ParseError,) + ((_lxml.XMLSyntaxError,) if _lxml is not None else ())
+
+BACKEND = None
+
+
+def available_backends():
+    return ['etree', 'lxml'] if _lxml is not None else ['etree']
+
+
+def use_backend(name=None):
+    """Select 'lxml' or 'etree' (None: PERSEUS_XML_BACKEND, else DEFAULT_BACKEND)"""
+    global BACKEND
+    name = name or os.environ.get(BACKEND_ENV) or DEFAULT_BACKEND
+    if name not in ('lxml', 'etree'):
+        raise ValueError(f"Unknown XML backend {name!r} (expected 'lxml' or 'etree')")
+    if name == 'lxml' and _lxml is None:
+        raise ValueError("XML backend 'lxml' requested but lxml is not installed")
+    BACKEND = name
+    os.environ[BACKEND_ENV] = name
+    return name
+
+
+def _lxml_parser(**options):
+    return _lxml.XMLParser(**_LXML_OPTIONS, **options)
+
+
+def parse(source):
+    if BACKEND == 'lxml':
+        return _lxml.parse(str(source) if isinstance(source, os.PathLike) else source, _lxml_parser())
+    return _etree.parse(source)
+
+
+def fromstring(text):
+    if BACKEND == 'lxml':
+        if isinstance(text, str):
+            # lxml rejects str input with an encoding declaration
+            return _lxml.fromstring(text.encode('utf-8'), _lxml_parser(encoding='utf-8'))
+        return _lxml.fromstring(text, _lxml_parser())
+    return _etree.fromstring(text)
+
+
+def iterparse(source, events=('end',)):
+    """iterparse over a path or a binary file"""
+    if BACKEND == 'lxml':
+        return _lxml.iterparse(source, events=events, **_LXML_OPTIONS)
+    return _etree.iterparse(source, events=events)
+
+
+def XMLPullParser(events=('end',)):
+    if BACKEND == 'lxml':
+        return _lxml.XMLPullParser(events=events, **_LXML_OPTIONS)
+    return _etree.XMLPullParser(events=events)
+
+
+def Element(tag, attrib={}, **extra):
+    if BACKEND == 'lxml':
+        return _lxml.Element(tag, attrib, **extra)
+    return _etree.Element(tag, attrib, **extra)
+
+
+def tostring(element, encoding='unicode'):
+    """Serialize like ElementTree, whichever backend built the element"""
+    return _etree.tostring(element, encoding=encoding)
+
+
+use_backend()
+
+
+if __name__ == '__main__':
+    print(f"XML backend: {BACKEND} (available: {', '.join(available_backends())})")